@@ -0,0 +1,160 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes; older directories are then ignored
+ARTIFACT_FORMAT_VERSION = 1
+
+# Raw arrays written as .npy files and memory-mapped back read-only
+ARRAY_FIELDS = [
+    "idf",
+    "job_vectors_data", "job_vectors_indices", "job_vectors_indptr",
+    "job_skill_ids", "job_skill_indptr",
+    "skill_job_ids", "skill_job_indptr",
+]
+
+
+def dataset_hash(dataset_path, chunk_size=1 << 20):
+    """SHA-256 of the dataset file contents."""
+    digest = hashlib.sha256()
+    with open(dataset_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_path(artifact_root, content_hash):
+    # One directory per dataset version
+    return os.path.join(artifact_root, f"v{ARTIFACT_FORMAT_VERSION}-{content_hash[:16]}")
+
+
+def save_artifacts(matcher, artifact_root, content_hash=None, keep_versions=3):
+    """
+    Serializes a fitted JobMatcher: TF-IDF vocabulary and IDF weights, the CSR
+    job_vectors as raw data/indices/indptr arrays, the skill index arrays,
+    the per-job metadata and the role profiles. Written to a temp directory first and renamed into
+    place, so readers never see a partial version.
+    Returns the artifact directory.
+    """
+    content_hash = content_hash or dataset_hash(matcher.dataset_path)
+    target = artifact_path(artifact_root, content_hash)
+    if os.path.exists(os.path.join(target, "manifest.json")):
+        return target
+
+    os.makedirs(artifact_root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".build-", dir=artifact_root)
+    try:
+        vectors = matcher.job_vectors.tocsr()
+        arrays = {
+            "idf": matcher.vectorizer.idf_,
+            "job_vectors_data": vectors.data,
+            "job_vectors_indices": vectors.indices,
+            "job_vectors_indptr": vectors.indptr,
+            "job_skill_ids": matcher.job_skill_ids,
+            "job_skill_indptr": matcher.job_skill_indptr,
+            "skill_job_ids": matcher.skill_job_ids,
+            "skill_job_indptr": matcher.skill_job_indptr,
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+
+        terms = matcher.vectorizer.get_feature_names_out().tolist()
+        with open(os.path.join(tmp_dir, "vocabulary.json"), "w") as f:
+            json.dump(terms, f)
+        with open(os.path.join(tmp_dir, "skill_vocab.json"), "w") as f:
+            json.dump(matcher.skill_vocab, f)
+        with open(os.path.join(tmp_dir, "role_profiles.json"), "w") as f:
+            json.dump(matcher.role_profiles, f)
+
+        matcher.df.to_parquet(os.path.join(tmp_dir, "jobs.parquet"), index=False)
+
+        # Manifest last: its presence marks a complete artifact
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump({
+                "format_version": ARTIFACT_FORMAT_VERSION,
+                "dataset_sha256": content_hash,
+                "dataset_path": matcher.dataset_path,
+                "rows": len(matcher.df),
+                "vocabulary_size": len(terms),
+                "job_vectors_shape": list(vectors.shape),
+                "created_at": time.time()
+            }, f, indent=2)
+
+        try:
+            os.rename(tmp_dir, target)
+        except OSError:
+            # Another worker published the same version first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    _prune_versions(artifact_root, keep_versions)
+    return target
+
+
+def load_artifacts(artifact_root, dataset_path, content_hash=None):
+    """
+    Memory-maps the artifact built from the current contents of dataset_path.
+    Returns None when there is no (complete) artifact for this content hash.
+    """
+    content_hash = content_hash or dataset_hash(dataset_path)
+    directory = artifact_path(artifact_root, content_hash)
+    manifest_file = os.path.join(directory, "manifest.json")
+    if not os.path.exists(manifest_file):
+        return None
+
+    with open(manifest_file) as f:
+        manifest = json.load(f)
+    if manifest.get("dataset_sha256") != content_hash or manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        return None
+
+    artifact = {"manifest": manifest, "directory": directory}
+    for name in ARRAY_FIELDS:
+        # Read-only pages shared by every worker mapping the same file
+        artifact[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+    with open(os.path.join(directory, "vocabulary.json")) as f:
+        artifact["vocabulary"] = json.load(f)
+    with open(os.path.join(directory, "skill_vocab.json")) as f:
+        artifact["skill_vocab"] = json.load(f)
+    # Older versions were written without role profiles; the matcher then rebuilds them
+    profiles_file = os.path.join(directory, "role_profiles.json")
+    if os.path.exists(profiles_file):
+        with open(profiles_file) as f:
+            artifact["role_profiles"] = json.load(f)
+    artifact["jobs"] = pd.read_parquet(os.path.join(directory, "jobs.parquet"), memory_map=True)
+    return artifact
+
+
+def _prune_versions(artifact_root, keep_versions):
+    versions = []
+    for name in os.listdir(artifact_root):
+        manifest_file = os.path.join(artifact_root, name, "manifest.json")
+        if os.path.exists(manifest_file):
+            versions.append((os.path.getmtime(manifest_file), name))
+    for _, name in sorted(versions, reverse=True)[keep_versions:]:
+        shutil.rmtree(os.path.join(artifact_root, name), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    # Build step: python artifacts.py --dataset ../dataset.csv --out artifacts
+    parser = argparse.ArgumentParser(description="Fit JobMatcher once and write memory-mappable artifacts.")
+    parser.add_argument("--dataset", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset.csv"))
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts"))
+    args = parser.parse_args()
+
+    from matcher import JobMatcher
+
+    start = time.time()
+    job_matcher = JobMatcher(args.dataset)
+    if job_matcher.df.empty:
+        raise SystemExit(f"Could not load dataset: {args.dataset}")
+    out_dir = save_artifacts(job_matcher, args.out)
+    print(f"Artifacts written to {out_dir} in {time.time() - start:.2f}s")
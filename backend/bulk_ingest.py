@@ -0,0 +1,292 @@
+import argparse
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from parse_pool import parse_resume_job
+
+FORMATS = ("jsonl", "parquet")
+
+
+def iter_resume_sources(input_path):
+    """
+    Yields (name, load) for every PDF in a directory (recursive) or a zip archive.
+    name is the path relative to the input (used for progress tracking);
+    load() returns what the parser takes: a file path, or the member's bytes.
+    """
+    if zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as archive:
+            for info in sorted(archive.infolist(), key=lambda i: i.filename):
+                if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                    yield info.filename, lambda info=info: archive.read(info)
+        return
+
+    for root, dirs, files in os.walk(input_path):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.lower().endswith(".pdf"):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, input_path), lambda path=path: path
+
+
+class ProgressLog:
+    def __init__(self, path):
+        """
+        Append-only list of finished input names. Names are recorded after
+        their results are written; files a crash left written but unrecorded
+        are recovered from the output (BulkIngestor.run), so none is redone.
+        """
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        self.file = open(path, "a", encoding="utf-8")
+
+    def mark(self, names):
+        for name in names:
+            self.file.write(name + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.done.update(names)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlResultWriter:
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            self._drop_partial_line()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def _drop_partial_line(self):
+        # A crash mid-write leaves a line without its newline; appending would glue onto it
+        with open(self.path, "rb+") as f:
+            data_end = f.seek(0, os.SEEK_END)
+            position = data_end
+            while position > 0:
+                step = min(1 << 16, position)
+                f.seek(position - step)
+                newline = f.read(step).rfind(b"\n")
+                if newline >= 0:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            if position < data_end:
+                f.truncate(position)
+
+    def written_files(self):
+        """Input names already in the output."""
+        names = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    names.add(json.loads(line)["file"])
+        return names
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(row, default=str) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetResultWriter:
+    def __init__(self, directory):
+        """One part file per batch; a resumed run continues the numbering."""
+        self.path = directory
+        os.makedirs(directory, exist_ok=True)
+        self.part = len(self._parts())
+
+    def _parts(self):
+        return sorted(f for f in os.listdir(self.path) if f.startswith("part-") and f.endswith(".parquet"))
+
+    def written_files(self):
+        """Input names already in the output."""
+        names = set()
+        for part in self._parts():
+            names.update(pd.read_parquet(os.path.join(self.path, part), columns=["file"])["file"])
+        return names
+
+    def write(self, rows):
+        frame = pd.DataFrame([{
+            "file": row["file"],
+            "extracted_skills": row["extracted_skills"],
+            "top_match_role": row["matches"][0]["job_role"] if row["matches"] else None,
+            "top_match_score": float(row["matches"][0]["match_score"]) if row["matches"] else None,
+            # Match dicts mix value types; kept as JSON text
+            "matches": json.dumps(row["matches"], default=str),
+            "error": row.get("error"),
+        } for row in rows])
+        # Written under a temp name and renamed, so readers never see half a part
+        target = os.path.join(self.path, f"part-{self.part:05d}.parquet")
+        frame.to_parquet(target + ".tmp", index=False)
+        os.replace(target + ".tmp", target)
+        self.part += 1
+
+    def close(self):
+        pass
+
+
+class BulkIngestor:
+    def __init__(self, matcher, extractor, workers=None, batch_size=100, top_k=5):
+        """
+        Parses resumes in parallel worker processes and matches them in batches
+        (JobMatcher.match_jobs_batch), streaming results to disk as each batch
+        completes. At most a few files per worker are in flight at a time,
+        so memory stays flat however large the input is.
+        """
+        self.matcher = matcher
+        self.extractor = extractor
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.top_k = top_k
+
+    def run(self, input_path, output_path, output_format="jsonl", progress_path=None, on_progress=None):
+        """
+        Ingests every PDF under input_path (directory or zip) into output_path
+        (a .jsonl file, or a directory of parquet parts). Files listed in the
+        progress file (default: output_path + '.progress') are skipped, so a
+        rerun after a crash picks up where it stopped; so are files already in
+        the output (written just before the crash, not yet recorded).
+        A worker that dies (e.g. on a malformed PDF) fails the files in flight
+        in its pool, which are recorded with their error; the run goes on in
+        a new pool.
+        on_progress(stats) is called after every written batch.
+        Returns the stats dict.
+        """
+        if output_format not in FORMATS:
+            raise ValueError(f"output_format must be one of {FORMATS}")
+
+        progress = ProgressLog(progress_path or output_path + ".progress")
+        writer = JsonlResultWriter(output_path) if output_format == "jsonl" else ParquetResultWriter(output_path)
+        unrecorded = writer.written_files() - progress.done
+        if unrecorded:
+            progress.mark(sorted(unrecorded))
+        stats = {"processed": 0, "skipped": 0, "failed": 0, "output": output_path, "started_at": time.time()}
+        extractor = self.extractor
+        job_args = (extractor.vocabulary_version, extractor.skill_automaton.skills, extractor.max_pages, extractor.max_chars)
+
+        executor = self._new_executor()
+        in_flight = {}  # future -> (input name, pool it runs in)
+        batch = []
+        try:
+            for name, load in iter_resume_sources(input_path):
+                if name in progress.done:
+                    stats["skipped"] += 1
+                    continue
+                # Bounded submission: never more than a few files per worker in memory
+                while len(in_flight) >= self.workers * 4:
+                    executor = self._collect(executor, wait(in_flight, return_when=FIRST_COMPLETED).done,
+                                             in_flight, batch, stats)
+                    self._flush_full_batches(batch, writer, progress, stats, on_progress)
+                try:
+                    future = executor.submit(parse_resume_job, load(), *job_args)
+                except BrokenProcessPool:
+                    # A worker died since the last collect; its jobs are collected as failed
+                    executor = self._replace_executor(executor)
+                    future = executor.submit(parse_resume_job, load(), *job_args)
+                in_flight[future] = (name, executor)
+
+            while in_flight:
+                executor = self._collect(executor, wait(in_flight, return_when=FIRST_COMPLETED).done,
+                                         in_flight, batch, stats)
+                self._flush_full_batches(batch, writer, progress, stats, on_progress)
+            if batch:
+                self._write_batch(batch, writer, progress, stats, on_progress)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            writer.close()
+            progress.close()
+
+        stats["finished_at"] = time.time()
+        return stats
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _replace_executor(self, executor):
+        executor.shutdown(wait=False, cancel_futures=True)
+        return self._new_executor()
+
+    def _collect(self, executor, done, in_flight, batch, stats):
+        """Adds finished jobs to batch; returns the pool to submit to (a new one if a worker died)."""
+        for future in done:
+            name, pool = in_flight.pop(future)
+            try:
+                result, _, _ = future.result()
+                batch.append({"file": name, "extracted_skills": result["skills"]})
+            except BrokenProcessPool as e:
+                # Every file in flight in the pool fails with it; they are not retried
+                print(f"Bulk Ingest Error ({name}): parser process died: {e}")
+                stats["failed"] += 1
+                batch.append({"file": name, "extracted_skills": [], "error": f"Parser process died: {e}"})
+                if pool is executor:
+                    executor = self._replace_executor(executor)
+            except Exception as e:
+                print(f"Bulk Ingest Error ({name}): {e}")
+                stats["failed"] += 1
+                batch.append({"file": name, "extracted_skills": [], "error": str(e)})
+        return executor
+
+    def _flush_full_batches(self, batch, writer, progress, stats, on_progress):
+        while len(batch) >= self.batch_size:
+            chunk = batch[:self.batch_size]
+            del batch[:self.batch_size]
+            self._write_batch(chunk, writer, progress, stats, on_progress)
+
+    def _write_batch(self, rows, writer, progress, stats, on_progress):
+        matches = self.matcher.match_jobs_batch([row["extracted_skills"] for row in rows], k=self.top_k)
+        for row, row_matches in zip(rows, matches):
+            row["matches"] = row_matches
+        writer.write(rows)
+        progress.mark([row["file"] for row in rows])
+        stats["processed"] += len(rows)
+        if on_progress is not None:
+            on_progress(stats)
+        rows.clear()
+
+
+if __name__ == "__main__":
+    # python bulk_ingest.py resumes.zip --out results.jsonl
+    parser = argparse.ArgumentParser(description="Parse and match a directory or zip of resume PDFs.")
+    parser.add_argument("input", help="Directory of PDFs or a .zip archive")
+    parser.add_argument("--out", required=True, help="Output .jsonl file, or directory for --format parquet")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--dataset", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dataset.csv"))
+    parser.add_argument("--artifacts", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts"),
+                        help="Prebuilt matcher artifacts ('' to fit from the CSV)")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--max-pages", type=int, default=50)
+    parser.add_argument("--max-chars", type=int, default=200000)
+    args = parser.parse_args()
+
+    from extractor import ResumeExtractor
+    from matcher import JobMatcher
+
+    job_matcher = JobMatcher(args.dataset, artifact_dir=args.artifacts or None)
+    if job_matcher.df.empty:
+        raise SystemExit(f"Could not load dataset: {args.dataset}")
+    resume_extractor = ResumeExtractor(
+        known_skills=job_matcher.get_all_skills(), max_pages=args.max_pages or None, max_chars=args.max_chars or None
+    )
+
+    ingestor = BulkIngestor(job_matcher, resume_extractor, args.workers, args.batch_size, args.top_k)
+    result = ingestor.run(
+        args.input, args.out, args.format,
+        on_progress=lambda s: print(f"{s['processed']} processed, {s['skipped']} skipped, {s['failed']} failed")
+    )
+    print(f"Done in {result['finished_at'] - result['started_at']:.1f}s: {result['processed']} resumes -> {result['output']}")
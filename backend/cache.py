@@ -0,0 +1,190 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import CACHE_ENTRIES, CACHE_HITS, CACHE_MISSES
+
+# Temp files older than this are left over by a crashed write; younger ones may
+# be another worker's write in progress (workers share the cache directory)
+STALE_TEMP_SECONDS = 600
+
+
+class TTLCache:
+    def __init__(self, name, max_size=4096, ttl=600.0):
+        """
+        Thread-safe LRU cache with per-entry time-to-live.
+        name: label used for the hit/miss/size Prometheus metrics.
+        max_size: entries kept before the least recently used one is evicted.
+        ttl: seconds an entry stays valid after it was stored.
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        CACHE_ENTRIES.labels(cache=name).set_function(lambda: len(self._entries))
+
+    def get(self, key):
+        """Returns the cached value, or None on a miss (missing or expired)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                CACHE_HITS.labels(cache=self.name).inc()
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+        CACHE_MISSES.labels(cache=self.name).inc()
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+class DiskLRUCache:
+    def __init__(self, name, directory, max_bytes=256 * 1024 * 1024):
+        """
+        Thread-safe LRU cache of JSON values stored as files in a local directory,
+        bounded by total size on disk. Survives restarts (the recency order is
+        rebuilt from file modification times).
+        name: label used for the hit/miss/size Prometheus metrics.
+        Keys must be filename-safe strings (e.g. hex digests).
+        Processes may share the directory (uvicorn workers), but each one counts
+        and evicts only the entries it knows about: N processes can use up to
+        N * max_bytes.
+        """
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # key -> file size, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+        existing = []
+        now = time.time()
+        for filename in os.listdir(directory):
+            try:
+                stat = os.stat(os.path.join(directory, filename))
+                if filename.endswith(".tmp"):
+                    if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                        # Left over by a write interrupted by a crash
+                        os.remove(os.path.join(directory, filename))
+                elif filename.endswith(".json"):
+                    existing.append((stat.st_mtime, filename[:-len(".json")], stat.st_size))
+            except OSError:
+                # Renamed or removed by another process meanwhile
+                continue
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        CACHE_ENTRIES.labels(cache=name).set_function(lambda: len(self._entries))
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Returns the cached value, or None on a miss."""
+        with self._lock:
+            if key in self._entries:
+                try:
+                    with open(self._path(key), encoding="utf-8") as f:
+                        value = json.load(f)
+                    os.utime(self._path(key))  # recency survives restarts
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    CACHE_HITS.labels(cache=self.name).inc()
+                    return value
+                except (OSError, ValueError):
+                    # Deleted or corrupt file: forget it
+                    self._total_bytes -= self._entries.pop(key)
+            self.misses += 1
+        CACHE_MISSES.labels(cache=self.name).inc()
+        return None
+
+    def set(self, key, value):
+        data = json.dumps(value).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        # Unique temp file + rename: concurrent writers never leave a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            try:
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                os.remove(tmp_path)
+                raise
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            while self._total_bytes > self.max_bytes:
+                old_key, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
@@ -1,7 +1,40 @@
 
+import asyncio
+import hashlib
 import os
+import time
+import weakref
+
 import google.generativeai as genai
 
+from cache import TTLCache
+from intents import IntentRouter, fallback_response, normalize_message
+from llm_client import CircuitBreaker, CircuitOpen, LLMClient, RateLimited
+from sessions import SessionStore
+from metrics import CHAT_RESPONSES, CHAT_TTFT_SECONDS
+
+# Model name and, for tests/local runs, the host:port of a stub Gemini server
+# (plain-text gRPC, see stub_llm_server.py) used instead of the Google endpoint
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-flash-latest")
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+# Concurrent upstream LLM calls per process; further chats wait for a slot
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "8"))
+# LLM answers cached per normalized message + context
+CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "2048"))
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "3600"))
+# Conversations kept in memory, and the token budget of each prompt's context
+CHAT_MAX_SESSIONS = int(os.getenv("CHAT_MAX_SESSIONS", "10000"))
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "1500"))
+# Upstream protection: request quota, retries, circuit breaker
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "10"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+GEMINI_FIRST_CHUNK_TIMEOUT = float(os.getenv("GEMINI_FIRST_CHUNK_TIMEOUT", "30"))
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "5"))
+GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))
+
+MISSING_KEY_RESPONSE = "⚠️ **API Key Missing**: Please set the `GEMINI_API_KEY` environment variable."
+
 MASTER_SYSTEM_PROMPT = """
 You are an AI Career Mentor Chatbot for the "Antigravity" platform.
 Your role is to guide users in their career journey using their profile, skills, location, and job preferences.
@@ -53,52 +86,244 @@ Match role → skills → suggest companies known to hire for them.
 """
 
 class CareerChatbot:
-    def __init__(self):
+    def __init__(self, model_name=GEMINI_MODEL, api_endpoint=GEMINI_API_ENDPOINT, max_concurrency=CHAT_MAX_CONCURRENCY,
+                 matcher_provider=None, intent_router=None, cache_size=CHAT_CACHE_SIZE, cache_ttl=CHAT_CACHE_TTL,
+                 sessions=None, llm=None):
+        """
+        matcher_provider: callable returning the current JobMatcher, used by
+            local intents to answer role/skill questions from the dataset.
+        intent_router: IntentRouter tried before the LLM (default intents if None).
+        sessions: SessionStore holding conversation history and resume
+            profiles; prompts carry its budgeted context instead of the raw
+            client context.
+        llm: LLMClient wrapping the model calls (rate limit, retries, circuit
+            breaker, coalescing); built from the GEMINI_* settings if None.
+        """
         self.system_prompt = MASTER_SYSTEM_PROMPT
+        self.matcher_provider = matcher_provider
+        self.intent_router = intent_router or IntentRouter()
+        self.sessions = sessions or SessionStore(max_sessions=CHAT_MAX_SESSIONS, context_tokens=CHAT_CONTEXT_TOKENS)
+        self.response_cache = TTLCache("chat_responses", max_size=cache_size, ttl=cache_ttl)
         self.api_key = os.getenv("GEMINI_API_KEY")
+        self.model_name = model_name
+        self.api_endpoint = api_endpoint
         self.model = None
-        
+        self.llm = llm or LLMClient(
+            self._stream_model, self._call_model, max_concurrency=max_concurrency,
+            requests_per_minute=GEMINI_REQUESTS_PER_MINUTE, burst=GEMINI_BURST, max_retries=GEMINI_MAX_RETRIES,
+            first_chunk_timeout=GEMINI_FIRST_CHUNK_TIMEOUT,
+            breaker=CircuitBreaker(GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_RESET)
+        )
+
+        # api_endpoint clients: one sync client, and one async client per event
+        # loop (asyncio channels are loop-bound)
+        self._client = None
+        self._loop_clients = weakref.WeakKeyDictionary()
+
+        if self.api_key or self.api_endpoint:
+            self._configure()
+
+    def _configure(self):
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            # Use 'gemini-flash-latest' for better stability/quota management
-            self.model = genai.GenerativeModel('gemini-flash-latest')
+        # Use 'gemini-flash-latest' for better stability/quota management
+        self.model = genai.GenerativeModel(self.model_name)
+
+    def _ensure_model(self):
+        if not self.model:
+            # Try reloading key in case it was set after init
+            self.api_key = os.getenv("GEMINI_API_KEY")
+            if self.api_key or self.api_endpoint:
+                self._configure()
+        return self.model
+
+    # Retries are LLMClient's job, so the SDK's own retry is turned off
+    REQUEST_OPTIONS = {"retry": None}
+
+    async def _stream_model(self, prompt):
+        """One upstream streaming call (LLMClient.stream_call)."""
+        if self.api_endpoint:
+            iterator = await self._loop_client().stream_generate_content(request=self._request(prompt), retry=None)
+            response = await genai.types.AsyncGenerateContentResponse.from_aiterator(iterator)
+        else:
+            response = await self.model.generate_content_async(prompt, stream=True, request_options=self.REQUEST_OPTIONS)
+        async for chunk in response:
+            yield chunk.text
+
+    def _call_model(self, prompt):
+        if self.api_endpoint:
+            if self._client is None:
+                self._client = self._endpoint_client(asynchronous=False)
+            response = self._client.generate_content(request=self._request(prompt), retry=None)
+            return genai.types.GenerateContentResponse.from_response(response).text
+        return self.model.generate_content(prompt, request_options=self.REQUEST_OPTIONS).text
+
+    def _request(self, prompt):
+        content = genai.protos.Content(parts=[genai.protos.Part(text=prompt)], role="user")
+        return genai.protos.GenerateContentRequest(model=self.model.model_name, contents=[content])
+
+    def _loop_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None:
+            client = self._loop_clients[loop] = self._endpoint_client(asynchronous=True)
+        return client
+
+    def _endpoint_client(self, asynchronous):
+        """
+        GenerativeService client for api_endpoint (a plain-text gRPC server such
+        as stub_llm_server.py), set through client_options; the transport opens
+        an insecure channel to the host the client resolves from them.
+        """
+        import grpc
+        from google.ai import generativelanguage_v1beta as glm
+        from google.ai.generativelanguage_v1beta.services.generative_service.transports import (
+            GenerativeServiceGrpcAsyncIOTransport, GenerativeServiceGrpcTransport
+        )
+
+        if asynchronous:
+            client_class, transport_class = glm.GenerativeServiceAsyncClient, GenerativeServiceGrpcAsyncIOTransport
+            open_channel = grpc.aio.insecure_channel
+        else:
+            client_class, transport_class = glm.GenerativeServiceClient, GenerativeServiceGrpcTransport
+            open_channel = grpc.insecure_channel
 
-    def get_response(self, user_message, context=""):
-        msg_lower = user_message.lower().strip()
+        def transport(host, client_info=None, **_):
+            return transport_class(host=host, channel=open_channel(host), client_info=client_info)
 
-        # --- 1. LOCAL INTENT DETECTION (Save API Calls) ---
-        
-        # Intent: Starting out
-        if msg_lower in ["where should i start?", "how do i start?", "start"]:
-            return "Tell me your top 3 skills, current city, and target job role."
+        return client_class(client_options={"api_endpoint": self.api_endpoint}, transport=transport)
 
-        # Intent: Resume Upload Help
-        if "upload" in msg_lower and "resume" in msg_lower:
-            return "You can upload your resume using the 'Start Analysis' button on the dashboard or the upload section above. Once uploaded, I can give you specific career advice!"
+    def _local_response(self, user_message, context, session=None):
+        # --- 1. LOCAL INTENTS (Save API Calls) ---
+        matcher = self.matcher_provider() if self.matcher_provider else None
+        if session is not None and session.profile and not context:
+            context = session.profile
+        routed = self.intent_router.route(user_message, context, matcher)
+        if routed is None:
+            return None
+        CHAT_RESPONSES.labels(source="intent").inc()
+        return routed[1]
 
-        # Intent: Company Recommendations (Simplified Local Check)
-        if "companies" in msg_lower and "recommend" in msg_lower:
-            return "I can definitely help with that! If you have processed your resume, check the 'Career Strategy' report at the bottom of the dashboard for detailed company recommendations."
+    @staticmethod
+    def _cache_key(user_message, prompt_context):
+        # Same question (case/punctuation aside) with the same context -> same answer
+        context_hash = hashlib.sha256(prompt_context.encode("utf-8")).hexdigest()
+        return normalize_message(user_message), context_hash
+
+    def _cached_response(self, cache_key):
+        response = self.response_cache.get(cache_key)
+        if response is not None:
+            CHAT_RESPONSES.labels(source="cache").inc()
+        return response
+
+    def _build_prompt(self, user_message, prompt_context):
+        # Construct prompt with context (already compacted to the session's token budget)
+        return f"{self.system_prompt}\n\n=== CONTEXT ===\n{prompt_context}\n\n=== USER MESSAGE ===\n{user_message}"
+
+    def _remember(self, session, user_message, response):
+        if session is not None:
+            self.sessions.append(session, "user", user_message)
+            self.sessions.append(session, "assistant", response)
+
+    def stats(self):
+        """Response cache hit rate (answers served from intents/cache/LLM are in chat_responses_total)."""
+        return {"response_cache": self.response_cache.stats(), "sessions": self.sessions.stats(),
+                "llm": self.llm.stats(), "intents": [name for name, _ in self.intent_router.intents]}
+
+    def _fallback_response(self, user_message, context, session):
+        # Circuit open: answer from the dataset instead of waiting on a failing API
+        CHAT_RESPONSES.labels(source="fallback").inc()
+        if session is not None and session.profile and not context:
+            context = session.profile
+        return fallback_response(user_message, context, self.matcher_provider() if self.matcher_provider else None)
+
+    @staticmethod
+    def _error_response(e):
+        error_msg = str(e)
+        if isinstance(e, RateLimited) or "429" in error_msg:
+            return "📉 **High Traffic**: I'm receiving too many requests right now. Please wait 1 minute and try again."
+        return f"❌ **AI Error**: {error_msg}"
+
+    def get_response(self, user_message, context="", session=None):
+        """session: ChatSession from self.sessions.get() to answer within a conversation."""
+        local = self._local_response(user_message, context, session)
+        if local is not None:
+            self._remember(session, user_message, local)
+            return local
+
+        prompt_context = self.sessions.render_context(session, context)
+        cache_key = self._cache_key(user_message, prompt_context)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            self._remember(session, user_message, cached)
+            return cached
 
         # --- 2. AI GENERATION (Fallback to LLM) ---
-        if not self.model:
-            # Try reloading key in case it was set after init
-            self.api_key = os.getenv("GEMINI_API_KEY")
-            if self.api_key:
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-flash-latest')
-            else:
-                return "⚠️ **API Key Missing**: Please set the `GEMINI_API_KEY` environment variable."
+        if not self._ensure_model():
+            return MISSING_KEY_RESPONSE
+
+        try:
+            text = self.llm.generate(self._build_prompt(user_message, prompt_context))
+            CHAT_RESPONSES.labels(source="llm").inc()
+            self.response_cache.set(cache_key, text)
+            self._remember(session, user_message, text)
+            return text
+        except CircuitOpen:
+            return self._fallback_response(user_message, context, session)
+        except Exception as e:
+            CHAT_RESPONSES.labels(source="error").inc()
+            return self._error_response(e)
+
+    async def get_response_async(self, user_message, context="", session=None):
+        """Same as get_response, without holding a thread during the LLM call."""
+        chunks = []
+        async for chunk in self.stream_response(user_message, context, endpoint="chat", session=session):
+            chunks.append(chunk)
+        return "".join(chunks)
+
+    async def stream_response(self, user_message, context="", endpoint="chat_stream", session=None):
+        """
+        Async generator of response text chunks, as the model produces them.
+        Local intents and cached answers come as a single chunk.
+        Upstream calls go through self.llm; while its circuit breaker is open
+        the answer comes from the dataset (intents.fallback_response).
+        Time to the first chunk is recorded in chat_time_to_first_token_seconds.
+        The exchange is added to session (if given) once the answer is complete.
+        Intents and the fallback run in a worker thread: they may call the
+        matcher (vectorizer, scoring), which must not block the event loop.
+        """
+        local = await asyncio.to_thread(self._local_response, user_message, context, session)
+        if local is not None:
+            self._remember(session, user_message, local)
+            yield local
+            return
+
+        prompt_context = self.sessions.render_context(session, context)
+        cache_key = self._cache_key(user_message, prompt_context)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            self._remember(session, user_message, cached)
+            yield cached
+            return
+
+        if not self._ensure_model():
+            yield MISSING_KEY_RESPONSE
+            return
 
+        start = time.perf_counter()
+        chunks = []
         try:
-            # Construct prompt with context
-            full_prompt = f"{self.system_prompt}\n\n=== CONTEXT ===\n{str(context)}\n\n=== USER MESSAGE ===\n{user_message}"
-            
-            response = self.model.generate_content(full_prompt)
-            return response.text
-            
+            async for text in self.llm.stream(self._build_prompt(user_message, prompt_context), endpoint):
+                if not chunks:
+                    CHAT_TTFT_SECONDS.labels(endpoint=endpoint).observe(time.perf_counter() - start)
+                chunks.append(text)
+                yield text
+            CHAT_RESPONSES.labels(source="llm").inc()
+            # Only complete answers are cached and remembered, never errors
+            self.response_cache.set(cache_key, "".join(chunks))
+            self._remember(session, user_message, "".join(chunks))
+        except CircuitOpen:
+            yield await asyncio.to_thread(self._fallback_response, user_message, context, session)
         except Exception as e:
-            error_msg = str(e)
-            if "429" in error_msg:
-                return "📉 **High Traffic**: I'm receiving too many requests right now. Please wait 1 minute and try again."
-            return f"❌ **AI Error**: {error_msg}"
+            CHAT_RESPONSES.labels(source="error").inc()
+            yield self._error_response(e)
@@ -0,0 +1,151 @@
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from metrics import COHORT_ANALYSIS_SECONDS, COHORT_CANDIDATES
+from role_profiles import role_key
+
+
+def candidate_skill_matrix(matcher, skills_batch):
+    """
+    Binary candidates x skills CSR matrix over the matcher's skill vocabulary
+    (skills no posting requires are dropped). Also returns the number of
+    listed skills outside the vocabulary.
+    """
+    indices, indptr = [], [0]
+    unknown = 0
+    for skills in skills_batch:
+        ids = matcher.encode_skills(skills)
+        unknown += len({s.lower().strip() for s in skills} - {""}) - len(ids)
+        indices.extend(sorted(ids))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    matrix = csr_matrix((data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+                        shape=(len(skills_batch), len(matcher.skill_vocab)))
+    return matrix, unknown
+
+
+def role_skill_matrix(matcher, roles, min_share=0.5):
+    """
+    Binary roles x skills CSR matrix: a role requires the skills listed by at
+    least min_share of its postings (from the role profiles).
+    roles: role names; raises ValueError for a role not in the dataset.
+    """
+    indices, indptr = [], [0]
+    for role in roles:
+        profile = matcher.role_profile(role)
+        if profile is None:
+            raise ValueError(f"Unknown role: {role}")
+        # The most frequent skill always counts, whatever min_share is
+        required = [entry["skill"] for i, entry in enumerate(profile["skills"]) if i == 0 or entry["share"] >= min_share]
+        indices.extend(sorted(matcher.skill_ids[skill] for skill in required))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    return csr_matrix((data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+                      shape=(len(roles), len(matcher.skill_vocab)))
+
+
+def _top_missing(missing_row, assessed, skill_vocab, top_n):
+    """missing_row: dense candidates-missing count per skill."""
+    skill_ids = np.flatnonzero(missing_row)
+    # Most missed first, ties by vocabulary order
+    skill_ids = skill_ids[np.argsort(-missing_row[skill_ids], kind="stable")][:top_n]
+    return [{
+        "skill": skill_vocab[s],
+        "candidates_missing": int(missing_row[s]),
+        "share": round(float(missing_row[s]) / assessed, 4) if assessed else 0.0,
+    } for s in skill_ids]
+
+
+def analyze_cohort(matcher, skills_batch, roles=None, targets=None, min_share=0.5, top_n=10, per_candidate=False):
+    """
+    Skill-gap analysis of a cohort against target roles, with sparse products
+    instead of one match_jobs call per candidate:
+        C (candidates x skills), R (roles x skills)
+        held  = C @ R.T        required skills each candidate has, per role
+        have  = A.T @ C        candidates assessed for a role holding each skill
+        missing = (assessed - have) * R
+    roles: roles to assess (default: every dataset role).
+    targets: one role per candidate (each candidate is assessed against its
+        own target only); default: every candidate against every role.
+    Returns per-role coverage and top missing skills, and cohort-wide top
+    missing skills (summed over the assessed candidate-role pairs).
+    """
+    start = time.perf_counter()
+    if targets is not None:
+        if len(targets) != len(skills_batch):
+            raise ValueError("targets must have one role per candidate")
+        # Roles in order of first appearance among the targets
+        roles = targets if roles is None else roles
+    elif roles is None:
+        roles = [profile["role"] for profile in matcher.role_profiles.values()]
+    # Case variants of a role name are one role
+    unique = {}
+    for role in roles:
+        unique.setdefault(role_key(role), role)
+    roles = list(unique.values())
+
+    keys = [role_key(role) for role in roles]
+    candidates, unknown = candidate_skill_matrix(matcher, skills_batch)
+    required = role_skill_matrix(matcher, roles, min_share)
+    n_candidates, n_roles = candidates.shape[0], len(roles)
+
+    # Assignment of candidates to roles (A: candidates x roles)
+    if targets is not None:
+        column_of = {key: j for j, key in enumerate(keys)}
+        target_columns = [column_of.get(role_key(role)) for role in targets]
+        if None in target_columns:
+            missing_role = targets[target_columns.index(None)]
+            raise ValueError(f"Target role not in roles: {missing_role}")
+        assignment = csr_matrix((np.ones(n_candidates, dtype=np.int32), (np.arange(n_candidates), target_columns)),
+                                shape=(n_candidates, n_roles))
+    else:
+        assignment = None
+
+    held = (candidates @ required.T).toarray()                          # candidates x roles
+    role_sizes = np.asarray(required.sum(axis=1)).ravel()
+    coverage = held / np.maximum(role_sizes, 1)
+    if assignment is None:
+        assessed = np.full(n_roles, n_candidates)
+        have = np.broadcast_to(np.asarray(candidates.sum(axis=0)).ravel(), (n_roles, candidates.shape[1]))
+        mask = np.ones((n_candidates, n_roles), dtype=bool)
+    else:
+        assessed = np.asarray(assignment.sum(axis=0)).ravel()
+        have = (assignment.T @ candidates).toarray()                    # roles x skills
+        mask = assignment.toarray().astype(bool)
+    missing = (assessed[:, None] - have) * required.toarray()           # roles x skills
+
+    role_results = []
+    for j, role in enumerate(roles):
+        role_coverage = coverage[mask[:, j], j]
+        role_results.append({
+            "role": matcher.role_profile(role)["role"],
+            "required_skills": int(role_sizes[j]),
+            "candidates": int(assessed[j]),
+            "avg_coverage": round(float(role_coverage.mean()), 4) if len(role_coverage) else 0.0,
+            "fully_qualified": int((held[mask[:, j], j] == role_sizes[j]).sum()),
+            "avg_missing_skills": round(float((role_sizes[j] - held[mask[:, j], j]).mean()), 4) if len(role_coverage) else 0.0,
+            "top_missing": _top_missing(missing[j], assessed[j], matcher.skill_vocab, top_n),
+        })
+
+    result = {
+        "candidates": n_candidates,
+        "roles": n_roles,
+        "unknown_skills": int(unknown),
+        "role_gaps": role_results,
+        "cohort_top_missing": _top_missing(missing.sum(axis=0), int(mask.sum()), matcher.skill_vocab, top_n),
+    }
+    if per_candidate:
+        # Best-covered assessed role per candidate
+        masked = np.where(mask, coverage, -1.0)
+        best = masked.argmax(axis=1) if n_roles else np.zeros(n_candidates, dtype=int)
+        result["per_candidate"] = [{
+            "best_role": role_results[b]["role"],
+            "coverage": round(float(coverage[i, b]), 4),
+            "missing_skills": int(role_sizes[b] - held[i, b]),
+        } for i, b in enumerate(best)] if n_roles else []
+
+    COHORT_CANDIDATES.inc(n_candidates)
+    COHORT_ANALYSIS_SECONDS.observe(time.perf_counter() - start)
+    return result
@@ -1,30 +1,281 @@
+import threading
+import time
+import warnings
+from collections import deque
+
 import numpy as np
-from scipy.stats import ks_2samp
+from scipy import sparse
+from scipy.stats import ks_2samp, kstwo
+
+from metrics import (
+    DRIFT_LAST_DRIFTED_FEATURES, DRIFT_LAST_EVALUATED_AT, DRIFT_LAST_IS_DRIFT, DRIFT_LAST_P_VALUE_AVG,
+    DRIFT_LAST_P_VALUE_MIN, DRIFT_LAST_WINDOW_SAMPLES, DRIFT_WINDOW_EVAL_SECONDS, DRIFT_WINDOW_FILL,
+    DRIFT_WINDOWS_EVALUATED, DRIFT_WINDOWS_SKIPPED
+)
+
+# ks_2samp(method='auto') switches from exact to asymptotic p-values above this size
+MAX_EXACT_N = 10000
+
+CORRECTIONS = ("none", "bonferroni", "fdr")
+
+
+def _exact_p_value(d, n1, n2):
+    """
+    Exact two-sided KS p-value for statistic d between samples of sizes n1
+    and n2, from the public ks_2samp(method='exact'), which depends on the
+    samples only through D: it is run on two-valued samples whose ECDFs differ
+    by exactly d. None if no such samples exist (d not a KS value for n1, n2).
+    """
+    a = np.arange(n1 + 1)
+    b = (a / n1 - d) * n2  # a/n1 - b/n2 == d
+    reachable = np.flatnonzero((np.abs(b - np.round(b)) < 1e-6) & (b > -0.5) & (b < n2 + 0.5))
+    if len(reachable) == 0:
+        return None
+    a, b = int(a[reachable[0]]), int(round(b[reachable[0]]))
+    x = np.repeat([0.0, 1.0], [a, n1 - a])
+    y = np.repeat([0.0, 1.0], [b, n2 - b])
+    with warnings.catch_warnings():
+        # Where the exact computation fails, ks_2samp warns and switches to the asymptotic p-value
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return float(ks_2samp(x, y, method="exact").pvalue)
+
+
+def _segmented_count(values, starts, ends, x, side="right"):
+    """
+    Vectorized searchsorted over many sorted segments at once.
+    For each query i, counts the elements of values[starts[i]:ends[i]] (sorted
+    ascending) that are <= x[i] (side='right') or < x[i] (side='left').
+    """
+    lo = starts.astype(np.int64)
+    hi = ends.astype(np.int64)
+    if len(values) == 0:
+        return np.zeros(len(x), dtype=np.int64)
+
+    active = lo < hi
+    while active.any():
+        mid = (lo + hi) // 2
+        mid_values = values[np.minimum(mid, len(values) - 1)]
+        if side == "right":
+            go_right = active & (mid_values <= x)
+        else:
+            go_right = active & (mid_values < x)
+        lo = np.where(go_right, mid + 1, lo)
+        hi = np.where(active & ~go_right, mid, hi)
+        active = lo < hi
+    return lo - starts
+
+
+class SortedColumns:
+    def __init__(self, data):
+        """
+        Column-wise sparse summary of a (samples x features) matrix, which is all
+        the KS test needs: for every feature its nonzero values sorted ascending
+        (values[indptr[j]:indptr[j + 1]]) and the number of implicit zeros.
+        Row indices are not kept, so memory is O(nnz), never samples x features.
+        """
+        if sparse.issparse(data):
+            matrix = data.tocsc()
+        else:
+            matrix = sparse.csc_matrix(np.asarray(data, dtype=np.float64))
+
+        self.n_samples, self.n_features = matrix.shape
+        values = np.asarray(matrix.data, dtype=np.float64)
+        counts = np.diff(matrix.indptr)
+
+        # Explicit zeros are counted with the implicit ones
+        nonzero = values != 0
+        if not nonzero.all():
+            columns = np.repeat(np.arange(self.n_features), counts)
+            values = values[nonzero]
+            counts = np.bincount(columns[nonzero], minlength=self.n_features)
+
+        index_dtype = np.int32 if len(values) < np.iinfo(np.int32).max else np.int64
+        self.indptr = np.zeros(self.n_features + 1, dtype=index_dtype)
+        np.cumsum(counts, out=self.indptr[1:])
+
+        columns = np.repeat(np.arange(self.n_features, dtype=index_dtype), counts)
+        self.values = values[np.lexsort((values, columns))]
+        self.zero_counts = (self.n_samples - counts).astype(index_dtype)
+
+    @property
+    def starts(self):
+        return self.indptr[:-1]
+
+    @property
+    def ends(self):
+        return self.indptr[1:]
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.indptr.nbytes + self.zero_counts.nbytes
+
 
 class DriftMonitor:
-    def __init__(self, reference_data, p_val=0.05):
+    def __init__(self, reference_data, p_val=0.05, correction="bonferroni",
+                 window_size=500, window_step=None, window_seconds=None, min_window_size=50):
         """
-        Initialize Drift Monitor using Kolmogorov-Smirnov (KS) Test (Scipy implementation).
-        reference_data: Training data embeddings/vectors (The Baseline).
+        Initialize Drift Monitor using feature-wise two-sample Kolmogorov-Smirnov (KS) tests.
+        reference_data: Training data embeddings/vectors (The Baseline), sparse or dense.
+        correction: multiple-testing rule across features:
+            'none' (any feature below p_val), 'bonferroni' or 'fdr' (Benjamini-Hochberg).
+        Streaming (observe): live vectors go into a sliding window of the last
+        window_size rows. The window closes every window_step new rows
+        (default window_size, i.e. tumbling windows) or, if window_seconds is
+        set, every window_seconds (rows older than that are evicted), as long
+        as it holds at least min_window_size rows.
         """
-        # Ensure data is dense (numpy array)
-        if hasattr(reference_data, 'toarray'):
-            reference_data = reference_data.toarray()
-            
-        self.reference_data = reference_data
+        if correction not in CORRECTIONS:
+            raise ValueError(f"correction must be one of {CORRECTIONS}")
+
+        # Reference columns are sorted once and kept sparse (sorted nonzeros + zero counts)
+        self.reference = SortedColumns(reference_data)
         self.p_val = p_val
-        self.n_features = reference_data.shape[1]
-        
-        print(f"DriftMonitor (Scipy): Initialized with {reference_data.shape[0]} samples and {self.n_features} features.")
+        self.correction = correction
+        self.n_samples, self.n_features = self.reference.n_samples, self.reference.n_features
+
+        self.ref_zero_counts = self.reference.zero_counts
+        # Nonzeros below 0 (none for TF-IDF, but keep the test exact for any data)
+        self.ref_negative_counts = _segmented_count(
+            self.reference.values, self.reference.starts, self.reference.ends,
+            np.zeros(self.n_features), side="left"
+        )
+
+        # --- Sliding window over live traffic (bounded: at most window_size rows) ---
+        self.window_size = window_size
+        self.window_step = window_step or window_size
+        self.window_seconds = window_seconds
+        self.min_window_size = min_window_size
+        self._window = deque(maxlen=window_size)
+        self._window_lock = threading.Lock()
+        self._rows_since_close = 0
+        self._last_close = time.monotonic()
+
+        self._pending_window = None
+        self._eval_thread = None
+        self._eval_lock = threading.Lock()
+        self.windows_evaluated = 0
+        self.latest_report = None
+
+        print(f"DriftMonitor (Vectorized KS): Initialized with {self.n_samples} samples and {self.n_features} features "
+              f"({self.reference.nbytes / 1e6:.1f} MB reference).")
+
+    def _ref_cdf(self, columns, x, side="right"):
+        """Reference ECDF of each listed feature at x (side='left' gives the left limit)."""
+        counts = _segmented_count(
+            self.reference.values, self.reference.indptr[columns], self.reference.indptr[columns + 1], x, side
+        )
+        at_or_above_zero = (x >= 0) if side == "right" else (x > 0)
+        return (counts + self.ref_zero_counts[columns] * at_or_above_zero) / self.n_samples
+
+    def ks_statistics(self, new_data):
+        """
+        Two-sample KS statistic D for every feature at once.
+        Within a run of equal new-sample values the new ECDF is constant and the
+        reference ECDF monotone, so the supremum is reached at a new-sample point
+        (zero included) or just before the next one: only O(nnz of the batch)
+        binary searches into the sorted reference columns are needed.
+        """
+        new = SortedColumns(new_data)
+        n_new = new.n_samples
+        new_counts = np.diff(new.indptr)
+        new_zero_counts = new.zero_counts
+
+        # Features where the whole batch is zero: the only new point is 0
+        all_columns = np.arange(self.n_features)
+        ref_below_zero = self.ref_negative_counts / self.n_samples
+        ref_at_zero = (self.ref_negative_counts + self.ref_zero_counts) / self.n_samples
+        statistics = np.maximum(ref_below_zero, 1.0 - ref_at_zero)
+
+        touched = np.flatnonzero(new_counts > 0)
+        if len(touched) == 0:
+            return statistics
+
+        # Candidate points of touched features: their nonzeros, plus 0 if the batch has zeros there
+        point_columns = np.repeat(all_columns, new_counts)
+        point_values = new.values
+        with_zero = touched[new_zero_counts[touched] > 0]
+        point_columns = np.concatenate([point_columns, with_zero])
+        point_values = np.concatenate([point_values, np.zeros(len(with_zero))])
+
+        order = np.lexsort((point_values, point_columns))
+        point_columns, point_values = point_columns[order], point_values[order]
+        # Keep distinct (feature, value) points only
+        distinct = np.ones(len(point_values), dtype=bool)
+        distinct[:-1] = (point_columns[1:] != point_columns[:-1]) | (point_values[1:] != point_values[:-1])
+        point_columns, point_values = point_columns[distinct], point_values[distinct]
+
+        new_cdf = (
+            _segmented_count(new.values, new.indptr[point_columns], new.indptr[point_columns + 1], point_values, "right")
+            + new_zero_counts[point_columns] * (point_values >= 0)
+        ) / n_new
+        ref_cdf = self._ref_cdf(point_columns, point_values, "right")
+        ref_cdf_left = self._ref_cdf(point_columns, point_values, "left")
+
+        # Reference ECDF just before the next point of the same feature (1.0 after the last)
+        is_last = np.ones(len(point_columns), dtype=bool)
+        is_last[:-1] = point_columns[1:] != point_columns[:-1]
+        next_left = np.ones(len(point_columns))
+        next_left[:-1] = ref_cdf_left[1:]
+        next_left[is_last] = 1.0
+
+        is_first = np.ones(len(point_columns), dtype=bool)
+        is_first[1:] = point_columns[1:] != point_columns[:-1]
+
+        gaps = np.maximum(np.abs(ref_cdf - new_cdf), np.abs(next_left - new_cdf))
+        # Below the first point the new ECDF is 0
+        gaps[is_first] = np.maximum(gaps[is_first], ref_cdf_left[is_first])
+
+        touched_statistics = np.zeros(self.n_features)
+        np.maximum.at(touched_statistics, point_columns, gaps)
+        statistics[touched] = touched_statistics[touched]
+        return statistics
+
+    def ks_p_values(self, statistics, n_new):
+        """
+        p-values for an array of KS statistics with the same sample sizes, as
+        ks_2samp(method='auto') would compute them. Evaluated once per distinct D.
+        """
+        n1, n2 = self.n_samples, n_new
+        unique_d, inverse = np.unique(statistics, return_inverse=True)
+
+        if max(n1, n2) <= MAX_EXACT_N:
+            p_unique = np.empty(len(unique_d))
+            for i, d in enumerate(unique_d):
+                prob = _exact_p_value(float(d), n1, n2)
+                if prob is None:
+                    prob = self._asymptotic_p_values(np.array([d]), n1, n2)[0]
+                p_unique[i] = prob
+        else:
+            p_unique = self._asymptotic_p_values(unique_d, n1, n2)
+
+        return np.clip(p_unique, 0, 1)[inverse]
+
+    @staticmethod
+    def _asymptotic_p_values(statistics, n1, n2):
+        m, n = sorted([float(n1), float(n2)], reverse=True)
+        en = m * n / (m + n)
+        return kstwo.sf(statistics, np.round(en))
+
+    def _drifted_features(self, p_values):
+        """Boolean mask of drifted features under the configured multiple-testing correction."""
+        if self.correction == "bonferroni":
+            return p_values < self.p_val / len(p_values)
+        if self.correction == "fdr":
+            # Benjamini-Hochberg step-up procedure
+            m = len(p_values)
+            order = np.argsort(p_values)
+            below = p_values[order] <= self.p_val * np.arange(1, m + 1) / m
+            if not below.any():
+                return np.zeros(m, dtype=bool)
+            cutoff = p_values[order][np.flatnonzero(below).max()]
+            return p_values <= cutoff
+        return p_values < self.p_val
 
     def check_drift(self, new_data):
         """
         Compare incoming 'new_data' against the reference set using Feature-wise KS Test.
         Returns drift status and metrics.
         """
-        if hasattr(new_data, 'toarray'):
-            new_data = new_data.toarray()
-            
         n_new = new_data.shape[0]
         if n_new == 0:
              return {
@@ -35,63 +286,143 @@ class DriftMonitor:
                 "timestamp": str(np.datetime64('now'))
             }
 
-        # Feature-wise KS Test
-        p_values = []
-        drifted_features = 0
-        
-        for i in range(self.n_features):
-            # Extract feature column
-            ref_feature = self.reference_data[:, i]
-            new_feature = new_data[:, i]
-            
-            # Run KS Test
-            # statistic, pvalue = ks_2samp(data1, data2)
-            # ks_2samp handles different sample sizes fine.
-            try:
-                stat, p_val_feature = ks_2samp(ref_feature, new_feature)
-            except Exception:
-                p_val_feature = 1.0 # Fail safe
-            
-            p_values.append(p_val_feature)
-            
-            if p_val_feature < self.p_val:
-                drifted_features += 1
-
-        avg_p_val = float(np.mean(p_values)) if p_values else 0.0
-        
-        # Simple Aggregation Logic: 
-        # If any feature drifted significantly? Or a percentage?
-        # Alibi KSDrift often uses a correction (Bonferroni etc). 
-        # Here we'll use a simple heuristic: if > 10% of features drift or avg p-val is very low.
-        # But for strict compatibility with previous "is_drift" flag check:
-        # Let's flag drift if ANY feature drifts, but maybe that's too sensitive.
-        # Let's say if at least 1 feature drifts seriously.
-        
+        statistics = self.ks_statistics(new_data)
+        p_values = self.ks_p_values(statistics, n_new)
+        drifted = self._drifted_features(p_values)
+        drifted_features = int(drifted.sum())
+
+        avg_p_val = float(np.mean(p_values)) if len(p_values) else 0.0
         is_drift = drifted_features > 0
-        
-        # To be more robust vs noise, maybe require > 5% of features? 
-        # For now, let's keep it sensitive.
-        
+
         return {
             "is_drift": is_drift,
             "drifted_feature_count": drifted_features,
             "p_value_avg": avg_p_val,
+            "p_value_min": float(p_values.min()) if len(p_values) else 1.0,
             "threshold": self.p_val,
+            "correction": self.correction,
+            "reference_bytes": self.reference.nbytes,
             "message": "Significant Drift Detected!" if is_drift else "Data Distribution Stable.",
             "timestamp": str(np.datetime64('now'))
         }
 
+    # --- Streaming ---
+    def observe(self, vectors):
+        """
+        Adds live query vectors (rows of a sparse or dense matrix) to the sliding window.
+        Only copies the rows' nonzeros; when the window closes, the KS tests run
+        on a background thread. Returns True if this call closed a window.
+        """
+        rows = sparse.csr_matrix(vectors)
+        if rows.shape[0] == 0:
+            return False
+        rows.sum_duplicates()
+        now = time.monotonic()
+
+        with self._window_lock:
+            for i in range(rows.shape[0]):
+                start, end = rows.indptr[i], rows.indptr[i + 1]
+                self._window.append((now, rows.indices[start:end].copy(), rows.data[start:end].copy()))
+            self._rows_since_close += rows.shape[0]
+
+            if self.window_seconds:
+                while self._window and now - self._window[0][0] > self.window_seconds:
+                    self._window.popleft()
+            DRIFT_WINDOW_FILL.set(len(self._window))
+
+            due = self._rows_since_close >= self.window_step
+            if self.window_seconds:
+                due = due or now - self._last_close >= self.window_seconds
+            if not due or len(self._window) < self.min_window_size:
+                return False
+
+            window = self._window_matrix()
+            self._rows_since_close = 0
+            self._last_close = now
+
+        self._submit(window)
+        return True
+
+    def _window_matrix(self):
+        counts = [len(indices) for _, indices, _ in self._window]
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        indices = np.concatenate([indices for _, indices, _ in self._window])
+        data = np.concatenate([data for _, _, data in self._window])
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(counts), self.n_features))
+
+    def _submit(self, window):
+        # At most one evaluation thread; a window closed meanwhile replaces any older pending one
+        with self._eval_lock:
+            if self._pending_window is not None:
+                DRIFT_WINDOWS_SKIPPED.inc()
+            self._pending_window = window
+            if self._eval_thread is not None:
+                return
+            self._eval_thread = threading.Thread(target=self._evaluate_pending, name="drift-window", daemon=True)
+            self._eval_thread.start()
+
+    def _evaluate_pending(self):
+        while True:
+            with self._eval_lock:
+                window = self._pending_window
+                self._pending_window = None
+                if window is None:
+                    self._eval_thread = None
+                    return
+            try:
+                start = time.perf_counter()
+                report = self.check_drift(window)
+                DRIFT_WINDOW_EVAL_SECONDS.observe(time.perf_counter() - start)
+                report["window_samples"] = window.shape[0]
+                self._publish(report)
+            except Exception as e:
+                print(f"Drift Window Error: {e}")
+
+    def _publish(self, report):
+        self.latest_report = report
+        self.windows_evaluated += 1
+        DRIFT_WINDOWS_EVALUATED.inc()
+        DRIFT_LAST_IS_DRIFT.set(1 if report["is_drift"] else 0)
+        DRIFT_LAST_DRIFTED_FEATURES.set(report["drifted_feature_count"])
+        DRIFT_LAST_P_VALUE_MIN.set(report["p_value_min"])
+        DRIFT_LAST_P_VALUE_AVG.set(report["p_value_avg"])
+        DRIFT_LAST_WINDOW_SAMPLES.set(report["window_samples"])
+        DRIFT_LAST_EVALUATED_AT.set(time.time())
+
+    def wait_for_evaluation(self, timeout=10.0):
+        """Blocks until no window is waiting or being evaluated (scripts/tests)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._eval_lock:
+                if self._eval_thread is None:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def window_status(self):
+        with self._window_lock:
+            window_fill = len(self._window)
+        return {
+            "window_fill": window_fill,
+            "window_size": self.window_size,
+            "window_step": self.window_step,
+            "window_seconds": self.window_seconds,
+            "windows_evaluated": self.windows_evaluated,
+            "latest_report": self.latest_report
+        }
+
 if __name__ == "__main__":
     # Test stub
     print("Testing DriftMonitor...")
     ref = np.random.normal(0, 1, (100, 5)) # 100 samples, 5 features
     monitor = DriftMonitor(ref)
-    
+
     # Same distribution
     new_same = np.random.normal(0, 1, (50, 5))
     result_same = monitor.check_drift(new_same)
     print(f"Same Dist: {result_same['message']} (Drift: {result_same['is_drift']})")
-    
+
     # Diff distribution
     new_diff = np.random.normal(2, 1, (50, 5)) # Mean shifted
     result_diff = monitor.check_drift(new_diff)
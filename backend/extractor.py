@@ -1,50 +1,226 @@
-import re
+import hashlib
+from collections import deque
+
 import fitz  # PyMuPDF
 
+
+def _is_word_char(ch):
+    # Same characters regex \w treats as word characters
+    return ch.isalnum() or ch == "_"
+
+
+class SkillAutomaton:
+    def __init__(self, skills):
+        """
+        Aho-Corasick automaton over all skills, built once.
+        find_all() reports every skill occurring in a text in a single pass,
+        whatever the vocabulary size.
+        Word-boundary rule: a skill edge that is a word character (the 'c' of
+        'c' or 'c++') must not touch another word character in the text, so 'c'
+        is not found in 'score'; non-word edges ('+', '.') need no boundary.
+        """
+        self.skills = sorted(s for s in skills if s)
+        self.goto = [{}]
+        self.fail = [0]
+        # Pattern ids ending at each state (own and inherited through fail links)
+        self.outputs = [[]]
+
+        for pattern_id, skill in enumerate(self.skills):
+            state = 0
+            for ch in skill:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                state = next_state
+            self.outputs[state].append(pattern_id)
+
+        # Breadth-first: a state's fail link is resolved before its children's
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+                pending.append(child)
+
+        self.lengths = [len(skill) for skill in self.skills]
+        self.word_start = [_is_word_char(skill[0]) for skill in self.skills]
+        self.word_end = [_is_word_char(skill[-1]) for skill in self.skills]
+
+        self.max_length = max(self.lengths, default=0)
+
+    def scanner(self):
+        """Incremental scanner: feed() the text chunk by chunk (e.g. page by page)."""
+        return SkillScanner(self)
+
+    def find_all(self, text):
+        """Returns the skills found in text (already lower-cased), in order of first occurrence."""
+        scanner = self.scanner()
+        scanner.feed(text)
+        return scanner.finish()
+
+
+class SkillScanner:
+    def __init__(self, automaton):
+        """
+        Runs a SkillAutomaton over a text that arrives in chunks. The automaton
+        state and the last few characters carry over, so a skill split across
+        two chunks (or touching a chunk edge) is handled exactly as in one pass.
+        """
+        self.automaton = automaton
+        self.state = 0
+        self.offset = 0  # position of the next chunk in the whole text
+        self.tail = ""   # last max_length characters seen (for the start boundary check)
+        self.found = {}  # pattern id -> first start position
+        # Matches ending on the last character seen; their end boundary depends on the next chunk
+        self.pending = []
+
+    def feed(self, text):
+        """Scans the next chunk of the (lower-cased) text."""
+        if not text:
+            return
+        automaton = self.automaton
+        goto, fail, outputs = automaton.goto, automaton.fail, automaton.outputs
+        lengths, word_start, word_end = automaton.lengths, automaton.word_start, automaton.word_end
+        found = self.found
+
+        if self.pending:
+            if not _is_word_char(text[0]):
+                for pattern_id, start in self.pending:
+                    found.setdefault(pattern_id, start)
+            self.pending = []
+
+        buffer = self.tail + text
+        base = self.offset - len(self.tail)  # position of buffer[0] in the whole text
+        last = len(buffer) - 1
+        state = self.state
+
+        for end in range(len(self.tail), len(buffer)):
+            ch = buffer[end]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            for pattern_id in outputs[state]:
+                if pattern_id in found:
+                    continue
+                start = end - lengths[pattern_id] + 1
+                if word_start[pattern_id] and base + start > 0 and _is_word_char(buffer[start - 1]):
+                    continue
+                if word_end[pattern_id]:
+                    if end == last:
+                        self.pending.append((pattern_id, base + start))
+                        continue
+                    if _is_word_char(buffer[end + 1]):
+                        continue
+                found[pattern_id] = base + start
+
+        self.state = state
+        self.offset += len(text)
+        self.tail = buffer[-automaton.max_length:] if automaton.max_length else ""
+
+    def finish(self):
+        """End of text: returns the skills found, in order of first occurrence."""
+        for pattern_id, start in self.pending:
+            self.found.setdefault(pattern_id, start)
+        self.pending = []
+        return [self.automaton.skills[pattern_id] for pattern_id in sorted(self.found, key=self.found.get)]
+
+
+# Preview length returned by parse_resume
+PREVIEW_CHARS = 1000
+
+
 class ResumeExtractor:
-    def __init__(self, known_skills=None):
+    def __init__(self, known_skills=None, max_pages=50, max_chars=200000):
         """
         known_skills: A set/list of skills to look for (vocabulary).
         If None, extraction will be less accurate (just simple patterns).
+        max_pages / max_chars: reading stops at whichever cap is hit first,
+        so huge or malicious PDFs cost bounded time and memory (None = no cap).
         """
+        self.max_pages = max_pages
+        self.max_chars = max_chars
         self.known_skills = set([s.lower() for s in known_skills]) if known_skills else set()
+        # All skills matched in one pass over the text
+        self.skill_automaton = SkillAutomaton(self.known_skills)
+        # Identifies the vocabulary (worker processes and caches key on it)
+        self.vocabulary_version = hashlib.sha256("\n".join(self.skill_automaton.skills).encode("utf-8")).hexdigest()[:16]
 
-    def extract_text_from_pdf(self, pdf_path):
+    @staticmethod
+    def open_pdf(source):
+        """
+        Opens a PDF from a file path, raw bytes or a binary file object.
+        Bytes and streams are parsed in memory (no temp file).
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return fitz.open(stream=source, filetype="pdf")
+        if hasattr(source, "read"):
+            return fitz.open(stream=source.read(), filetype="pdf")
+        return fitz.open(source)
+
+    def iter_pdf_pages(self, source):
+        """
+        Yields the text of each page, stopping at max_pages pages or
+        max_chars characters (the last page is cut to fit).
+        source: PDF path, bytes or binary file object.
+        """
+        chars_left = self.max_chars
         try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            return text
+            with self.open_pdf(source) as doc:
+                for page_number, page in enumerate(doc):
+                    if self.max_pages is not None and page_number >= self.max_pages:
+                        return
+                    text = page.get_text()
+                    if chars_left is not None:
+                        text = text[:chars_left]
+                        chars_left -= len(text)
+                    yield text
+                    if chars_left == 0:
+                        return
         except Exception as e:
             print(f"Error reading PDF: {e}")
-            return ""
+
+    def extract_text_from_pdf(self, source):
+        """source: PDF path, bytes or binary file object."""
+        return "".join(self.iter_pdf_pages(source))
 
     def extract_skills_from_text(self, text):
         """
-        Simple keyword-based extraction using the dataset vocabulary.
+        Keyword-based extraction using the dataset vocabulary.
+        Matches whole words/phrases only (no 'c' in 'score'), including skills
+        like 'c++' or 'node.js', in one pass over the text.
         """
-        text_lower = text.lower()
-        extracted = []
-        
         if not self.known_skills:
             # Fallback simple extraction if no vocab (not ideal)
             return []
 
-        for skill in self.known_skills:
-            # Use regex to match whole words/phrases to avoid partial matches (e.g., 'c' in 'score')
-            # Escape regex special chars in skill names like 'c++'
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                extracted.append(skill)
-        
-        return list(set(extracted))
-
-    def parse_resume(self, pdf_path):
-        text = self.extract_text_from_pdf(pdf_path)
-        skills = self.extract_skills_from_text(text)
-        
+        return self.skill_automaton.find_all(text.lower())
+
+    def parse_resume(self, source):
+        """
+        Streams the PDF page by page into the skill scanner; only the preview
+        is kept, never the full text.
+        """
+        scanner = self.skill_automaton.scanner()
+        preview = []
+        preview_chars = 0
+
+        for page_text in self.iter_pdf_pages(source):
+            if preview_chars < PREVIEW_CHARS:
+                preview.append(page_text[:PREVIEW_CHARS - preview_chars])
+                preview_chars += len(preview[-1])
+            if self.known_skills:
+                scanner.feed(page_text.lower())
+
         return {
-            "text": text[:1000] + "...", # Preview
-            "skills": skills
+            "text": "".join(preview) + "...", # Preview
+            "skills": scanner.finish()
         }
@@ -0,0 +1,270 @@
+import argparse
+import datetime
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from metrics import SKILL_DEMAND_FORECAST_SECONDS, SKILL_DEMAND_POSTINGS_INGESTED
+
+# Columns read as the posting date, in order of preference
+DATE_COLUMNS = ("posted_at", "posting_date", "date")
+# Period code -> pandas frequency (weeks start on Monday, months on the 1st)
+PERIODS = {"D": "D", "W": "W-MON", "M": "MS"}
+# Period code -> length of one period
+PERIOD_OFFSETS = {"D": pd.DateOffset(days=1), "W": pd.DateOffset(weeks=1), "M": pd.DateOffset(months=1)}
+
+# Smoothing parameters tried for every series (level alpha x trend beta)
+ALPHA_GRID = (0.1, 0.3, 0.5, 0.8)
+BETA_GRID = (0.05, 0.2, 0.5)
+
+
+def posting_days(postings, date=None):
+    """
+    Day ('YYYY-MM-DD') of each posting: its date column (see DATE_COLUMNS)
+    if present and valid, else date (default: today, UTC).
+    """
+    stamp = pd.Timestamp(date or datetime.datetime.now(datetime.timezone.utc).date())
+    date_column = next((c for c in DATE_COLUMNS if c in postings.columns), None)
+    if date_column is None:
+        return pd.Series(stamp.strftime("%Y-%m-%d"), index=postings.index)
+    days = pd.to_datetime(postings[date_column], errors="coerce", utc=True).dt.tz_localize(None)
+    return days.fillna(stamp).dt.strftime("%Y-%m-%d")
+
+
+def posting_skill_counts(postings, date=None):
+    """
+    Number of postings requiring each skill, per posting day.
+    postings: DataFrame with 'required_skills' (comma-separated) and,
+        optionally, a date column (see posting_days).
+    Returns a DataFrame of (day, skill, postings).
+    """
+    skills = postings['required_skills'].fillna("").astype(str).str.lower().str.split(",")
+    frame = pd.DataFrame({"day": posting_days(postings, date).to_numpy(), "posting": np.arange(len(postings)),
+                          "skill": skills.to_numpy()})
+    frame = frame.explode("skill")
+    frame["skill"] = frame["skill"].str.strip()
+    # A skill listed twice in one posting still counts once
+    frame = frame[frame["skill"].astype(bool)].drop_duplicates(["posting", "skill"])
+    return frame.groupby(["day", "skill"]).size().reset_index(name="postings")
+
+
+class SkillDemandStore:
+    def __init__(self, directory):
+        """
+        Per-day skill demand counters, one parquet file per day
+        (day=YYYY-MM-DD.parquet: skill, postings). Ingesting postings only
+        rewrites the files of the days they fall on; readers reload only the
+        files whose modification time changed (e.g. written by another worker).
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._days = {}     # day -> Series(postings, index=skill)
+        self._mtimes = {}   # file name -> mtime when loaded
+        self.version = 0    # bumped whenever the counters change
+        self._matrices = {}  # period -> (version, matrix() result)
+
+    def _path(self, day):
+        return os.path.join(self.directory, f"day={day}.parquet")
+
+    def ingest(self, postings, date=None):
+        """Adds postings to the counters; returns {day: postings added}."""
+        counts = posting_skill_counts(postings, date)
+        with self._lock:
+            self._refresh()
+            for day, day_counts in counts.groupby("day"):
+                added = day_counts.set_index("skill")["postings"]
+                current = self._days.get(day)
+                merged = added if current is None else current.add(added, fill_value=0).astype(np.int64)
+                # Temp file + rename, so readers never see half a day
+                path = self._path(day)
+                merged.rename("postings").rename_axis("skill").reset_index().to_parquet(path + ".tmp", index=False)
+                os.replace(path + ".tmp", path)
+                self._days[day] = merged
+                self._mtimes[os.path.basename(path)] = os.stat(path).st_mtime_ns
+            self.version += 1
+
+        SKILL_DEMAND_POSTINGS_INGESTED.inc(len(postings))
+        return {day: int(n) for day, n in posting_days(postings, date).value_counts().sort_index().items()}
+
+    def _refresh(self):
+        # Caller holds the lock
+        seen = set()
+        changed = False
+        for name in os.listdir(self.directory):
+            if not (name.startswith("day=") and name.endswith(".parquet")):
+                continue
+            seen.add(name)
+            mtime = os.stat(os.path.join(self.directory, name)).st_mtime_ns
+            if self._mtimes.get(name) != mtime:
+                table = pd.read_parquet(os.path.join(self.directory, name))
+                self._days[name[4:-8]] = table.set_index("skill")["postings"].astype(np.int64)
+                self._mtimes[name] = mtime
+                changed = True
+        for name in set(self._mtimes) - seen:
+            del self._mtimes[name]
+            self._days.pop(name[4:-8], None)
+            changed = True
+        if changed:
+            self.version += 1
+
+    def matrix(self, period="D"):
+        """
+        Demand as a dense (skills x periods) matrix, periods without postings
+        filled with zeros. period: 'D' (day), 'W' (week) or 'M' (month); the
+        last period may be partial. Rebuilt only after the counters change.
+        Returns (skills, period start dates, counts).
+        """
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {tuple(PERIODS)}")
+        with self._lock:
+            self._refresh()
+            cached = self._matrices.get(period)
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+            version, days = self.version, dict(self._days)
+
+        if not days:
+            result = [], [], np.zeros((0, 0), dtype=np.int64)
+        else:
+            frame = pd.DataFrame(days).fillna(0).astype(np.int64)  # skills x days
+            frame.columns = pd.to_datetime(frame.columns)
+            frame = frame.sort_index().T.sort_index().asfreq("D", fill_value=0)
+            if period != "D":
+                frame = frame.resample(PERIODS[period], label="left", closed="left").sum()
+            result = frame.columns.tolist(), [d.strftime("%Y-%m-%d") for d in frame.index], frame.to_numpy().T
+        with self._lock:
+            self._matrices[period] = (version, result)
+        return result
+
+    def stats(self):
+        with self._lock:
+            self._refresh()
+            return {"days": len(self._days), "first_day": min(self._days, default=None),
+                    "last_day": max(self._days, default=None), "version": self.version}
+
+
+def holt_forecast(series, horizon, alphas=ALPHA_GRID, betas=BETA_GRID):
+    """
+    Holt's linear-trend exponential smoothing fitted to every row of series
+    (skills x periods) at once: each (alpha, beta) pair of the grid runs over
+    all series in the same array operations, and each series keeps the pair
+    with the lowest one-step-ahead squared error.
+    Returns (forecast: skills x horizon, clipped at 0; level; trend; rmse).
+    """
+    series = np.asarray(series, dtype=np.float64)
+    n_series, n_periods = series.shape
+    if n_periods == 0:
+        zeros = np.zeros(n_series)
+        return np.zeros((n_series, horizon)), zeros, zeros, zeros
+
+    grid_alpha, grid_beta = (g.ravel()[:, None] for g in np.meshgrid(alphas, betas, indexing="ij"))
+    level = np.broadcast_to(series[:, 0], (len(grid_alpha), n_series)).copy()
+    trend = np.zeros_like(level) if n_periods < 2 else np.broadcast_to(series[:, 1] - series[:, 0], level.shape).copy()
+    sse = np.zeros_like(level)
+
+    for t in range(1, n_periods):
+        predicted = level + trend
+        observed = series[:, t]
+        sse += (observed - predicted) ** 2
+        new_level = grid_alpha * observed + (1 - grid_alpha) * predicted
+        trend = grid_beta * (new_level - level) + (1 - grid_beta) * trend
+        level = new_level
+
+    best = sse.argmin(axis=0)
+    columns = np.arange(n_series)
+    level, trend = level[best, columns], trend[best, columns]
+    rmse = np.sqrt(sse[best, columns] / max(n_periods - 1, 1))
+    forecast = np.clip(level[:, None] + trend[:, None] * np.arange(1, horizon + 1), 0, None)
+    return forecast, level, trend, rmse
+
+
+# Ranking orders of forecast_skills
+SORT_KEYS = ("demand", "growth")
+
+
+def forecast_skills(store, horizon=4, period="W", top=20, skills=None, history=12, sort="demand", as_of=None):
+    """
+    Forecasts the demand (postings per period) of every skill in the store,
+    all series in one holt_forecast call.
+    skills: restrict to these skills (default: the top skills of the ranking).
+    sort: 'demand' (forecast postings) or 'growth' (forecast vs. recent periods).
+    as_of: first day without complete data (default: today, UTC). A period
+        not over by then (e.g. the current week) is left out of the fit, as
+        its low counts would drag the trend down; it becomes the first
+        forecast period instead.
+    Returns {"period", "history_periods", "partial_period", "forecast_periods",
+        "skills": [{"skill", "history", "forecast", "trend", "growth", "rmse"}]}.
+    """
+    start = time.perf_counter()
+    names, periods, counts = store.matrix(period)
+
+    # Periods are sorted, so only the trailing ones can still be running
+    as_of = pd.Timestamp(as_of or datetime.datetime.now(datetime.timezone.utc).date())
+    complete = sum(pd.Timestamp(p) + PERIOD_OFFSETS[period] <= as_of for p in periods)
+    partial = periods[complete] if complete < len(periods) else None
+    periods, counts = periods[:complete], counts[:, :complete]
+
+    result = {"period": period, "history_periods": periods[-history:], "partial_period": partial,
+              "forecast_periods": [], "skills": []}
+    if not names or not periods:
+        return result
+
+    if skills:
+        wanted = {s.lower().strip() for s in skills}
+        keep = [i for i, name in enumerate(names) if name in wanted]
+        names, counts = [names[i] for i in keep], counts[keep]
+
+    forecast, _, trend, rmse = holt_forecast(counts, horizon)
+    # Growth: forecast average against the average of the last `horizon` periods
+    recent = counts[:, -horizon:].mean(axis=1)
+    growth = np.where(recent > 0, (forecast.mean(axis=1) - recent) / np.maximum(recent, 1e-9), 0.0)
+
+    ranking = forecast.sum(axis=1) if sort == "demand" else growth
+    # Highest first, ties by skill name
+    order = np.lexsort((np.array(names, dtype=str), -ranking))
+    if not skills:
+        order = order[:top]
+
+    offset = PERIOD_OFFSETS[period]
+    last = pd.Timestamp(periods[-1])
+    result["forecast_periods"] = [(last + offset * (i + 1)).strftime("%Y-%m-%d") for i in range(horizon)]
+    result["skills"] = [{
+        "skill": names[i],
+        "history": counts[i, -history:].tolist(),
+        "forecast": np.round(forecast[i], 2).tolist(),
+        "trend": round(float(trend[i]), 4),
+        "growth": round(float(growth[i]), 4),
+        "rmse": round(float(rmse[i]), 4),
+    } for i in order]
+    SKILL_DEMAND_FORECAST_SECONDS.observe(time.perf_counter() - start)
+    return result
+
+
+if __name__ == "__main__":
+    # python forecast.py ingest postings.csv --date 2024-05-01
+    # python forecast.py forecast --period W --horizon 4
+    parser = argparse.ArgumentParser(description="Skill demand counters and forecasts.")
+    parser.add_argument("command", choices=("ingest", "forecast"))
+    parser.add_argument("postings", nargs="?", help="CSV with required_skills (and optionally posted_at) to ingest")
+    parser.add_argument("--store", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_demand"))
+    parser.add_argument("--date", default=None, help="Day for postings without a posted_at date (default: today)")
+    parser.add_argument("--period", choices=tuple(PERIODS), default="W")
+    parser.add_argument("--horizon", type=int, default=4)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--sort", choices=SORT_KEYS, default="demand")
+    args = parser.parse_args()
+
+    demand_store = SkillDemandStore(args.store)
+    if args.command == "ingest":
+        if not args.postings:
+            parser.error("ingest needs a postings CSV")
+        added = demand_store.ingest(pd.read_csv(args.postings), args.date)
+        print(f"Ingested {sum(added.values())} postings into {len(added)} day(s): {added}")
+    else:
+        forecasts = forecast_skills(demand_store, args.horizon, args.period, args.top, sort=args.sort)
+        for entry in forecasts["skills"]:
+            print(f"{entry['skill']:<30} next {args.horizon} {args.period}: {entry['forecast']}  growth {entry['growth']:+.0%}")
@@ -0,0 +1,221 @@
+import re
+import weakref
+
+from extractor import SkillAutomaton
+
+CLOSING_LINE = "You're doing great — let’s move one step at a time 🚀"
+
+
+def normalize_message(message):
+    """Lower-cased, punctuation-insensitive form of a chat message (keeps c++, node.js, c#)."""
+    text = re.sub(r"[^\w\s+#.]", " ", message.lower())
+    return " ".join(text.split()).strip(" .")
+
+
+def context_skills(context):
+    """Skills of the user from the chat context (the dashboard's analysis result)."""
+    if not isinstance(context, dict):
+        return []
+    skills = context.get("extracted_skills") or context.get("skills") or []
+    return [str(s).lower().strip() for s in skills if str(s).strip()]
+
+
+# Automata over each matcher's role names and skills, built on first use
+_role_automata = weakref.WeakKeyDictionary()
+_skill_automata = weakref.WeakKeyDictionary()
+
+
+def find_role(message, matcher):
+    """Longest dataset role named in the (normalized) message, or None."""
+    entry = _role_automata.get(matcher)
+    if entry is None:
+        # Role names normalized like messages ('ui/ux designer' -> 'ui ux designer')
+        names = {normalize_message(role): role for role in matcher.role_rows}
+        entry = _role_automata[matcher] = (SkillAutomaton(names), names)
+    automaton, names = entry
+    roles = automaton.find_all(message)
+    return names[max(roles, key=len)] if roles else None
+
+
+def find_skills(message, matcher):
+    automaton = _skill_automata.get(matcher)
+    if automaton is None:
+        automaton = _skill_automata[matcher] = SkillAutomaton(matcher.skill_vocab)
+    return automaton.find_all(message)
+
+
+def _display_role(role, matcher):
+    return matcher.role_profile(role)["role"]
+
+
+# --- Intent handlers: (message, context, matcher) -> response text or None ---
+
+def start_intent(message, context, matcher):
+    # Intent: Starting out
+    if message in ["where should i start", "how do i start", "start"]:
+        return "Tell me your top 3 skills, current city, and target job role."
+    return None
+
+
+def upload_help_intent(message, context, matcher):
+    # Intent: Resume Upload Help
+    if "upload" in message and "resume" in message:
+        return "You can upload your resume using the 'Start Analysis' button on the dashboard or the upload section above. Once uploaded, I can give you specific career advice!"
+    return None
+
+
+def company_help_intent(message, context, matcher):
+    # Intent: Company Recommendations (Simplified Local Check)
+    if "companies" in message and "recommend" in message:
+        return "I can definitely help with that! If you have processed your resume, check the 'Career Strategy' report at the bottom of the dashboard for detailed company recommendations."
+    return None
+
+
+def role_skills_intent(message, context, matcher):
+    """'What skills do I need for data analyst?', 'skill gap for data scientist'..."""
+    words = set(message.split())
+    if matcher is None or not (words & {"skill", "skills", "require", "required", "requirements", "missing", "gap"}):
+        return None
+    role = find_role(message, matcher)
+    if role is None:
+        return None
+    return _role_skills_answer(role, context, matcher)
+
+
+def _role_skills_answer(role, context, matcher):
+    required = [skill for skill, _ in matcher.role_skills(role)]
+    user_skills = set(context_skills(context))
+    lines = ["Here’s what I found 👇", f"- Key Skills for {_display_role(role, matcher)} → {', '.join(required[:8])}"]
+    to_learn = required
+    if user_skills:
+        have = [s for s in required if s in user_skills]
+        to_learn = [s for s in required if s not in user_skills]
+        lines.append(f"- You Already Have → {', '.join(have) if have else 'none of them yet'}")
+        lines.append(f"- Missing Skills → {', '.join(to_learn) if to_learn else 'none, you cover them all!'}")
+    if to_learn:
+        steps = [f"Step {i + 1}: {skill}" for i, skill in enumerate(to_learn[:3])]
+        lines.append(f"- Roadmap → {', '.join(steps)}")
+    lines.append(CLOSING_LINE)
+    return "\n".join(lines)
+
+
+def role_facts_intent(message, context, matcher):
+    """'Salary of a data scientist?', 'experience needed for backend developer', 'who hires data analysts'..."""
+    words = set(message.split())
+    asks_salary = bool(words & {"salary", "salaries", "pay", "paid", "earn", "earns", "ctc", "package"})
+    asks_experience = bool(words & {"experience", "years", "senior", "junior", "fresher", "freshers"})
+    asks_companies = bool(words & {"companies", "company", "hire", "hires", "hiring", "employers"})
+    if matcher is None or not (asks_salary or asks_experience or asks_companies):
+        return None
+    role = find_role(message, matcher)
+    if role is None:
+        # No dataset role named (e.g. general company advice): report / LLM
+        return None
+
+    profile = matcher.role_profile(role)
+    lines = ["Here’s what I found 👇"]
+    salary = profile["salary"]
+    if asks_salary and salary["median"] is not None:
+        lines.append(
+            f"- Salary for {profile['role']} → median {salary['median']:,.0f} "
+            f"(typical range {salary['p25']:,.0f} - {salary['p75']:,.0f}, {profile['postings']} postings)"
+        )
+    if asks_experience and profile["experience"]:
+        bands = ", ".join(f"{e['band']} ({e['share']:.0%})" for e in profile["experience"][:3])
+        lines.append(f"- Experience Asked → {bands}")
+    if asks_companies and profile["companies"]:
+        companies = ", ".join(c["company"] for c in profile["companies"][:5])
+        lines.append(f"- Companies Hiring {profile['role']} → {companies}")
+    if len(lines) == 1:
+        return None
+    lines.append(CLOSING_LINE)
+    return "\n".join(lines)
+
+
+def matching_roles_intent(message, context, matcher):
+    """'Which roles fit my skills?', 'what jobs match python and sql'..."""
+    words = set(message.split())
+    if matcher is None or not (words & {"role", "roles", "job", "jobs"}):
+        return None
+    if not (words & {"fit", "fits", "suit", "suits", "match", "matches", "suitable", "best"}):
+        return None
+
+    skills = find_skills(message, matcher) or context_skills(context)
+    if not skills:
+        return None
+    return _matching_roles_answer(skills, matcher)
+
+
+def _matching_roles_answer(skills, matcher):
+    matches = matcher.match_jobs(skills, k=3)
+    if not matches:
+        return None
+
+    roles = ", ".join(f"{m['job_role']} ({m['match_score']}%)" for m in matches)
+    return "\n".join([
+        "Here’s what I found 👇",
+        f"- Skills Considered → {', '.join(skills)}",
+        f"- Best Matched Roles → {roles}",
+        f"- Missing Skills ({matches[0]['job_role']}) → {', '.join(matches[0]['missing_skills']) or 'none'}",
+        CLOSING_LINE
+    ])
+
+
+def fallback_response(message, context=None, matcher=None):
+    """
+    Best dataset-only answer while the LLM is unavailable: the named role's
+    skills, else roles for the user's skills, else the getting-started prompt.
+    """
+    notice = "⚠️ The AI mentor is busy right now, so here's what I can tell from our job data:"
+    message = normalize_message(message)
+    answer = None
+    try:
+        if matcher is not None:
+            role = find_role(message, matcher)
+            if role is not None:
+                answer = _role_skills_answer(role, context, matcher)
+            else:
+                skills = find_skills(message, matcher) or context_skills(context)
+                answer = _matching_roles_answer(skills, matcher) if skills else None
+    except Exception as e:
+        print(f"Intent Error (fallback): {e}")
+    return f"{notice}\n{answer or 'Tell me your top 3 skills, current city, and target job role.'}"
+
+
+DEFAULT_INTENTS = [
+    ("start", start_intent),
+    ("upload_help", upload_help_intent),
+    ("company_help", company_help_intent),
+    ("role_skills", role_skills_intent),
+    ("role_facts", role_facts_intent),
+    ("matching_roles", matching_roles_intent),
+]
+
+
+class IntentRouter:
+    def __init__(self, intents=None):
+        """
+        Answers messages locally before they reach the LLM. Handlers are tried
+        in registration order; the first non-None answer wins.
+        """
+        self.intents = list(DEFAULT_INTENTS if intents is None else intents)
+
+    def register(self, name, handler, first=False):
+        """Adds a handler(message, context, matcher) -> str | None."""
+        if first:
+            self.intents.insert(0, (name, handler))
+        else:
+            self.intents.append((name, handler))
+
+    def route(self, message, context=None, matcher=None):
+        """Returns (intent name, response) or None when the LLM should answer."""
+        normalized = normalize_message(message)
+        for name, handler in self.intents:
+            try:
+                response = handler(normalized, context, matcher)
+            except Exception as e:
+                print(f"Intent Error ({name}): {e}")
+                continue
+            if response is not None:
+                return name, response
+        return None
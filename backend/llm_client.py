@@ -0,0 +1,327 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+import weakref
+
+from metrics import (
+    CHAT_UPSTREAM_IN_FLIGHT, CHAT_UPSTREAM_SECONDS, LLM_BREAKER_STATE, LLM_BREAKER_TRANSITIONS, LLM_CALLS,
+    LLM_COALESCED, LLM_RATE_LIMIT_WAIT_SECONDS, LLM_RETRIES
+)
+
+
+class CircuitOpen(Exception):
+    """The upstream API is failing; calls are refused until the breaker's reset timeout."""
+
+
+class RateLimited(Exception):
+    """The local token bucket would make the caller wait longer than allowed."""
+
+
+# Error types worth retrying (and counting towards the breaker): quota, overload, timeouts, network
+RETRYABLE_ERRORS = {
+    "TooManyRequests": "rate_limited", "ResourceExhausted": "rate_limited",
+    "ServiceUnavailable": "unavailable", "InternalServerError": "server_error", "BadGateway": "server_error",
+    "GatewayTimeout": "timeout", "DeadlineExceeded": "timeout", "TimeoutError": "timeout",
+    "ConnectionError": "unavailable",
+}
+
+
+def retry_reason(error):
+    """Metric label for a retryable error, or None if retrying would not help (bad request, auth...)."""
+    for cls in type(error).__mro__:
+        if cls.__name__ in RETRYABLE_ERRORS:
+            return RETRYABLE_ERRORS[cls.__name__]
+    if "429" in str(error):
+        return "rate_limited"
+    return None
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        """
+        rate: requests per second refilled; capacity: burst size.
+        A rate of 0 or None disables the limit.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """
+        Takes a token and returns the seconds to wait before using it.
+        Raises RateLimited (taking nothing) if that wait would exceed max_wait.
+        """
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Tokens go negative: later callers queue up behind earlier reservations
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                raise RateLimited(f"LLM request quota exhausted (next slot in {wait:.0f}s)")
+            self.tokens -= 1
+        LLM_RATE_LIMIT_WAIT_SECONDS.observe(wait)
+        return wait
+
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Opens after failure_threshold consecutive upstream failures; while open,
+        calls fail fast. After reset_timeout one probe call is let through
+        (half-open): success closes the breaker, failure opens it again.
+        A probe that never reports back (see release) is replaced by a new
+        one after another reset_timeout, so the breaker can't stay half-open.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self._lock = threading.Lock()
+        LLM_BREAKER_STATE.set(0)
+
+    def _transition(self, state):
+        self.state = state
+        LLM_BREAKER_STATE.set(self.STATE_VALUES[state])
+        LLM_BREAKER_TRANSITIONS.labels(state=state).inc()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                self._transition(self.HALF_OPEN)
+                self.probe_started_at = now
+                return True
+            if self.state == self.HALF_OPEN and now - self.probe_started_at >= self.reset_timeout:
+                # The previous probe went silent; let another one through
+                self.probe_started_at = now
+                return True
+            # Open, or half-open with the probe still running
+            return False
+
+    def release(self):
+        """
+        A call let through by allow() ended without reaching the API (local
+        rate limit, cancelled caller): the next call may probe right away.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_started_at = 0.0
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+
+class SharedStream:
+    def __init__(self):
+        """Chunks of one upstream call, replayed to every caller that asked for the same prompt."""
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.task = None  # the upstream call (referenced so it isn't garbage collected)
+        self._changed = asyncio.Event()
+
+    def push(self, chunk):
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error=None):
+        self.error = error
+        self.done = True
+        self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self):
+        position = 0
+        while True:
+            while position < len(self.chunks):
+                yield self.chunks[position]
+                position += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class LLMClient:
+    def __init__(self, stream_call, call=None, max_concurrency=8, requests_per_minute=60, burst=10,
+                 max_rate_wait=10.0, max_retries=3, backoff_base=0.5, backoff_max=8.0,
+                 first_chunk_timeout=30.0, breaker=None):
+        """
+        Guards the calls to the LLM API:
+        - token bucket (requests_per_minute, burst) kept under our quota; a
+          call that would wait more than max_rate_wait raises RateLimited
+        - at most max_concurrency calls in flight per event loop
+        - retries of quota/overload/timeout errors with jittered exponential
+          backoff (only before the first chunk, a partial answer is never replayed)
+        - circuit breaker: fails fast with CircuitOpen while the API is down
+        - identical prompts in flight at the same time share one upstream call
+        stream_call(prompt): async iterator of text chunks (one upstream call).
+        call(prompt): blocking call returning the full text (sync path).
+        """
+        self.stream_call = stream_call
+        self.call = call
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(requests_per_minute / 60.0 if requests_per_minute else 0, burst)
+        self.max_rate_wait = max_rate_wait
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.first_chunk_timeout = first_chunk_timeout
+        self.breaker = breaker or CircuitBreaker()
+
+        # Per event loop: concurrency semaphore and in-flight prompts (asyncio objects are loop-bound)
+        self._loop_state = weakref.WeakKeyDictionary()
+
+    def backoff(self, attempt):
+        # "Full jitter": spreads retries of many callers instead of synchronizing them
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _state(self):
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            state = self._loop_state[loop] = {"semaphore": asyncio.Semaphore(self.max_concurrency), "in_flight": {}}
+        return state
+
+    async def stream(self, prompt, endpoint="chat_stream"):
+        """Async generator of the answer's text chunks (shared with identical concurrent prompts)."""
+        state = self._state()
+        key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        shared = state["in_flight"].get(key)
+        if shared is not None:
+            LLM_COALESCED.inc()
+        else:
+            shared = state["in_flight"][key] = SharedStream()
+            # Runs as its own task, so one caller going away doesn't cut the others off
+            shared.task = asyncio.create_task(self._produce(prompt, endpoint, shared, state, key))
+
+        async for chunk in shared.follow():
+            yield chunk
+
+    async def _produce(self, prompt, endpoint, shared, state, key):
+        try:
+            async for chunk in self._call_with_retries(prompt, endpoint, state["semaphore"]):
+                shared.push(chunk)
+            shared.finish()
+        except Exception as e:
+            shared.finish(e)
+        finally:
+            state["in_flight"].pop(key, None)
+
+    async def _call_with_retries(self, prompt, endpoint, semaphore):
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                LLM_CALLS.labels(outcome="rejected").inc()
+                raise CircuitOpen("LLM API circuit breaker is open")
+
+            reported = False
+            try:
+                # Inside the try: a RateLimited or a cancellation here must still release the probe
+                await asyncio.sleep(self.bucket.reserve(self.max_rate_wait))
+
+                started = False
+                try:
+                    async with semaphore:
+                        CHAT_UPSTREAM_IN_FLIGHT.inc()
+                        start = time.perf_counter()
+                        try:
+                            chunks = self.stream_call(prompt).__aiter__()
+                            # A stalled upstream counts as a (retryable) timeout
+                            first = await asyncio.wait_for(chunks.__anext__(), self.first_chunk_timeout)
+                            started = True
+                            yield first
+                            async for chunk in chunks:
+                                yield chunk
+                        except StopAsyncIteration:
+                            pass
+                        finally:
+                            CHAT_UPSTREAM_SECONDS.labels(endpoint=endpoint).observe(time.perf_counter() - start)
+                            CHAT_UPSTREAM_IN_FLIGHT.dec()
+                except Exception as e:
+                    reported = True
+                    reason = self._record_failure(e)
+                    if started or reason is None or attempt == self.max_retries:
+                        raise
+                    LLM_RETRIES.labels(reason=reason).inc()
+                    await asyncio.sleep(self.backoff(attempt))
+                    continue
+
+                reported = True
+                self.breaker.record_success()
+                LLM_CALLS.labels(outcome="success").inc()
+                return
+            finally:
+                if not reported:
+                    self.breaker.release()
+
+    def generate(self, prompt):
+        """Blocking version for the sync chat path (same limits, no coalescing)."""
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                LLM_CALLS.labels(outcome="rejected").inc()
+                raise CircuitOpen("LLM API circuit breaker is open")
+
+            reported = False
+            try:
+                time.sleep(self.bucket.reserve(self.max_rate_wait))
+                try:
+                    text = self.call(prompt)
+                except Exception as e:
+                    reported = True
+                    reason = self._record_failure(e)
+                    if reason is None or attempt == self.max_retries:
+                        raise
+                    LLM_RETRIES.labels(reason=reason).inc()
+                    time.sleep(self.backoff(attempt))
+                    continue
+
+                reported = True
+                self.breaker.record_success()
+                LLM_CALLS.labels(outcome="success").inc()
+                return text
+            finally:
+                if not reported:
+                    self.breaker.release()
+
+    def _record_failure(self, error):
+        reason = retry_reason(error)
+        # Only upstream trouble trips the breaker; a rejected request (bad
+        # prompt, auth) still shows the API is up
+        if reason is not None:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        LLM_CALLS.labels(outcome="error").inc()
+        return reason
+
+    def stats(self):
+        return {"breaker": self.breaker.state, "consecutive_failures": self.breaker.failures,
+                "rate_limit_tokens": round(self.bucket.tokens, 2)}
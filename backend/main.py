@@ -1,9 +1,19 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, confloat, conint, conlist
 from typing import List, Optional
+import datetime
+import hashlib
+import json
 import shutil
 import os
+import tempfile
+import threading
+import time
+import uuid
+import pandas as pd
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,6 +42,8 @@ app.add_middleware(
 
 from prometheus_fastapi_instrumentator import Instrumentator
 
+# Custom metrics from metrics.py (caches, telemetry, ...) live in the default
+# prometheus_client registry, so they are served on the same /metrics endpoint
 Instrumentator().instrument(app).expose(app)
 
 app.include_router(auth_router)
@@ -41,28 +53,117 @@ app.include_router(auth_router)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATASET_PATH = os.path.join(BASE_DIR, "..", "dataset.csv")
 
+# Prebuilt, memory-mapped model artifacts (see artifacts.py); empty string disables
+MODEL_ARTIFACT_DIR = os.getenv("MODEL_ARTIFACT_DIR", os.path.join(BASE_DIR, "artifacts"))
+# Multiple-testing correction for the feature-wise drift tests: none | bonferroni | fdr
+DRIFT_CORRECTION = os.getenv("DRIFT_CORRECTION", "bonferroni")
+# Streaming drift: sliding window over live /match_jobs and /upload_resume queries.
+# The window closes every DRIFT_WINDOW_STEP new queries (default: window size)
+# or every DRIFT_WINDOW_SECONDS (0 = count-based only)
+DRIFT_WINDOW_SIZE = int(os.getenv("DRIFT_WINDOW_SIZE", "500"))
+DRIFT_WINDOW_STEP = int(os.getenv("DRIFT_WINDOW_STEP", "0")) or None
+DRIFT_WINDOW_SECONDS = float(os.getenv("DRIFT_WINDOW_SECONDS", "0")) or None
+DRIFT_WINDOW_MIN_SIZE = int(os.getenv("DRIFT_WINDOW_MIN_SIZE", "50"))
+# Resume parsing process pool: worker processes, extra queued uploads before 503, seconds before 504
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+RESUME_PARSE_MAX_QUEUE = int(os.getenv("RESUME_PARSE_MAX_QUEUE", "16"))
+RESUME_PARSE_TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", "30"))
+# Uploads up to this size (bytes) are parsed from memory; larger ones spill to a unique temp file
+RESUME_SPOOL_THRESHOLD = int(os.getenv("RESUME_SPOOL_THRESHOLD", str(8 * 1024 * 1024)))
+# Reading caps per resume (0 = unlimited)
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "50")) or None
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "200000")) or None
+# Parsed-resume cache on local disk, keyed on the upload's SHA-256 (empty dir disables)
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", os.path.join(BASE_DIR, "resume_cache"))
+RESUME_CACHE_MAX_MB = float(os.getenv("RESUME_CACHE_MAX_MB", "256"))
+# Bulk ingestion jobs (/admin/bulk_ingest): one directory per job, parser processes per job
+BULK_INGEST_DIR = os.getenv("BULK_INGEST_DIR", os.path.join(BASE_DIR, "bulk_ingest"))
+BULK_INGEST_WORKERS = int(os.getenv("BULK_INGEST_WORKERS", "2"))
+# Per-day skill demand counters (/admin/postings) behind /forecast/skills
+SKILL_DEMAND_DIR = os.getenv("SKILL_DEMAND_DIR", os.path.join(BASE_DIR, "skill_demand"))
+# Seconds between dataset.csv change checks (0 disables the watcher)
+DATASET_WATCH_INTERVAL = float(os.getenv("DATASET_WATCH_INTERVAL", "10"))
+# Shared secret for /admin endpoints (admin endpoints are disabled when unset)
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+# Request size limits (larger requests are rejected with 422)
+MAX_TOP_K = int(os.getenv("MAX_TOP_K", "50"))
+MATCH_BATCH_MAX_SIZE = int(os.getenv("MATCH_BATCH_MAX_SIZE", "10000"))
+COHORT_MAX_CANDIDATES = int(os.getenv("COHORT_MAX_CANDIDATES", "20000"))
+
+from bulk_ingest import FORMATS, BulkIngestor
+from cache import DiskLRUCache
+from cohort import analyze_cohort
 from drift import DriftMonitor
+from forecast import PERIODS, SORT_KEYS, SkillDemandStore, forecast_skills
+from parse_pool import ParsePoolFull, ParseTimeout, ResumeParsePool
+from planner import plan_learning_path
+from reloader import ModelBundle, ModelRegistry
 
-matcher = JobMatcher(DATASET_PATH)
-extractor = ResumeExtractor(known_skills=matcher.get_all_skills())
-chatbot = CareerChatbot()
+def build_models(dataset_path, version):
+    """Builds everything derived from the dataset: matcher, extractor vocabulary, drift reference."""
+    matcher = JobMatcher(dataset_path, artifact_dir=MODEL_ARTIFACT_DIR or None)
+    extractor = ResumeExtractor(
+        known_skills=matcher.get_all_skills(), max_pages=RESUME_MAX_PAGES, max_chars=RESUME_MAX_CHARS
+    )
 
-# Initialize Drift Monitor using Job Vectors as Reference
-drift_monitor = None
-try:
-    if matcher.job_vectors is not None:
-        drift_monitor = DriftMonitor(matcher.job_vectors)
-    else:
-        print("Warning: Job Vectors empty, Drift Monitor skipped.")
-except Exception as e:
-    print(f"Drift Init Error: {e}")
+    # Initialize Drift Monitor using Job Vectors as Reference
+    drift_monitor = None
+    try:
+        if matcher.job_vectors is not None:
+            drift_monitor = DriftMonitor(
+                matcher.job_vectors, correction=DRIFT_CORRECTION,
+                window_size=DRIFT_WINDOW_SIZE, window_step=DRIFT_WINDOW_STEP,
+                window_seconds=DRIFT_WINDOW_SECONDS, min_window_size=DRIFT_WINDOW_MIN_SIZE
+            )
+        else:
+            print("Warning: Job Vectors empty, Drift Monitor skipped.")
+    except Exception as e:
+        print(f"Drift Init Error: {e}")
+
+    return ModelBundle(matcher, extractor, drift_monitor, version, time.time())
+
+# Requests read models.current once and keep that snapshot; reloads swap it atomically
+models = ModelRegistry(build_models, DATASET_PATH)
+# Local intents answer role/skill questions from the current dataset
+chatbot = CareerChatbot(matcher_provider=lambda: models.current.matcher)
+resume_parser = ResumeParsePool(RESUME_PARSE_WORKERS, RESUME_PARSE_MAX_QUEUE, RESUME_PARSE_TIMEOUT)
+resume_cache = DiskLRUCache("parsed_resumes", RESUME_CACHE_DIR, int(RESUME_CACHE_MAX_MB * 1024 * 1024)) if RESUME_CACHE_DIR else None
+demand_store = SkillDemandStore(SKILL_DEMAND_DIR)
+
+def observe_drift(bundle, skills_batch):
+    """Feeds live skill queries into the drift monitor's sliding window (never fails the request)."""
+    if bundle.drift_monitor is None or bundle.matcher.vectorizer is None:
+        return
+    try:
+        bundle.drift_monitor.observe(bundle.matcher.vectorize_skills(skills_batch))
+    except Exception as e:
+        print(f"Drift Observe Error: {e}")
+
+@app.on_event("startup")
+def start_dataset_watcher():
+    models.start_watching(DATASET_WATCH_INTERVAL)
+
+@app.on_event("shutdown")
+def stop_dataset_watcher():
+    models.stop_watching()
+    resume_parser.shutdown()
 
 class SkillRequest(BaseModel):
     skills: List[str]
+    top_k: conint(ge=1, le=MAX_TOP_K) = 5
+    # Only rank jobs sharing at least one skill with the request
+    require_skill_overlap: bool = False
+
+class BatchSkillRequest(BaseModel):
+    skills_batch: conlist(List[str], max_length=MATCH_BATCH_MAX_SIZE)
+    top_k: conint(ge=1, le=MAX_TOP_K) = 5
+    require_skill_overlap: bool = False
 
 class ChatRequest(BaseModel):
     message: str
     context: Optional[dict] = None
+    # Returned by /upload_resume and /chat; keeps the conversation server-side
+    session_id: Optional[str] = None
 
 class ReportRequest(BaseModel):
     skills: List[str]
@@ -72,55 +173,198 @@ class ReportRequest(BaseModel):
 def read_root():
     return {"message": "AI Career Mentor API is running"}
 
+def spill_upload(head, upload):
+    """Writes an oversized upload to a unique temp file; returns its path and SHA-256."""
+    digest = hashlib.sha256(head)
+    with tempfile.NamedTemporaryFile(prefix="resume-", suffix=".pdf", delete=False) as buffer:
+        buffer.write(head)
+        for chunk in iter(lambda: upload.read(1 << 20), b""):
+            digest.update(chunk)
+            buffer.write(chunk)
+        return buffer.name, digest.hexdigest()
+
+def hash_upload(data):
+    return hashlib.sha256(data).hexdigest()
+
+def resume_cache_key(content_hash, extractor):
+    # Same bytes give other results with another vocabulary or other reading caps
+    return f"{content_hash}-{extractor.vocabulary_version}-{extractor.max_pages}-{extractor.max_chars}"
+
+def cached_resume(cache_key):
+    """Parsed resume from the disk cache; a cache I/O error counts as a miss."""
+    if resume_cache is None:
+        return None
+    try:
+        return resume_cache.get(cache_key)
+    except Exception as e:
+        print(f"Resume Cache Read Error: {e}")
+        return None
+
+def cache_resume(cache_key, parsing_result):
+    """Stores a parsed resume; a cache I/O error (e.g. a full disk) only skips the write."""
+    if resume_cache is None:
+        return
+    try:
+        resume_cache.set(cache_key, parsing_result)
+    except Exception as e:
+        print(f"Resume Cache Write Error: {e}")
+
+def match_and_observe(bundle, skills):
+    matches = bundle.matcher.match_jobs(skills)
+    observe_drift(bundle, [skills])
+    return matches
+
 @app.post("/upload_resume")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(file: UploadFile = File(...), session_id: Optional[str] = Form(None)):
+    # Blocking work runs off the event loop: matching in the thread pool,
+    # PDF parsing in the resume parser processes
+    spill_path = None
     try:
-        # Save temp file
-        temp_filename = f"temp_{file.filename}"
-        with open(temp_filename, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Parse
-        parsing_result = extractor.parse_resume(temp_filename)
+        # Small uploads stay in memory; only large ones touch the disk
+        source = await file.read(RESUME_SPOOL_THRESHOLD + 1)
+        if len(source) > RESUME_SPOOL_THRESHOLD:
+            spill_path, content_hash = await run_in_threadpool(spill_upload, source, file.file)
+            source = spill_path
+        else:
+            content_hash = await run_in_threadpool(hash_upload, source)
+
+        # Parse (a re-uploaded resume comes from the cache, without PyMuPDF)
+        bundle = models.current
+        cache_key = resume_cache_key(content_hash, bundle.extractor)
+        parsing_result = await run_in_threadpool(cached_resume, cache_key)
+        if parsing_result is None:
+            parsing_result = await resume_parser.parse(source, bundle.extractor)
+            await run_in_threadpool(cache_resume, cache_key, parsing_result)
         extracted_skills = parsing_result["skills"]
-        
+
         # Match
-        matches = matcher.match_jobs(extracted_skills)
-        
-        # Cleanup
-        os.remove(temp_filename)
-        
+        matches = await run_in_threadpool(match_and_observe, bundle, extracted_skills)
+
+        # The chat session keeps a compact profile of this analysis for later prompts
+        session = chatbot.sessions.set_profile(session_id, extracted_skills, matches)
+
         return {
             "extracted_skills": extracted_skills,
             "matches": matches,
-            "resume_text_preview": parsing_result["text"]
+            "resume_text_preview": parsing_result["text"],
+            "session_id": session.session_id
         }
+    except ParsePoolFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ParseTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Cleanup
+        if spill_path and os.path.exists(spill_path):
+            os.remove(spill_path)
 
 @app.post("/match_jobs")
 def match_jobs_endpoint(request: SkillRequest):
-    matches = matcher.match_jobs(request.skills)
+    bundle = models.current
+    matches = bundle.matcher.match_jobs(request.skills, k=request.top_k, require_skill_overlap=request.require_skill_overlap)
+    observe_drift(bundle, [request.skills])
     return {"matches": matches}
 
+@app.post("/match_jobs_batch")
+def match_jobs_batch_endpoint(request: BatchSkillRequest):
+    # One entry per candidate, each shaped like the /match_jobs response
+    batch_matches = models.current.matcher.match_jobs_batch(
+        request.skills_batch, k=request.top_k, require_skill_overlap=request.require_skill_overlap
+    )
+    return {"results": [{"matches": matches} for matches in batch_matches]}
+
 @app.post("/chat")
-def chat_endpoint(request: ChatRequest):
-    response = chatbot.get_response(request.message, request.context)
-    return {"response": response}
+async def chat_endpoint(request: ChatRequest):
+    session = chatbot.sessions.get(request.session_id)
+    response = await chatbot.get_response_async(request.message, request.context, session=session)
+    return {"response": response, "session_id": session.session_id}
+
+@app.get("/chat/stats")
+def chat_stats_endpoint():
+    return chatbot.stats()
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    # Server-sent events: one 'data' event per chunk, then a 'done' event carrying the session id
+    session = chatbot.sessions.get(request.session_id)
+
+    async def events():
+        async for chunk in chatbot.stream_response(request.message, request.context, session=session):
+            yield f"data: {json.dumps({'text': chunk})}\n\n"
+        yield f"event: done\ndata: {json.dumps({'session_id': session.session_id})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Session-Id": session.session_id})
 
 @app.post("/generate_report")
 def generate_report_endpoint(request: ReportRequest):
-    # Pass matcher.df so we can look up dataset companies
-    report = generate_company_report(request.skills, request.matches, matcher.df)
+    # The matcher's precomputed role profiles, so reports don't scan the catalog
+    matcher = models.current.matcher
+    plan = plan_learning_path(matcher, request.skills, k=3, max_steps=3)
+    report = generate_company_report(
+        request.skills, request.matches, role_profiles=matcher.role_profiles, plan=plan
+    )
     return {"report": report}
 
+class PlanRequest(BaseModel):
+    skills: List[str]
+    top_k: conint(ge=1, le=MAX_TOP_K) = 5
+    max_steps: conint(ge=1, le=50) = 10
+    # Stop once every top-k job has this share of its required skills
+    target_coverage: confloat(gt=0, le=1) = 1.0
+
+@app.post("/plan")
+def plan_endpoint(request: PlanRequest):
+    # Ordered skills to learn for the user's top-k matches (greedy, demand weighted)
+    return plan_learning_path(
+        models.current.matcher, request.skills, k=request.top_k,
+        max_steps=request.max_steps, target_coverage=request.target_coverage
+    )
+
+@app.get("/roles")
+def list_roles_endpoint():
+    # Role names with their posting counts, most postings first
+    profiles = models.current.matcher.role_profiles.values()
+    roles = sorted(profiles, key=lambda p: (-p["postings"], p["role"]))
+    return {"roles": [{"role": p["role"], "postings": p["postings"]} for p in roles]}
+
+@app.get("/roles/{role}")
+def role_profile_endpoint(role: str):
+    profile = models.current.matcher.role_profile(role)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown role: {role}")
+    return profile
+
+class CohortRequest(BaseModel):
+    skills_batch: conlist(List[str], max_length=COHORT_MAX_CANDIDATES)
+    # Roles to assess (default: every role), or one target role per candidate
+    roles: Optional[List[str]] = None
+    targets: Optional[List[str]] = None
+    # A role requires the skills listed by at least this share of its postings
+    min_share: confloat(ge=0, le=1) = 0.5
+    top_n: conint(ge=1, le=1000) = 10
+    per_candidate: bool = False
+
+@app.post("/cohort/analyze")
+def cohort_analyze_endpoint(request: CohortRequest):
+    # Coverage and top missing skills of a whole cohort, per role and overall
+    try:
+        return analyze_cohort(
+            models.current.matcher, request.skills_batch, roles=request.roles, targets=request.targets,
+            min_share=request.min_share, top_n=request.top_n, per_candidate=request.per_candidate
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 class ExplainRequest(BaseModel):
     skills: List[str]
     job_role: str
 
 @app.post("/explain_match")
 def explain_match_endpoint(request: ExplainRequest):
-    explanation = matcher.explain_match(request.skills, request.job_role)
+    explanation = models.current.matcher.explain_match(request.skills, request.job_role)
     if "error" in explanation:
         raise HTTPException(status_code=404, detail=explanation["error"])
     return explanation
@@ -130,22 +374,177 @@ class DriftRequest(BaseModel):
 
 @app.post("/debug_drift")
 def debug_drift_endpoint(request: DriftRequest):
+    bundle = models.current
+    matcher, drift_monitor = bundle.matcher, bundle.drift_monitor
     if not drift_monitor:
          raise HTTPException(status_code=503, detail="Drift Monitor not initialized")
          
-    # Convert batch of skills -> Strings -> Vectors
-    batch_strings = [" ".join(skills).lower() for skills in request.skills_batch]
-    
     # Use existing vectorizer
     if not matcher.vectorizer:
         raise HTTPException(status_code=500, detail="Vectorizer not found")
-        
-    new_vectors = matcher.vectorizer.transform(batch_strings)
+
+    # Same vectors live traffic feeds the monitor (normalized skill sets)
+    new_vectors = matcher.vectorize_skills(request.skills_batch)
     
     # Check
     report = drift_monitor.check_drift(new_vectors)
     return report
 
+@app.get("/drift/status")
+def drift_status_endpoint():
+    # Latest sliding-window result over live traffic (same numbers as the drift_* gauges)
+    drift_monitor = models.current.drift_monitor
+    if not drift_monitor:
+        raise HTTPException(status_code=503, detail="Drift Monitor not initialized")
+    return drift_monitor.window_status()
+
+@app.get("/forecast/skills")
+def forecast_skills_endpoint(
+    horizon: int = Query(4, ge=1, le=52),
+    period: str = "W",
+    top: int = Query(20, ge=1, le=500),
+    sort: str = "demand",
+    skills: Optional[List[str]] = Query(None)
+):
+    """
+    Forecast postings per period for the most demanded (or fastest growing)
+    skills, or for the given skills (?skills=python&skills=sql).
+    """
+    if period not in PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of {tuple(PERIODS)}")
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {SORT_KEYS}")
+    return forecast_skills(demand_store, horizon=horizon, period=period, top=top, skills=skills, sort=sort)
+
+def verify_admin_key(x_admin_key: Optional[str]):
+    if not ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin endpoints disabled (ADMIN_API_KEY not set)")
+    if x_admin_key != ADMIN_API_KEY:
+        raise HTTPException(status_code=401, detail="Invalid admin key")
+
+@app.post("/admin/reload_dataset")
+def reload_dataset_endpoint(x_admin_key: Optional[str] = Header(None)):
+    verify_admin_key(x_admin_key)
+    started = models.reload()
+    return {"status": "started" if started else "already_running", "current_version": models.current.version}
+
+@app.get("/admin/reload_status")
+def reload_status_endpoint(x_admin_key: Optional[str] = Header(None)):
+    verify_admin_key(x_admin_key)
+    return {
+        "dataset_path": models.watched_path,
+        "current_version": models.current.version,
+        "rows": len(models.current.matcher.df),
+        "last_reload": models.last_reload
+    }
+
+# --- Skill demand ingestion ---
+@app.post("/admin/postings")
+async def ingest_postings_endpoint(
+    file: UploadFile = File(...),
+    date: Optional[str] = Form(None),
+    x_admin_key: Optional[str] = Header(None)
+):
+    """
+    Adds a CSV of postings (required_skills, optional posted_at) to the skill
+    demand counters. Postings without posted_at are stamped with date
+    (YYYY-MM-DD, default today). Only the days concerned are rewritten.
+    """
+    verify_admin_key(x_admin_key)
+    try:
+        postings = await run_in_threadpool(pd.read_csv, file.file)
+        if date is not None:
+            date = datetime.date.fromisoformat(date)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid postings upload: {e}")
+    if 'required_skills' not in postings.columns:
+        raise HTTPException(status_code=400, detail="CSV needs a required_skills column")
+    added = await run_in_threadpool(demand_store.ingest, postings, date)
+    return {"added": added, "store": demand_store.stats()}
+
+# --- Bulk ingestion (zip upload or server-side directory/zip) ---
+bulk_jobs = {}
+
+def run_bulk_job(job_id, job):
+    bundle = models.current
+    ingestor = BulkIngestor(bundle.matcher, bundle.extractor, workers=BULK_INGEST_WORKERS)
+    try:
+        stats = ingestor.run(
+            job["input_path"], job["output_path"], job["format"],
+            on_progress=lambda s: bulk_jobs[job_id].update(s)
+        )
+        bulk_jobs[job_id].update(stats, status="finished")
+    except Exception as e:
+        print(f"Bulk Ingest Error: {e}")
+        bulk_jobs[job_id].update(status="error", error=str(e))
+
+def save_bulk_upload(upload, path):
+    with open(path, "wb") as buffer:
+        shutil.copyfileobj(upload, buffer)
+
+@app.post("/admin/bulk_ingest")
+async def bulk_ingest_endpoint(
+    file: Optional[UploadFile] = File(None),
+    input_path: Optional[str] = Form(None),
+    output_format: str = Form("jsonl"),
+    job_id: Optional[str] = Form(None),
+    x_admin_key: Optional[str] = Header(None)
+):
+    """
+    Starts a background ingestion job for an uploaded zip of PDFs or a
+    server-side directory/zip (input_path). Passing the job_id of an earlier
+    job resumes it: files already written are skipped.
+    """
+    verify_admin_key(x_admin_key)
+    if job_id:
+        job_dir = os.path.join(BULK_INGEST_DIR, os.path.basename(job_id))
+        if not os.path.exists(os.path.join(job_dir, "job.json")):
+            raise HTTPException(status_code=404, detail="Unknown bulk ingest job")
+        if bulk_jobs.get(job_id, {}).get("status") == "running":
+            raise HTTPException(status_code=409, detail="Job is already running")
+        with open(os.path.join(job_dir, "job.json")) as f:
+            job = json.load(f)
+    else:
+        if output_format not in FORMATS:
+            raise HTTPException(status_code=400, detail=f"output_format must be one of {FORMATS}")
+        if (file is None) == (input_path is None):
+            raise HTTPException(status_code=400, detail="Send either a zip file or an input_path")
+        if input_path is not None and not os.path.exists(input_path):
+            raise HTTPException(status_code=400, detail="input_path does not exist")
+
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = os.path.join(BULK_INGEST_DIR, job_id)
+        os.makedirs(job_dir)
+        if file is not None:
+            input_path = os.path.join(job_dir, "input.zip")
+            await run_in_threadpool(save_bulk_upload, file.file, input_path)
+        job = {
+            "input_path": input_path,
+            "output_path": os.path.join(job_dir, "results.jsonl" if output_format == "jsonl" else "results"),
+            "format": output_format
+        }
+        with open(os.path.join(job_dir, "job.json"), "w") as f:
+            json.dump(job, f)
+
+    bulk_jobs[job_id] = {"job_id": job_id, "status": "running", **job}
+    threading.Thread(target=run_bulk_job, args=(job_id, job), name=f"bulk-ingest-{job_id}", daemon=True).start()
+    return bulk_jobs[job_id]
+
+@app.get("/admin/bulk_ingest/{job_id}")
+def bulk_ingest_status_endpoint(job_id: str, x_admin_key: Optional[str] = Header(None)):
+    verify_admin_key(x_admin_key)
+    if job_id not in bulk_jobs:
+        raise HTTPException(status_code=404, detail="Unknown bulk ingest job")
+    return bulk_jobs[job_id]
+
+@app.get("/admin/bulk_ingest/{job_id}/results")
+def bulk_ingest_results_endpoint(job_id: str, x_admin_key: Optional[str] = Header(None)):
+    verify_admin_key(x_admin_key)
+    job = bulk_jobs.get(job_id)
+    if job is None or job["format"] != "jsonl" or not os.path.exists(job["output_path"]):
+        raise HTTPException(status_code=404, detail="No JSONL results for this job")
+    return FileResponse(job["output_path"], media_type="application/x-ndjson", filename=f"{job_id}.jsonl")
+
 if __name__ == "__main__":
     import uvicorn
     print("Starting process...")
@@ -8,149 +8,474 @@ import mlflow
 import mlflow.sklearn
 import shap
 
+from scipy.sparse import csr_matrix
+
+from artifacts import dataset_hash, load_artifacts, save_artifacts
+from cache import TTLCache
+from role_profiles import build_role_profiles, role_key
+from telemetry import match_telemetry
+
+# Candidate x job similarity cells per match_jobs_batch chunk: at most ~60 MB
+# (float64 value + int32 index per stored cell) even when the block is dense
+MATCH_BATCH_CHUNK_CELLS = 5_000_000
+
+
+def normalize_skills(skills):
+    """Lower-cased, stripped, de-duplicated and sorted skills (the match cache key)."""
+    return tuple(sorted({s.lower().strip() for s in skills} - {""}))
+
+
+def top_k_indices(scores, k):
+    """
+    Returns the row positions of the k highest scores, best first.
+    Equal scores keep dataset order (same as a stable sort over all jobs),
+    but only the k survivors of an O(n) partition are actually sorted.
+    """
+    n = len(scores)
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.array([], dtype=np.intp)
+
+    if k < n:
+        kth_score = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth_score)
+        # Ties at the cut-off are resolved by position, like the stable sort did
+        tied = np.flatnonzero(scores == kth_score)[:k - len(above)]
+        candidates = np.concatenate([above, tied])
+    else:
+        candidates = np.arange(n)
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+def top_k_sparse_row(row_scores, row_indices, n, k):
+    """
+    top_k_indices for a row stored sparsely (row_indices sorted, every job not
+    listed scores 0). Zero-score jobs are only needed to pad results when fewer
+    than k jobs score above zero, and then come in dataset order.
+    """
+    k = max(0, min(k, n))
+    positive = row_scores > 0
+    pos_indices = row_indices[positive]
+    top = pos_indices[top_k_indices(row_scores[positive], k)]
+    if len(top) == k:
+        return top
+
+    # Pad with the first zero-score jobs (never stored, or rounded down to 0.0)
+    needed = k - len(top)
+    is_positive = np.zeros(min(n, len(pos_indices) + needed), dtype=bool)
+    head = pos_indices[pos_indices < len(is_positive)]
+    is_positive[head] = True
+    zeros = np.flatnonzero(~is_positive)[:needed]
+    return np.concatenate([top, zeros])
 
 
 class JobMatcher:
-    def __init__(self, dataset_path="c:/Users/vinit/OneDrive/Desktop/career_match12/dataset.csv"):
+    def __init__(self, dataset_path="c:/Users/vinit/OneDrive/Desktop/career_match12/dataset.csv",
+                 cache_size=4096, cache_ttl=600.0, artifact_dir=None):
+        """
+        artifact_dir: optional root of prebuilt artifacts (see artifacts.py).
+        If it holds a version built from the current dataset contents, the
+        fitted model is memory-mapped from there instead of refitting; otherwise
+        the model is fitted from the CSV and written there for the next start.
+        """
         self.dataset_path = dataset_path
+        self.artifact_dir = artifact_dir
+        # Results depend on the dataset and the fitted vectorizer, so the cache
+        # lives and dies with this instance (a rebuilt matcher starts empty)
+        self.match_cache = TTLCache("match_jobs", max_size=cache_size, ttl=cache_ttl)
         if not os.path.exists(self.dataset_path):
             # Fallback for relative path if absolute fails or for flexibility
             self.dataset_path = os.path.join(os.path.dirname(__file__), "dataset.csv")
         
         try:
-            self.df = pd.read_csv(self.dataset_path)
-            # Ensure required_skills is string and normalize
-            self.df['required_skills'] = self.df['required_skills'].astype(str).str.lower()
-            
-            # Prepare TF-IDF Vectorizer
-            # We treat the 'required_skills' column as our document corpus
-            self.vectorizer = TfidfVectorizer(stop_words='english')
-            self.job_vectors = self.vectorizer.fit_transform(self.df['required_skills'])
-            
-            # --- MLflow Initialization ---
-            try:
-                import json
-                mlflow.set_experiment("CareerMatch_JobMatcher")
-                with mlflow.start_run(run_name="Model_Initialization", nested=True):
-                    mlflow.log_param("dataset_path", self.dataset_path)
-                    mlflow.log_param("dataset_rows", len(self.df))
-                    mlflow.log_param("vocabulary_size", len(self.vectorizer.get_feature_names_out()))
-                    
-                    # Log Artifact: Dataset Info
-                    dataset_info = {
-                        "columns": list(self.df.columns),
-                        "shape": self.df.shape,
-                        "sample_skills": self.vectorizer.get_feature_names_out()[:10].tolist()
-                    }
-                    info_file = "dataset_info.json"
-                    with open(info_file, "w") as f:
-                        json.dump(dataset_info, f, indent=2)
-                    mlflow.log_artifact(info_file)
-                    if os.path.exists(info_file):
-                        os.remove(info_file)
-            except Exception as e:
-                print(f"MLflow Init Error: {e}")
+            artifact = None
+            if artifact_dir:
+                content_hash = dataset_hash(self.dataset_path)
+                artifact = load_artifacts(artifact_dir, self.dataset_path, content_hash)
+
+            if artifact is not None:
+                self._load_artifact(artifact)
+            else:
+                self._fit_dataset()
+                if artifact_dir:
+                    try:
+                        save_artifacts(self, artifact_dir, content_hash)
+                    except Exception as e:
+                        print(f"Artifact Save Error: {e}")
             
         except Exception as e:
             print(f"Error loading dataset: {e}")
             self.df = pd.DataFrame()
             self.vectorizer = None
+            self._build_skill_index()
+            self._build_job_details()
+
+    def _fit_dataset(self):
+        self.df = pd.read_csv(self.dataset_path)
+        # Ensure required_skills is string and normalize
+        self.df['required_skills'] = self.df['required_skills'].astype(str).str.lower()
+        
+        # Prepare TF-IDF Vectorizer
+        # We treat the 'required_skills' column as our document corpus
+        self.vectorizer = TfidfVectorizer(stop_words='english')
+        self.job_vectors = self.vectorizer.fit_transform(self.df['required_skills'])
+
+        # Integer-coded skill vocabulary, per-job skill ids and skill -> jobs index
+        self._build_skill_index()
+        self._build_job_details()
+        
+        # --- MLflow Initialization ---
+        try:
+            import json
+            mlflow.set_experiment("CareerMatch_JobMatcher")
+            with mlflow.start_run(run_name="Model_Initialization", nested=True):
+                mlflow.log_param("dataset_path", self.dataset_path)
+                mlflow.log_param("dataset_rows", len(self.df))
+                mlflow.log_param("vocabulary_size", len(self.vectorizer.get_feature_names_out()))
+                
+                # Log Artifact: Dataset Info
+                dataset_info = {
+                    "columns": list(self.df.columns),
+                    "shape": self.df.shape,
+                    "sample_skills": self.vectorizer.get_feature_names_out()[:10].tolist()
+                }
+                info_file = "dataset_info.json"
+                with open(info_file, "w") as f:
+                    json.dump(dataset_info, f, indent=2)
+                mlflow.log_artifact(info_file)
+                if os.path.exists(info_file):
+                    os.remove(info_file)
+        except Exception as e:
+            print(f"MLflow Init Error: {e}")
+
+    def _load_artifact(self, artifact):
+        """
+        Restores the fitted state from load_artifacts() output without refitting.
+        The large arrays stay memory-mapped (read-only, shared between workers).
+        """
+        self.df = artifact["jobs"]
+
+        self.vectorizer = TfidfVectorizer(stop_words='english')
+        self.vectorizer.vocabulary_ = {term: i for i, term in enumerate(artifact["vocabulary"])}
+        self.vectorizer.idf_ = artifact["idf"]
+
+        self.job_vectors = csr_matrix(
+            (artifact["job_vectors_data"], artifact["job_vectors_indices"], artifact["job_vectors_indptr"]),
+            shape=tuple(artifact["manifest"]["job_vectors_shape"]),
+            copy=False
+        )
+
+        self.skill_vocab = artifact["skill_vocab"]
+        self.skill_ids = {skill: i for i, skill in enumerate(self.skill_vocab)}
+        self.job_skill_ids = artifact["job_skill_ids"]
+        self.job_skill_indptr = artifact["job_skill_indptr"]
+        self.skill_job_ids = artifact["skill_job_ids"]
+        self.skill_job_indptr = artifact["skill_job_indptr"]
+        self._build_job_details(artifact.get("role_profiles"))
+
+    def _build_skill_index(self):
+        """
+        Splits 'required_skills' once at load time and integer-codes it:
+        - skill_vocab / skill_ids: id -> skill and skill -> id
+        - job_skill_indptr / job_skill_ids: CSR layout of each job's skill ids
+          (in listed order, duplicates kept so 'required_skills' round-trips)
+        - skill_job_indptr / skill_job_ids: inverted index, skill id -> job rows
+        """
+        if self.df.empty:
+            skills_per_job = []
+        else:
+            skills_per_job = [[s.strip() for s in skills_str.split(',')] for skills_str in self.df['required_skills']]
+
+        counts = np.array([len(skills) for skills in skills_per_job], dtype=np.int64)
+        flat_skills = [s for skills in skills_per_job for s in skills]
+        codes, uniques = pd.factorize(pd.Series(flat_skills, dtype=object))
+
+        self.skill_vocab = list(uniques)
+        self.skill_ids = {skill: i for i, skill in enumerate(self.skill_vocab)}
+        self.job_skill_ids = codes.astype(np.int32)
+        self.job_skill_indptr = np.concatenate([[0], np.cumsum(counts)])
+
+        # Inverted index: unique (skill, job) pairs grouped by skill, jobs ascending
+        job_of_entry = np.repeat(np.arange(len(counts)), counts)
+        pairs = np.unique(np.stack([self.job_skill_ids.astype(np.int64), job_of_entry]), axis=1)
+        self.skill_job_ids = pairs[1].astype(np.int32)
+        skill_counts = np.bincount(pairs[0], minlength=len(self.skill_vocab))
+        self.skill_job_indptr = np.concatenate([[0], np.cumsum(skill_counts)])
+
+    def _build_job_details(self, role_profiles=None):
+        """
+        Caches the display columns as plain Python lists, so building a match
+        dict is a few list lookups instead of a pandas row access.
+        role_profiles: profiles stored with the artifacts (built here if None).
+        """
+        detail_columns = ['job_role', 'min_experience', 'avg_salary', 'domain', 'company']
+        self.job_details = {col: self.df[col].tolist() for col in detail_columns if col in self.df.columns}
+
+        # Lower-cased role name -> job rows with that role
+        self.role_rows = {}
+        for idx, role in enumerate(self.job_details.get('job_role', [])):
+            self.role_rows.setdefault(str(role).lower().strip(), []).append(idx)
+
+        # Per-role salary, experience, skill and company aggregates (see role_profiles.py)
+        if role_profiles is None:
+            role_profiles = build_role_profiles(self.df, self.skill_vocab, self.job_skill_ids, self.job_skill_indptr)
+        self.role_profiles = role_profiles
+
+    def _job_detail(self, column, idx, default='N/A'):
+        values = self.job_details.get(column)
+        return values[idx] if values is not None else default
+
+    def encode_skills(self, skills):
+        """
+        Maps skill names to vocabulary ids (lower-cased, stripped).
+        Skills that no posting requires are dropped.
+        """
+        ids = set()
+        for s in skills:
+            skill_id = self.skill_ids.get(s.lower().strip())
+            if skill_id is not None:
+                ids.add(skill_id)
+        return ids
+
+    def job_skills(self, job_idx):
+        """Returns the skill ids of one job row, in listed order (with duplicates)."""
+        return self.job_skill_ids[self.job_skill_indptr[job_idx]:self.job_skill_indptr[job_idx + 1]]
+
+    def candidate_jobs(self, skill_ids):
+        """
+        Returns the sorted job rows sharing at least one skill id with skill_ids,
+        using the inverted index instead of scanning every posting.
+        """
+        postings = [self.skill_job_ids[self.skill_job_indptr[i]:self.skill_job_indptr[i + 1]] for i in skill_ids]
+        if not postings:
+            return np.array([], dtype=np.int32)
+        return np.unique(np.concatenate(postings))
+
+    def vectorize_skills(self, skills_batch):
+        """
+        TF-IDF vectors (sparse, one row per skill list) exactly as match_jobs
+        sees them: normalized skill set joined into one string.
+        """
+        return self.vectorizer.transform([" ".join(normalize_skills(skills)) for skills in skills_batch])
 
-    def match_jobs(self, user_skills):
+    def match_jobs(self, user_skills, k=5, require_skill_overlap=False):
         """
         Matches user skills against the dataset using Cosine Similarity.
         user_skills: list of strings (e.g. ['python', 'sql'])
+        k: number of top matches to return.
+        require_skill_overlap: only rank jobs sharing at least one listed skill.
         Returns: list of dicts with job details and match score.
         """
         if self.df.empty or self.vectorizer is None:
             return []
 
-        # Convert user skills list to a single string for vectorization
-        user_skills_str = " ".join([s.lower() for s in user_skills])
+        # Same skill set (any order/case/duplicates) -> same cached result
+        skills_key = normalize_skills(user_skills)
+        cache_key = (skills_key, k, require_skill_overlap)
+        cached = self.match_cache.get(cache_key)
+        if cached is not None:
+            self._record_match_event(user_skills, k, len(self.df), cached, cache_hit=True)
+            return self._copy_matches(cached)
+
+        top_indices, top_scores = self.top_jobs(user_skills, k, require_skill_overlap)
+
+        # Normalize user skills to vocabulary ids for matched/missing skills (still useful context)
+        user_skill_ids = self.encode_skills(user_skills)
+
+        # Only the k best jobs get the (comparatively expensive) per-job details
+        scores = dict(zip(top_indices.tolist(), top_scores.tolist()))
+        top_matches = self._build_matches(top_indices, scores, user_skill_ids)
+
+        self.match_cache.set(cache_key, top_matches)
+
+        # --- MLflow Logging (queued, written in the background) ---
+        self._record_match_event(user_skills, k, len(self.df), top_matches)
+
+        return self._copy_matches(top_matches)  # Return top k matches
+
+    def top_jobs(self, user_skills, k=5, require_skill_overlap=False):
+        """
+        Ranks the jobs for a skill list without building match dicts.
+        require_skill_overlap: only the jobs sharing a skill with the user
+            (from the inverted index) are scored at all.
+        Returns (row positions of the k best jobs, best first; their match
+        scores, as percentages rounded as displayed).
+        """
+        if self.df.empty or self.vectorizer is None:
+            return np.array([], dtype=np.intp), np.zeros(0)
+
+        if require_skill_overlap:
+            candidates = self.candidate_jobs(self.encode_skills(user_skills))
+            if len(candidates) == 0:
+                return np.array([], dtype=np.intp), np.zeros(0)
+            job_vectors = self.job_vectors[candidates]
+        else:
+            candidates = None
+            job_vectors = self.job_vectors
+
+        # Convert user skills to a single string for vectorization
+        user_skills_str = " ".join(normalize_skills(user_skills))
         
         # Vectorize user skills
         user_vector = self.vectorizer.transform([user_skills_str])
         
         # Calculate Cosine Similarity
-        # similaries is an array of shape (1, num_jobs)
-        similarities = cosine_similarity(user_vector, self.job_vectors).flatten()
-        
+        # similaries is an array of shape (1, num_scored_jobs)
+        similarities = cosine_similarity(user_vector, job_vectors).flatten()
+
+        # Convert similarity (0-1) to percentage (0-100), rounded as displayed
+        scores = np.round(similarities * 100, 2)
+
+        top = top_k_indices(scores, k)
+        return (top if candidates is None else candidates[top]), scores[top]
+
+    def match_jobs_batch(self, skills_batch, k=5, chunk_size=None, require_skill_overlap=False):
+        """
+        Matches many candidates at once: one vectorizer pass and one sparse x sparse
+        product per chunk of candidates instead of one request per candidate.
+        skills_batch: list of skill lists (e.g. [['python', 'sql'], ['java']])
+        chunk_size: candidates per chunk; default: as many as keep a chunk's
+            similarities within MATCH_BATCH_CHUNK_CELLS for this catalog.
+        require_skill_overlap: same as match_jobs (only jobs sharing a skill).
+        Returns: list (one entry per candidate) of match lists, same as match_jobs.
+        """
+        if self.df.empty or self.vectorizer is None:
+            return [[] for _ in skills_batch]
+
+        n_jobs = self.job_vectors.shape[0]
+        if chunk_size is None:
+            chunk_size = max(1, MATCH_BATCH_CHUNK_CELLS // max(n_jobs, 1))
+        all_matches = []
+
+        for start in range(0, len(skills_batch), chunk_size):
+            chunk = skills_batch[start:start + chunk_size]
+            user_vectors = self.vectorize_skills(chunk)
+
+            # Sparse (candidates x jobs) similarities, never densified
+            similarities = cosine_similarity(user_vectors, self.job_vectors, dense_output=False).tocsr()
+            similarities.sort_indices()
+
+            for row, user_skills in enumerate(chunk):
+                row_slice = slice(similarities.indptr[row], similarities.indptr[row + 1])
+                row_indices = similarities.indices[row_slice]
+                row_scores = np.round(similarities.data[row_slice] * 100, 2)
+                user_skill_ids = self.encode_skills(user_skills)
+
+                if require_skill_overlap:
+                    # Rank the candidate jobs only (their scores looked up in the sparse row)
+                    candidates = self.candidate_jobs(user_skill_ids)
+                    candidate_scores = self._stored_scores(row_scores, row_indices, candidates)
+                    top = top_k_indices(candidate_scores, k)
+                    top_indices, top_scores = candidates[top], candidate_scores[top]
+                else:
+                    top_indices = top_k_sparse_row(row_scores, row_indices, n_jobs, k)
+                    # Scores of the survivors (padding jobs were never stored, i.e. 0.0)
+                    top_scores = self._stored_scores(row_scores, row_indices, top_indices)
+
+                scores = dict(zip(top_indices.tolist(), top_scores))
+                all_matches.append(self._build_matches(top_indices, scores, user_skill_ids))
+
+        # --- MLflow Logging (queued, written in the background) ---
+        # One summary event per batch, so bulk runs don't flood the queue
+        top_scores = [float(m[0]['match_score']) for m in all_matches if m]
+        event = {
+            "type": "batch_match",
+            "num_candidates": len(skills_batch),
+            "num_skills_provided": sum(len(skills) for skills in skills_batch) / max(len(skills_batch), 1),
+            "top_k": k,
+            "match_count": n_jobs,
+        }
+        if top_scores:
+            event["top_match_score"] = sum(top_scores) / len(top_scores)
+        match_telemetry.record(event)
+
+        return all_matches
+
+    @staticmethod
+    def _copy_matches(matches):
+        # Callers get their own dicts and skill lists; the cached entries are never handed out
+        return [{key: list(value) if isinstance(value, list) else value for key, value in match.items()}
+                for match in matches]
+
+    @staticmethod
+    def _stored_scores(row_scores, row_indices, job_indices):
+        # Scores of job_indices in a sparse row (row_indices sorted); jobs not stored score 0.0
+        positions = np.searchsorted(row_indices, job_indices)
+        stored = positions < len(row_indices)
+        stored[stored] = row_indices[positions[stored]] == job_indices[stored]
+        scores = np.zeros(len(job_indices))
+        scores[stored] = row_scores[positions[stored]]
+        return scores
+
+    def _record_match_event(self, user_skills, k, match_count, top_matches, cache_hit=False):
+        event = {
+            "type": "match",
+            "cache_hit": cache_hit,
+            "user_skills_raw": str(user_skills),
+            "num_skills_provided": len(user_skills),
+            "top_k": k,
+            "match_count": match_count,
+            "top_matches": [
+                {"job_role": m['job_role'], "company": m['company'], "match_score": float(m['match_score'])}
+                for m in top_matches
+            ],
+        }
+        if top_matches:
+            event["top_match_score"] = float(top_matches[0]['match_score'])
+            event["avg_top_score"] = float(sum(m['match_score'] for m in top_matches) / len(top_matches))
+        match_telemetry.record(event)
+
+    def _build_matches(self, job_indices, scores, user_skill_ids):
+        """
+        Builds the match dicts (score, matched/missing skills, job details)
+        for the given job row positions, in the given order.
+        scores: match scores indexed by job row (array or dict).
+        """
         results = []
-        
-        # Normalize user skills set for missing skills calculation (still useful context)
-        user_skills_set = set([s.lower().strip() for s in user_skills])
 
-        for index, row in self.df.iterrows():
-            sim_score = similarities[index]
-            
-            # Convert similarity (0-1) to percentage (0-100)
-            score = sim_score * 100
+        for idx in job_indices.tolist():
+            # Set logic on skill ids for 'Missing Skills' display (Vector doesn't tell us exactly WHAT is missing easily)
+            job_skill_ids = self.job_skills(idx).tolist()
+            unique_ids = dict.fromkeys(job_skill_ids)
             
-            # Jaccard/Set logic for 'Missing Skills' display (Vector doesn't tell us exactly WHAT is missing easily)
-            job_skills_raw = row['required_skills']
-            job_skills_list = [s.strip() for s in job_skills_raw.split(',')]
-            job_skills_set = set(job_skills_list)
-            
-            matched = user_skills_set.intersection(job_skills_set)
-            missing = job_skills_set - user_skills_set
+            matched = [self.skill_vocab[i] for i in unique_ids if i in user_skill_ids]
+            missing = [self.skill_vocab[i] for i in unique_ids if i not in user_skill_ids]
             
             results.append({
-                "job_role": row['job_role'],
-                "match_score": round(score, 2),
-                "matched_skills": list(matched),
-                "missing_skills": list(missing),
-                "required_skills": job_skills_list,
-                "min_experience": row.get('min_experience', 'N/A'),
-                "avg_salary": row.get('avg_salary', 'N/A'),
-                "domain": row.get('domain', 'N/A'),
-                "company": row.get('company', 'Confidential')
+                "job_role": self._job_detail('job_role', idx),
+                "match_score": scores[idx],
+                "matched_skills": matched,
+                "missing_skills": missing,
+                "required_skills": [self.skill_vocab[i] for i in job_skill_ids],
+                "min_experience": self._job_detail('min_experience', idx),
+                "avg_salary": self._job_detail('avg_salary', idx),
+                "domain": self._job_detail('domain', idx),
+                "company": self._job_detail('company', idx, 'Confidential')
             })
-            
-        # Sort by score descending
-        results.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        top_matches = results[:5]
-
-        # --- MLflow Logging ---
-        try:
-            with mlflow.start_run(run_name="Match_Request", nested=True):
-                mlflow.log_param("user_skills_raw", str(user_skills))
-                mlflow.log_param("num_skills_provided", len(user_skills))
-                mlflow.log_metric("match_count", len(results))
-                if top_matches:
-                    mlflow.log_metric("top_match_score", top_matches[0]['match_score'])
-                    avg_score = sum(m['match_score'] for m in top_matches) / len(top_matches)
-                    mlflow.log_metric("avg_top5_score", avg_score)
-                    
-                    # Log Artifact: Match Results
-                    import json
-                    results_file = "match_results.json"
-                    with open(results_file, "w") as f:
-                        json.dump(top_matches, f, indent=2)
-                    mlflow.log_artifact(results_file)
-                    if os.path.exists(results_file):
-                        os.remove(results_file)
-
-        except Exception as e:
-            print(f"MLflow Logging Error: {e}")
 
-        return top_matches  # Return top 5 matches
+        return results
 
+    def role_profile(self, role):
+        """Precomputed profile of a role (case-insensitive), or None for an unknown role."""
+        return self.role_profiles.get(role_key(role))
 
+    def role_skills(self, role):
+        """
+        Skills required by the postings of a role (case-insensitive), most
+        frequent first (ties in listed order), with the share of postings
+        requiring each. Returns [] for an unknown role.
+        """
+        profile = self.role_profile(role)
+        return [(entry["skill"], entry["share"]) for entry in profile["skills"]] if profile else []
 
     def get_all_skills(self):
         """
         Returns a set of all unique skills in the dataset.
         Useful for extraction vocabulary.
         """
-        if self.df.empty:
-            return set()
-        
-        all_skills = set()
-        for skills_str in self.df['required_skills']:
-            for s in skills_str.split(','):
-                all_skills.add(s.strip())
-        return all_skills
+        return set(self.skill_vocab)
 
     def explain_match(self, user_skills, job_role):
         """
@@ -169,9 +494,8 @@ class JobMatcher:
         # Get density matrix row
         job_vec = self.job_vectors[job_idx].toarray().flatten()
 
-        # Vectorize user skills
-        user_skills_str = " ".join([s.lower() for s in user_skills])
-        user_vec = self.vectorizer.transform([user_skills_str]).toarray().flatten()
+        # Vectorize user skills (same normalized query as match_jobs)
+        user_vec = self.vectorize_skills([user_skills]).toarray().flatten()
 
         # Calculate Element-wise contribution (Linear SHAP for Cosine/Dot Product)
         # Contribution = User_TFIDF * Job_TFIDF
@@ -0,0 +1,209 @@
+# Custom Prometheus metrics.
+# They live in the default prometheus_client registry, so the Instrumentator's
+# /metrics endpoint in main.py exposes them next to the HTTP metrics.
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# --- Match telemetry (MLflow background queue) ---
+MATCH_TELEMETRY_QUEUED = Gauge(
+    "match_telemetry_queue_size",
+    "Match events waiting to be flushed to MLflow"
+)
+MATCH_TELEMETRY_FLUSHED = Counter(
+    "match_telemetry_flushed_events_total",
+    "Match events written to MLflow"
+)
+MATCH_TELEMETRY_DROPPED = Counter(
+    "match_telemetry_dropped_events_total",
+    "Match events dropped because the telemetry queue was full"
+)
+
+# --- In-process result caches (label: cache name) ---
+CACHE_HITS = Counter(
+    "app_cache_hits_total",
+    "Lookups answered from an in-process cache",
+    ["cache"]
+)
+CACHE_MISSES = Counter(
+    "app_cache_misses_total",
+    "Lookups that missed an in-process cache",
+    ["cache"]
+)
+CACHE_ENTRIES = Gauge(
+    "app_cache_entries",
+    "Entries currently held by an in-process cache",
+    ["cache"]
+)
+
+# --- Dataset hot reload ---
+DATASET_RELOAD_SECONDS = Histogram(
+    "dataset_reload_duration_seconds",
+    "Time to rebuild matcher, extractor and drift reference from dataset.csv",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+DATASET_RELOADS = Counter(
+    "dataset_reloads_total",
+    "Dataset reload attempts",
+    ["status"]
+)
+
+# --- Streaming drift (sliding windows over live queries) ---
+DRIFT_WINDOW_FILL = Gauge(
+    "drift_window_samples",
+    "Live query vectors currently held in the drift window"
+)
+DRIFT_WINDOWS_EVALUATED = Counter(
+    "drift_windows_evaluated_total",
+    "Closed drift windows tested against the reference"
+)
+DRIFT_WINDOWS_SKIPPED = Counter(
+    "drift_windows_skipped_total",
+    "Closed drift windows replaced by a newer one before they were evaluated"
+)
+DRIFT_WINDOW_EVAL_SECONDS = Histogram(
+    "drift_window_evaluation_seconds",
+    "Time to run the feature-wise KS tests on one closed window",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+DRIFT_LAST_IS_DRIFT = Gauge(
+    "drift_last_is_drift",
+    "1 if the last evaluated window drifted from the reference, else 0"
+)
+DRIFT_LAST_DRIFTED_FEATURES = Gauge(
+    "drift_last_drifted_features",
+    "Drifted feature count in the last evaluated window"
+)
+DRIFT_LAST_P_VALUE_MIN = Gauge(
+    "drift_last_p_value_min",
+    "Smallest feature p-value in the last evaluated window"
+)
+DRIFT_LAST_P_VALUE_AVG = Gauge(
+    "drift_last_p_value_avg",
+    "Average feature p-value in the last evaluated window"
+)
+DRIFT_LAST_WINDOW_SAMPLES = Gauge(
+    "drift_last_window_samples",
+    "Number of query vectors in the last evaluated window"
+)
+DRIFT_LAST_EVALUATED_AT = Gauge(
+    "drift_last_evaluated_timestamp_seconds",
+    "Unix time of the last drift window evaluation"
+)
+
+# --- Resume parsing process pool ---
+RESUME_PARSE_IN_FLIGHT = Gauge(
+    "resume_parse_in_flight",
+    "Resumes queued or being parsed in the worker pool"
+)
+RESUME_PARSE_QUEUE_SECONDS = Histogram(
+    "resume_parse_queue_wait_seconds",
+    "Time a resume waited for a free parser process",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+RESUME_PARSE_SECONDS = Histogram(
+    "resume_parse_duration_seconds",
+    "PDF text and skill extraction time inside a parser process",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+RESUME_PARSE_REJECTED = Counter(
+    "resume_parse_rejected_total",
+    "Resume uploads not parsed (reason: queue_full | timeout)",
+    ["reason"]
+)
+
+# --- Chat (Gemini) ---
+CHAT_TTFT_SECONDS = Histogram(
+    "chat_time_to_first_token_seconds",
+    "Time from sending the prompt to the first streamed response chunk",
+    ["endpoint"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 20, 30)
+)
+CHAT_UPSTREAM_SECONDS = Histogram(
+    "chat_upstream_duration_seconds",
+    "LLM call duration, from sending the prompt to the last response chunk",
+    ["endpoint"],
+    buckets=(0.25, 0.5, 1, 2, 3, 5, 10, 20, 30, 60)
+)
+CHAT_RESPONSES = Counter(
+    "chat_responses_total",
+    "Chat answers by source (intent | cache | llm | fallback | error)",
+    ["source"]
+)
+CHAT_UPSTREAM_IN_FLIGHT = Gauge(
+    "chat_upstream_in_flight",
+    "LLM calls currently running (bounded by CHAT_MAX_CONCURRENCY)"
+)
+
+# --- LLM client (rate limit, retries, circuit breaker) ---
+LLM_CALLS = Counter(
+    "llm_calls_total",
+    "Upstream LLM call attempts by outcome (success | error | rejected by the open breaker)",
+    ["outcome"]
+)
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "LLM calls retried after backoff, by error kind",
+    ["reason"]
+)
+LLM_BREAKER_STATE = Gauge(
+    "llm_circuit_breaker_state",
+    "LLM circuit breaker state (0 = closed, 1 = half-open, 2 = open)"
+)
+LLM_BREAKER_TRANSITIONS = Counter(
+    "llm_circuit_breaker_transitions_total",
+    "LLM circuit breaker state changes, by new state",
+    ["state"]
+)
+LLM_RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "llm_rate_limit_wait_seconds",
+    "Time LLM calls waited for the request token bucket",
+    buckets=[0, 0.1, 0.5, 1, 2, 5, 10]
+)
+LLM_COALESCED = Counter(
+    "llm_coalesced_requests_total",
+    "Chat requests served by an identical prompt already in flight"
+)
+
+# --- Skill demand forecasting ---
+SKILL_DEMAND_POSTINGS_INGESTED = Counter(
+    "skill_demand_postings_ingested_total",
+    "Job postings added to the per-day skill demand counters"
+)
+SKILL_DEMAND_FORECAST_SECONDS = Histogram(
+    "skill_demand_forecast_seconds",
+    "Time to forecast every skill series",
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.5, 1, 5]
+)
+
+# --- Chat sessions ---
+CHAT_SESSIONS = Gauge(
+    "chat_sessions",
+    "Chat sessions held in memory"
+)
+CHAT_SESSIONS_EVICTED = Counter(
+    "chat_sessions_evicted_total",
+    "Least recently used chat sessions dropped to stay under CHAT_MAX_SESSIONS"
+)
+CHAT_PROMPT_CONTEXT_TOKENS = Histogram(
+    "chat_prompt_context_tokens",
+    "Estimated tokens of the context part of chat prompts",
+    buckets=[50, 100, 250, 500, 750, 1000, 1500, 2000, 3000, 5000]
+)
+
+# --- Cohort analytics ---
+COHORT_CANDIDATES = Counter(
+    "cohort_candidates_analyzed_total",
+    "Candidates included in cohort skill-gap analyses"
+)
+COHORT_ANALYSIS_SECONDS = Histogram(
+    "cohort_analysis_seconds",
+    "Time to compute a cohort skill-gap analysis",
+    buckets=[0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10]
+)
+
+# --- Learning path planner ---
+LEARNING_PLAN_SECONDS = Histogram(
+    "learning_plan_seconds",
+    "Time to plan a learning path (ranking the top-k jobs included)",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5]
+)
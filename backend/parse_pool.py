@@ -0,0 +1,200 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from metrics import (
+    RESUME_PARSE_IN_FLIGHT, RESUME_PARSE_QUEUE_SECONDS, RESUME_PARSE_REJECTED, RESUME_PARSE_SECONDS
+)
+
+
+class ParsePoolFull(Exception):
+    """Too many resumes queued; the caller should retry later (HTTP 503)."""
+
+
+class ParseTimeout(Exception):
+    """A resume was not parsed within the per-job timeout (HTTP 504)."""
+
+
+# --- Worker process side ---
+# Extractors (and their skill automata) built in this worker, keyed by vocabulary
+# version, so the vocabulary is only compiled once per dataset version.
+_worker_extractors = {}
+
+
+def parse_resume_job(source, vocabulary_version, skills, max_pages, max_chars):
+    """
+    Runs in a worker process (this pool and bulk_ingest.py).
+    Returns (parse_resume result, start time, end time).
+    """
+    from extractor import ResumeExtractor
+
+    started_at = time.time()
+    key = (vocabulary_version, max_pages, max_chars)
+    extractor = _worker_extractors.get(key)
+    if extractor is None:
+        # Keep only the current vocabulary after a dataset reload
+        _worker_extractors.clear()
+        extractor = ResumeExtractor(known_skills=skills, max_pages=max_pages, max_chars=max_chars)
+        _worker_extractors[key] = extractor
+
+    result = extractor.parse_resume(source)
+    return result, started_at, time.time()
+
+
+class ResumeParsePool:
+    def __init__(self, max_workers=2, max_queue=16, timeout=30.0):
+        """
+        Runs ResumeExtractor.parse_resume (PyMuPDF + skill extraction) in a pool
+        of worker processes, so CPU-heavy PDFs never block the event loop.
+        max_queue: jobs allowed to wait on top of the ones running; beyond
+            that parse() raises ParsePoolFull right away.
+        timeout: seconds a request waits for its result before ParseTimeout.
+        A job that timed out while still queued is cancelled. If it was already
+        running (e.g. a PDF that hangs PyMuPDF), the pool is recycled: its
+        workers are killed, new jobs go to a fresh pool, and the other jobs
+        that were running there are resubmitted once.
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Pools killed after a timeout: their jobs' BrokenProcessPool is collateral, not a crash
+        self._recycled = weakref.WeakSet()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: workers don't inherit the server's threads or loaded models
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _acquire_slot(self):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                return False
+            self._in_flight += 1
+            RESUME_PARSE_IN_FLIGHT.set(self._in_flight)
+            return True
+
+    def _slot_releaser(self):
+        # Frees the slot once, whichever of the job's completion or its timeout comes first
+        released = []
+
+        def release(future=None):
+            with self._lock:
+                if released:
+                    return
+                released.append(True)
+                self._in_flight -= 1
+                RESUME_PARSE_IN_FLIGHT.set(self._in_flight)
+        return release
+
+    async def parse(self, source, extractor):
+        """
+        Parses a resume with extractor's vocabulary in a worker process.
+        source: PDF bytes (sent to the worker, parsed in memory) or a file path.
+        """
+        if not self._acquire_slot():
+            RESUME_PARSE_REJECTED.labels(reason="queue_full").inc()
+            raise ParsePoolFull(f"Resume parser busy ({self.max_workers + self.max_queue} jobs in flight)")
+
+        release = self._slot_releaser()
+        submitted_at = time.time()
+        deadline = time.monotonic() + self.timeout
+        resubmitted = False
+        while True:
+            retry = []
+            executor = None
+            try:
+                executor = self._get_executor()
+                future = executor.submit(
+                    parse_resume_job, source, extractor.vocabulary_version, extractor.skill_automaton.skills,
+                    extractor.max_pages, extractor.max_chars
+                )
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                release()
+                raise
+            except Exception:
+                release()
+                raise
+
+            def settle(future, executor=executor, retry=retry, last_attempt=resubmitted):
+                # Normally the slot is freed when the worker is really done, not when the request
+                # gives up. A job lost with another request's recycled pool keeps its slot for
+                # the retry (runs before the request sees the result, so it decides the retry).
+                lost = future.cancelled() or isinstance(future.exception(), BrokenProcessPool)
+                if lost and not last_attempt and executor in self._recycled:
+                    retry.append(True)
+                else:
+                    release()
+            future.add_done_callback(settle)
+
+            try:
+                # On timeout wait_for cancels the wrapper, which cancels the job if still queued
+                result, started_at, finished_at = await asyncio.wait_for(
+                    asyncio.wrap_future(future), max(deadline - time.monotonic(), 0.0)
+                )
+                break
+            except asyncio.TimeoutError:
+                RESUME_PARSE_REJECTED.labels(reason="timeout").inc()
+                if not future.cancelled():
+                    # Still running: the worker may never come back, so kill it
+                    self._recycle_executor(executor)
+                # Free the slot now (even if the job was kept for a retry)
+                release()
+                raise ParseTimeout(f"Resume parsing exceeded {self.timeout:.0f}s")
+            except (BrokenProcessPool, asyncio.CancelledError) as e:
+                if retry and not asyncio.current_task().cancelling():
+                    # Killed (or dropped from the queue) along with another request's hung job;
+                    # retry once on the fresh pool, in the same slot
+                    resubmitted = True
+                    continue
+                release()
+                if isinstance(e, BrokenProcessPool):
+                    # A worker died (e.g. crashed on a malformed PDF); start a fresh pool next time
+                    self._reset_executor(executor)
+                raise
+
+        RESUME_PARSE_QUEUE_SECONDS.observe(max(started_at - submitted_at, 0.0))
+        RESUME_PARSE_SECONDS.observe(finished_at - started_at)
+        return result
+
+    def _reset_executor(self, executor=None):
+        # Only replaces the current pool if it is still the one that broke
+        with self._lock:
+            if executor is None or self._executor is executor:
+                executor, self._executor = self._executor, None
+            else:
+                executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _recycle_executor(self, executor):
+        """Kills a pool's worker processes (a job in it hung); new jobs start a fresh pool."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            self._recycled.add(executor)
+        terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+            return
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
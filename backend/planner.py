@@ -0,0 +1,177 @@
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from metrics import LEARNING_PLAN_SECONDS
+
+WORD_BITS = 64
+
+# Bits set in each byte value, for numpy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """Set bits per row of a uint64 bitset array (rows x words)."""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _BYTE_POPCOUNT[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def unpack_bits(words, n_bits):
+    """Bitset rows (rows x words) -> 0/1 uint8 array (rows x n_bits), bit i = skill id i."""
+    words = np.ascontiguousarray(words, dtype="<u8")
+    return np.unpackbits(words.view(np.uint8), axis=-1, bitorder="little")[..., :n_bits]
+
+
+def skill_bitsets(job_skill_ids, job_skill_indptr, n_skills, jobs=None):
+    """
+    Skill sets of the given job rows (default: all) as rows of uint64 words
+    over the skill vocabulary (bit id % 64 of word id // 64), read from
+    JobMatcher's CSR skill index. Built per request for the few rows a plan
+    needs, never for the whole catalog. Duplicate listings collapse into one bit.
+    """
+    indptr = np.asarray(job_skill_indptr, dtype=np.int64)
+    jobs = np.arange(len(indptr) - 1) if jobs is None else np.asarray(jobs, dtype=np.int64)
+    n_words = max(1, -(-n_skills // WORD_BITS))
+    bits = np.zeros((len(jobs), n_words), dtype=np.uint64)
+    counts = indptr[jobs + 1] - indptr[jobs]
+    if counts.sum() == 0:
+        return bits
+
+    # Positions of the selected rows' entries in job_skill_ids
+    firsts = np.cumsum(counts) - counts
+    positions = np.repeat(indptr[jobs] - firsts, counts) + np.arange(counts.sum())
+    skill_ids = np.asarray(job_skill_ids)[positions].astype(np.int64)
+    rows = np.repeat(np.arange(len(jobs), dtype=np.int64), counts)
+    # Unique (row, skill) keys, sorted, so each word's distinct bits can be summed (== OR'd)
+    keys = np.unique(rows * n_skills + skill_ids)
+    rows, skill_ids = keys // n_skills, keys % n_skills
+    cells = rows * n_words + skill_ids // WORD_BITS
+    values = np.left_shift(np.uint64(1), (skill_ids % WORD_BITS).astype(np.uint64))
+    starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+    bits.ravel()[cells[starts]] = np.add.reduceat(values, starts)
+    return bits
+
+
+def skill_set_bits(skill_ids, n_skills):
+    """One skill id set as a bitset row."""
+    bits = np.zeros(max(1, -(-n_skills // WORD_BITS)), dtype=np.uint64)
+    for skill_id in skill_ids:
+        bits[skill_id // WORD_BITS] |= np.uint64(1) << np.uint64(skill_id % WORD_BITS)
+    return bits
+
+
+def catalog_demand(matcher):
+    """Share of the catalog's postings requiring each skill (by skill id)."""
+    postings = np.diff(np.asarray(matcher.skill_job_indptr))
+    return postings / max(len(matcher.df), 1)
+
+
+def plan_learning_path(matcher, user_skills, k=5, max_steps=10, target_coverage=1.0, skill_demand=None):
+    """
+    Ordered skills to learn to raise the user's standing across their top-k
+    matches: greedy weighted coverage over the skills those jobs require and
+    the user lacks.
+    The k jobs' skill sets become bitsets (skill_bitsets); a step adds
+    one skill, worth the required-skill coverage it adds to the jobs still
+    below target_coverage, times (1 + demand of the skill). The plan stops
+    once every job reaches target_coverage (1.0: all required skills), or
+    after max_steps.
+    skill_demand: {skill: weight} (e.g. forecast postings); default: share
+        of the catalog's postings requiring the skill. Scaled to [0, 1].
+    Returns {"skills", "unknown_skills", "steps": [{"step", "skill", "demand",
+    "coverage_gain", "jobs", "avg_coverage"}], "jobs": [{"job_role", "company",
+    "match_score", "projected_match_score", "coverage", "projected_coverage",
+    "missing_after"}], "avg_coverage", "projected_avg_coverage"}.
+    """
+    start = time.perf_counter()
+    n_skills = len(matcher.skill_vocab)
+    user_ids = matcher.encode_skills(user_skills)
+    listed = {s.lower().strip() for s in user_skills} - {""}
+    result = {
+        "skills": sorted(matcher.skill_vocab[i] for i in user_ids),
+        "unknown_skills": sorted(listed - {matcher.skill_vocab[i] for i in user_ids}),
+        "steps": [], "jobs": [], "avg_coverage": 0.0, "projected_avg_coverage": 0.0,
+    }
+    job_indices, scores = matcher.top_jobs(user_skills, k)
+    if len(job_indices) == 0 or n_skills == 0:
+        return result
+
+    # Demand per skill id, scaled so the most demanded skill weighs 1
+    if skill_demand:
+        demand = np.zeros(n_skills)
+        for skill, weight in skill_demand.items():
+            skill_id = matcher.skill_ids.get(str(skill).lower().strip())
+            if skill_id is not None:
+                demand[skill_id] = max(float(weight), 0.0)
+    else:
+        demand = catalog_demand(matcher)
+    demand = demand / demand.max() if demand.max() > 0 else demand
+
+    required = skill_bitsets(matcher.job_skill_ids, matcher.job_skill_indptr, n_skills, job_indices)  # jobs x words
+    missing = required & ~skill_set_bits(user_ids, n_skills)
+    required_count = np.maximum(popcount(required), 1)
+    held = required_count - popcount(missing)
+    coverage_before = held / required_count
+
+    # Coverage a skill adds per job (1 / required skills), summed over the jobs
+    # still below target; a job's share is withdrawn once it reaches target
+    share = 1.0 / required_count
+    active = held / required_count < target_coverage - 1e-9
+    missing_bits = unpack_bits(missing, n_skills)                   # jobs x skills, 0/1
+    gains = (share * active) @ missing_bits
+
+    plan = []
+    for step in range(1, max_steps + 1):
+        priority = gains * (1.0 + demand)
+        skill_id = int(priority.argmax())
+        if gains[skill_id] <= 1e-12:
+            break
+        word, bit = divmod(skill_id, WORD_BITS)
+        mask = np.uint64(1) << np.uint64(bit)
+        improved = (missing[:, word] & mask) != 0
+        missing[:, word] &= ~mask
+        held += improved
+        missing_bits[:, skill_id] = 0
+        gains[skill_id] = 0.0
+
+        reached = active & improved & (held / required_count >= target_coverage - 1e-9)
+        if reached.any():
+            # Jobs at target no longer count towards any skill's gain
+            gains -= (share * reached) @ missing_bits
+            active &= ~reached
+
+        plan.append(skill_id)
+        result["steps"].append({
+            "step": step,
+            "skill": matcher.skill_vocab[skill_id],
+            "demand": round(float(demand[skill_id]), 4),
+            "coverage_gain": round(float((share * improved).sum()), 4),
+            "jobs": [matcher._job_detail('job_role', int(job_indices[j])) for j in np.flatnonzero(improved)],
+            "avg_coverage": round(float((held / required_count).mean()), 4),
+        })
+
+    # Match scores if the user learned the whole plan (same TF-IDF scoring as match_jobs)
+    projected_scores = scores
+    if plan and matcher.vectorizer is not None:
+        projected_vector = matcher.vectorize_skills([list(listed) + [matcher.skill_vocab[i] for i in plan]])
+        similarities = cosine_similarity(projected_vector, matcher.job_vectors[job_indices]).ravel()
+        projected_scores = np.round(similarities * 100, 2)
+
+    coverage_after = held / required_count
+    for j, idx in enumerate(job_indices.tolist()):
+        result["jobs"].append({
+            "job_role": matcher._job_detail('job_role', idx),
+            "company": matcher._job_detail('company', idx, 'Confidential'),
+            "match_score": float(scores[j]),
+            "projected_match_score": float(projected_scores[j]),
+            "coverage": round(float(coverage_before[j]), 4),
+            "projected_coverage": round(float(coverage_after[j]), 4),
+            "missing_after": [matcher.skill_vocab[i] for i in np.flatnonzero(unpack_bits(missing[j], n_skills))],
+        })
+    result["avg_coverage"] = round(float(coverage_before.mean()), 4)
+    result["projected_avg_coverage"] = round(float(coverage_after.mean()), 4)
+    LEARNING_PLAN_SECONDS.observe(time.perf_counter() - start)
+    return result
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+from metrics import DATASET_RELOAD_SECONDS, DATASET_RELOADS
+
+# Everything derived from dataset.csv. Request handlers read registry.current
+# once and use that snapshot throughout, so a swap never mixes versions.
+ModelBundle = namedtuple("ModelBundle", ["matcher", "extractor", "drift_monitor", "version", "loaded_at"])
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+class ModelRegistry:
+    def __init__(self, build_fn, dataset_path):
+        """
+        Holds the current ModelBundle and rebuilds it when the dataset changes.
+        build_fn(dataset_path, version) -> ModelBundle
+        Rebuilds run in a background thread; the new bundle replaces the old one
+        with a single reference assignment, so in-flight requests finish on
+        the snapshot they started with.
+        """
+        self.build_fn = build_fn
+        self.dataset_path = dataset_path
+
+        self._reload_lock = threading.Lock()
+        self._reload_thread = None
+        self._watch_thread = None
+        self._stop_event = threading.Event()
+
+        self.current = build_fn(dataset_path, 1)
+        self._signature = _file_signature(self.watched_path)
+        self.last_reload = {
+            "version": 1,
+            "status": "initial",
+            "duration_seconds": None,
+            "error": None,
+            "finished_at": self.current.loaded_at
+        }
+
+    @property
+    def watched_path(self):
+        # JobMatcher may have fallen back to the bundled dataset
+        matcher_path = getattr(self.current.matcher, "dataset_path", None)
+        return matcher_path or self.dataset_path
+
+    def reload(self, wait=False):
+        """
+        Starts a background rebuild. Returns False if one is already running.
+        wait=True blocks until the rebuild finished (used by scripts/tests).
+        """
+        with self._reload_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return False
+            self._reload_thread = threading.Thread(target=self._rebuild, name="dataset-reload", daemon=True)
+            self._reload_thread.start()
+            thread = self._reload_thread
+
+        if wait:
+            thread.join()
+        return True
+
+    def _rebuild(self):
+        version = self.current.version + 1
+        signature = _file_signature(self.watched_path)
+        start = time.perf_counter()
+        try:
+            bundle = self.build_fn(self.dataset_path, version)
+            # JobMatcher swallows load errors and comes back empty; never swap that in
+            if bundle.matcher.df.empty:
+                raise ValueError("Rebuilt job catalog is empty, keeping the previous dataset")
+
+            self.current = bundle
+            self._signature = signature
+            duration = time.perf_counter() - start
+            DATASET_RELOAD_SECONDS.observe(duration)
+            DATASET_RELOADS.labels(status="success").inc()
+            self.last_reload = {
+                "version": version,
+                "status": "success",
+                "duration_seconds": round(duration, 3),
+                "error": None,
+                "finished_at": time.time()
+            }
+            print(f"Dataset reloaded (version {version}) in {duration:.2f}s")
+        except Exception as e:
+            # Don't retry the same broken file on every poll
+            self._signature = signature
+            DATASET_RELOADS.labels(status="error").inc()
+            self.last_reload = {
+                "version": self.current.version,
+                "status": "error",
+                "duration_seconds": round(time.perf_counter() - start, 3),
+                "error": str(e),
+                "finished_at": time.time()
+            }
+            print(f"Dataset Reload Error: {e}")
+
+    def start_watching(self, interval=10.0):
+        """Polls the dataset file and reloads once a change has settled."""
+        if self._watch_thread is not None or interval <= 0:
+            return
+        self._watch_thread = threading.Thread(target=self._watch, args=(interval,), name="dataset-watch", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        self._stop_event.set()
+
+    def _watch(self, interval):
+        pending = None
+        while not self._stop_event.wait(interval):
+            signature = _file_signature(self.watched_path)
+            if signature is None or signature == self._signature:
+                pending = None
+                continue
+            # Only reload when the file looked the same on two polls in a row
+            # (avoids picking up a half-written CSV)
+            if signature == pending:
+                pending = None
+                self.reload()
+            else:
+                pending = signature
@@ -1,14 +1,49 @@
 import pandas as pd
 from companies import COMPANY_KNOWLEDGE_BASE, DEFAULT_RECOMMENDATIONS
+from role_profiles import build_role_profiles, role_key
 
-def generate_company_report(user_skills, matches, dataset_df=None):
+# Companies listed per matched role
+COMPANIES_PER_ROLE = 5
+
+
+def _format_salary(value):
+    return f"{value:,.0f}"
+
+
+def _count(n, word):
+    return f"{n} {word}" if n == 1 else f"{n} {word}s"
+
+
+def rank_companies(role, profile):
+    """
+    Dataset companies hiring for the role (most postings first, then best
+    paid, then by name), followed by the knowledge-base companies not
+    already listed, in their curated order. Returns [(company, entry or None)].
+    """
+    ranked = [(entry["company"], entry) for entry in (profile or {}).get("companies", [])]
+    seen = {company.lower() for company, _ in ranked}
+    for company in COMPANY_KNOWLEDGE_BASE.get(role, DEFAULT_RECOMMENDATIONS)['top_companies']:
+        if company.lower() not in seen:
+            seen.add(company.lower())
+            ranked.append((company, None))
+    return ranked[:COMPANIES_PER_ROLE]
+
+
+def generate_company_report(user_skills, matches, dataset_df=None, role_profiles=None, plan=None):
     """
     Generates a markdown report for company recommendations.
     
     user_skills: list of strings
     matches: list of dicts (from matcher.match_jobs)
-    dataset_df: pandas DataFrame (optional, to lookup specific dataset companies)
+    role_profiles: JobMatcher.role_profiles (hiring companies, salary and
+        experience per role), so looking up a role costs a dict access
+    dataset_df: pandas DataFrame (optional, profiled here when role_profiles
+        isn't given)
+    plan: planner.plan_learning_path result (optional); its first steps
+        become the Action Plan's skills to learn
     """
+    if role_profiles is None:
+        role_profiles = build_role_profiles(dataset_df) if dataset_df is not None else {}
     
     # 1. Top Skills
     top_skills_str = ", ".join(user_skills[:5])
@@ -30,27 +65,28 @@ def generate_company_report(user_skills, matches, dataset_df=None):
         role = match['job_role']
         score = match['match_score']
         
-        # Get Knowledge Base Data
-        kb_data = COMPANY_KNOWLEDGE_BASE.get(role, DEFAULT_RECOMMENDATIONS)
-        
-        # Merge with Dataset Companies if available
-        # Find companies in dataset that have this role
-        dataset_companies = []
-        if dataset_df is not None and not dataset_df.empty:
-            relevant_rows = dataset_df[dataset_df['job_role'].str.contains(role, case=False, na=False)]
-            dataset_companies = relevant_rows['company'].dropna().unique().tolist()
-        
-        # Combine lists (Prioritize dataset, then KB)
-        all_companies = list(set(dataset_companies + kb_data['top_companies']))
-        recommended_companies = all_companies[:5] # Take top 5
+        # Dataset companies and salary stats for this role (precomputed at matcher load)
+        profile = role_profiles.get(role_key(role))
         
         report_lines.append(f"{idx}. ⭐ {role} ({score}% match)")
+        if profile and profile["salary"]["median"] is not None:
+            salary = profile["salary"]
+            report_lines.append(
+                f"   Salary Range: {_format_salary(salary['min'])} - {_format_salary(salary['max'])}"
+                f" (median {_format_salary(salary['median'])}, {_count(profile['postings'], 'posting')})"
+            )
+        if profile and profile["experience"]:
+            report_lines.append(f"   Typical Experience: {profile['experience'][0]['band']}")
         report_lines.append("   Recommended Companies:")
         
-        for company in recommended_companies:
-            # Add simple annotations based on generic knowledge or location if we had it
-            # For now, just listing them as requested in updated prompt format
-            report_lines.append(f"   - {company}")
+        # Prioritize dataset companies (by posting frequency), then KB
+        for company, entry in rank_companies(role, profile):
+            if entry is None:
+                report_lines.append(f"   - {company}")
+            elif entry["avg_salary"] is not None:
+                report_lines.append(f"   - {company} ({_count(entry['postings'], 'opening')}, avg salary {_format_salary(entry['avg_salary'])})")
+            else:
+                report_lines.append(f"   - {company} ({_count(entry['postings'], 'opening')})")
             
         report_lines.append("")
         
@@ -68,7 +104,15 @@ def generate_company_report(user_skills, matches, dataset_df=None):
     # 5. Action Plan
     report_lines.append("**Action Plan:**")
     report_lines.append("- Build 1-2 projects aligned with **" + top_3_matches[0]['job_role'] + "**")
-    report_lines.append("- Optimize resume keyword section for ATS using: " + ", ".join(match['missing_skills'][:3]))
+    if plan and plan["steps"]:
+        steps = plan["steps"][:3]
+        report_lines.append("- Learn next, in this order: " + " → ".join(f"**{step['skill']}**" for step in steps))
+        report_lines.append(
+            f"  (covers {steps[-1]['avg_coverage']:.0%} of the skills your top matches require, up from {plan['avg_coverage']:.0%})"
+        )
+        report_lines.append("- Optimize resume keyword section for ATS using: " + ", ".join(step['skill'] for step in steps))
+    else:
+        report_lines.append("- Optimize resume keyword section for ATS using: " + ", ".join(match['missing_skills'][:3]))
     report_lines.append("- Start applying to entry-level / internship listings on company websites")
     
     return "\n".join(report_lines)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+# Salary percentiles kept per role
+SALARY_PERCENTILES = {"p10": 0.10, "p25": 0.25, "median": 0.50, "p75": 0.75, "p90": 0.90}
+
+
+def _number(value):
+    return None if pd.isna(value) else round(float(value), 2)
+
+
+def _column(df, name):
+    return df[name] if name in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def role_key(role):
+    """Profiles are keyed by lower-cased, stripped role name."""
+    return str(role).lower().strip()
+
+
+def build_role_profiles(df, skill_vocab=None, job_skill_ids=None, job_skill_indptr=None):
+    """
+    Aggregates the postings into one profile per role (keyed by role_key):
+    {
+        "role", "postings",
+        "salary": {"mean", "min", "p10", "p25", "median", "p75", "p90", "max"},
+        "experience": [{"band", "postings", "share"}],
+        "domains": [{"domain", "postings"}],
+        "skills": [{"skill", "postings", "share"}],
+        "companies": [{"company", "postings", "avg_salary"}]
+    }
+    Every aggregate is one groupby over all postings (no per-role scans).
+    Lists are most postings first; skill ties keep their listed order,
+    company ties go to the best paid, then by name, so the order is stable.
+    Plain Python values only (JSON-serializable, stored with the artifacts).
+    Skills come from JobMatcher's integer-coded skill index; without it
+    ("skills" left empty) only the DataFrame is needed.
+    """
+    if df.empty or 'job_role' not in df.columns:
+        return {}
+
+    frame = pd.DataFrame({
+        "role": df['job_role'].astype(str).str.strip(),
+        "company": _column(df, 'company'),
+        "domain": _column(df, 'domain'),
+        "experience": _column(df, 'min_experience'),
+        "salary": pd.to_numeric(_column(df, 'avg_salary'), errors='coerce'),
+    }).reset_index(drop=True)
+    frame["key"] = frame["role"].str.lower()
+
+    roles = frame.groupby("key", sort=False).agg(
+        role=("role", "first"), postings=("role", "size"),
+        mean=("salary", "mean"), min=("salary", "min"), max=("salary", "max")
+    )
+    percentiles = frame.groupby("key", sort=False)["salary"].quantile(list(SALARY_PERCENTILES.values())).unstack()
+
+    profiles = {}
+    for key, row in roles.iterrows():
+        salary = {"mean": _number(row["mean"]), "min": _number(row["min"])}
+        for name, q in SALARY_PERCENTILES.items():
+            salary[name] = _number(percentiles.at[key, q])
+        salary["max"] = _number(row["max"])
+        profiles[key] = {
+            "role": row["role"], "postings": int(row["postings"]), "salary": salary,
+            "experience": [], "domains": [], "skills": [], "companies": [],
+        }
+
+    experience = frame.dropna(subset=["experience"]).groupby(["key", "experience"], sort=False).size()
+    experience = experience.reset_index(name="postings").sort_values(
+        ["key", "postings", "experience"], ascending=[True, False, True]
+    )
+    for key, band, postings in experience.itertuples(index=False):
+        profile = profiles[key]
+        profile["experience"].append({"band": band, "postings": int(postings), "share": round(float(postings) / profile["postings"], 4)})
+
+    domains = frame.dropna(subset=["domain"]).groupby(["key", "domain"], sort=False).size()
+    domains = domains.reset_index(name="postings").sort_values(["key", "postings", "domain"], ascending=[True, False, True])
+    for key, domain, postings in domains.itertuples(index=False):
+        profiles[key]["domains"].append({"domain": domain, "postings": int(postings)})
+
+    companies = frame.dropna(subset=["company"]).groupby(["key", "company"], sort=False).agg(
+        postings=("role", "size"), avg_salary=("salary", "mean")
+    ).reset_index().sort_values(
+        ["key", "postings", "avg_salary", "company"], ascending=[True, False, False, True], na_position="last"
+    )
+    for key, company, postings, avg_salary in companies.itertuples(index=False):
+        profiles[key]["companies"].append({"company": company, "postings": int(postings), "avg_salary": _number(avg_salary)})
+
+    # Skill frequency: each (posting, skill) pair counted once, from the integer-coded skill index
+    counts = np.diff(np.asarray(job_skill_indptr)) if job_skill_indptr is not None else np.zeros(0, dtype=np.int64)
+    if counts.sum():
+        entries = pd.DataFrame({
+            "key": np.repeat(frame["key"].to_numpy(), counts),
+            "job": np.repeat(np.arange(len(frame)), counts),
+            "skill": np.asarray(job_skill_ids),
+        })
+        entries["position"] = np.arange(len(entries))
+        entries = entries.drop_duplicates(["job", "skill"])
+        skills = entries.groupby(["key", "skill"], sort=False).agg(
+            postings=("job", "size"), first=("position", "min")
+        ).reset_index().sort_values(["key", "postings", "first"], ascending=[True, False, True])
+        for key, skill_id, postings, _ in skills.itertuples(index=False):
+            profile = profiles[key]
+            profile["skills"].append({
+                "skill": skill_vocab[skill_id], "postings": int(postings), "share": round(float(postings) / profile["postings"], 4)
+            })
+
+    return profiles
@@ -0,0 +1,192 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+from metrics import CHAT_PROMPT_CONTEXT_TOKENS, CHAT_SESSIONS, CHAT_SESSIONS_EVICTED
+
+# Longest session id accepted from a client
+MAX_SESSION_ID_LENGTH = 64
+
+
+def estimate_tokens(text):
+    """Rough LLM token count (~4 characters per token), enough for budgeting."""
+    return (len(text) + 3) // 4
+
+
+def _clip(text, max_chars):
+    text = " ".join(str(text).split())
+    return text if len(text) <= max_chars else text[:max_chars - 1].rstrip() + "…"
+
+
+def compact_profile(skills, matches, top_matches=3, max_missing=5):
+    """
+    Structured summary of a resume analysis (or of the dashboard data sent as
+    chat context): the skills and the top matches with their missing skills.
+    Replaces the full upload result (every match field, resume preview) in prompts.
+    """
+    profile = {"skills": [str(s).lower().strip() for s in skills or [] if str(s).strip()]}
+    top = []
+    for match in (matches or [])[:top_matches]:
+        if not isinstance(match, dict) or not match.get("job_role"):
+            continue
+        top.append({
+            "job_role": match["job_role"],
+            "match_score": match.get("match_score"),
+            "missing_skills": list(match.get("missing_skills") or [])[:max_missing],
+        })
+    profile["top_matches"] = top
+    return profile
+
+
+def compact_context(context, max_value_chars=200):
+    """
+    Client-sent chat context reduced to what the model needs: the resume
+    profile plus short scalar fields (e.g. location, target role).
+    Returns (profile or None, {key: clipped value}).
+    """
+    if not isinstance(context, dict):
+        return None, ({"note": _clip(context, max_value_chars)} if context else {})
+
+    profile = None
+    skills = context.get("extracted_skills") or context.get("skills")
+    if skills or context.get("matches"):
+        profile = compact_profile(skills, context.get("matches"))
+
+    extras = {}
+    for key, value in context.items():
+        if key in ("extracted_skills", "skills", "matches", "resume_text_preview", "session_id"):
+            continue
+        if isinstance(value, (str, int, float, bool)):
+            extras[key] = _clip(value, max_value_chars)
+    return profile, extras
+
+
+def render_profile(profile):
+    lines = [f"Skills: {', '.join(profile['skills']) or 'none extracted'}"]
+    for match in profile["top_matches"]:
+        missing = ", ".join(match["missing_skills"]) or "none"
+        lines.append(f"Match: {match['job_role']} ({match['match_score']}%), missing: {missing}")
+    return "\n".join(lines)
+
+
+class ChatSession:
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.profile = None        # compact_profile of the last uploaded resume
+        self.turns = deque()       # recent (role, text), oldest first
+        self.turn_tokens = 0
+        self.summary = deque()     # one clipped line per folded-away user turn
+        self.summary_tokens = 0
+        self.updated_at = time.time()
+
+
+class SessionStore:
+    def __init__(self, max_sessions=10000, context_tokens=1500, summary_line_chars=120):
+        """
+        In-memory chat sessions, least recently used evicted past max_sessions.
+        context_tokens: budget for the context part of every prompt (profile,
+            client fields, summary of older turns, recent turns). A quarter
+            each goes to the profile and the summary, the rest to recent turns;
+            turns that no longer fit are folded into the summary (user
+            questions, clipped), and the oldest summary lines are dropped,
+            so prompt size stays flat however long the conversation runs.
+        """
+        self.max_sessions = max_sessions
+        self.context_tokens = context_tokens
+        self.profile_tokens = context_tokens // 4
+        self.summary_budget = context_tokens // 4
+        self.history_tokens = context_tokens - self.profile_tokens - self.summary_budget
+        self.summary_line_chars = summary_line_chars
+
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        CHAT_SESSIONS.set_function(lambda: len(self._sessions))
+
+    def get(self, session_id=None):
+        """
+        Returns the session for session_id, creating it if unknown (or evicted);
+        a new id is generated when none (or an invalid one) is given.
+        """
+        if not session_id or len(session_id) > MAX_SESSION_ID_LENGTH:
+            session_id = uuid.uuid4().hex
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = ChatSession(session_id)
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    CHAT_SESSIONS_EVICTED.inc()
+            self._sessions.move_to_end(session_id)
+            session.updated_at = time.time()
+            return session
+
+    def set_profile(self, session_id, skills, matches):
+        """Stores the compact profile of an /upload_resume result; returns the session."""
+        session = self.get(session_id)
+        with self._lock:
+            session.profile = compact_profile(skills, matches)
+        return session
+
+    def append(self, session, role, text):
+        """Adds a turn ('user' or 'assistant'), folding old turns past the history budget."""
+        with self._lock:
+            session.turns.append((role, text))
+            session.turn_tokens += estimate_tokens(text)
+            while session.turn_tokens > self.history_tokens and len(session.turns) > 1:
+                old_role, old_text = session.turns.popleft()
+                session.turn_tokens -= estimate_tokens(old_text)
+                if old_role == "user":
+                    line = _clip(old_text, self.summary_line_chars)
+                    session.summary.append(line)
+                    session.summary_tokens += estimate_tokens(line)
+                    while session.summary_tokens > self.summary_budget and session.summary:
+                        session.summary_tokens -= estimate_tokens(session.summary.popleft())
+
+    def render_context(self, session=None, context=None):
+        """
+        Prompt context for the next turn, within context_tokens:
+        profile (session's, else from the client context), client fields,
+        summary of older turns, then recent turns (newest kept first).
+        """
+        client_profile, extras = compact_context(context)
+        profile = session.profile if session is not None and session.profile else client_profile
+        header = []
+        if profile:
+            header.append("=== PROFILE ===\n" + render_profile(profile))
+        if extras:
+            header.append("=== USER DETAILS ===\n" + "\n".join(f"{key}: {value}" for key, value in extras.items()))
+        parts = [self._fit("\n\n".join(header), self.profile_tokens)] if header else []
+
+        if session is not None:
+            with self._lock:
+                summary = list(session.summary)
+                turns = list(session.turns)
+            if summary:
+                parts.append("=== EARLIER QUESTIONS ===\n" + "\n".join(f"- {line}" for line in summary))
+            if turns:
+                # A single oversized turn (e.g. a long paste) is cut to the history budget
+                budget = self.history_tokens
+                recent = []
+                for role, text in reversed(turns):
+                    if budget <= 0:
+                        break
+                    line = self._fit(f"{role}: {text}", budget)
+                    budget -= estimate_tokens(line)
+                    recent.append(line)
+                parts.append("=== CONVERSATION ===\n" + "\n".join(reversed(recent)))
+
+        rendered = "\n\n".join(parts)
+        CHAT_PROMPT_CONTEXT_TOKENS.observe(estimate_tokens(rendered))
+        return rendered
+
+    @staticmethod
+    def _fit(text, tokens):
+        # Cut (keeping line breaks) to roughly `tokens` tokens
+        max_chars = max(tokens * 4, 1)
+        return text if len(text) <= max_chars else text[:max_chars - 1].rstrip() + "…"
+
+    def stats(self):
+        with self._lock:
+            return {"sessions": len(self._sessions), "max_sessions": self.max_sessions,
+                    "context_tokens": self.context_tokens}
@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+
+import grpc
+from google.ai import generativelanguage_v1beta as glm
+
+SERVICE_NAME = "google.ai.generativelanguage.v1beta.GenerativeService"
+
+
+class StubGenerativeService:
+    def __init__(self, chunks=None, chunk_delay=0.05, first_chunk_delay=0.2, fail_first=0,
+                 fail_code=grpc.StatusCode.UNAVAILABLE):
+        """
+        Stand-in for the Gemini GenerativeService (GenerateContent and
+        StreamGenerateContent) for load tests and local development.
+        Answers every prompt with the same chunks, after first_chunk_delay and
+        then chunk_delay between chunks. Counts calls and the peak number of
+        concurrent calls, and keeps the last request (to inspect prompts).
+        The first fail_first calls are aborted with fail_code (outage drills).
+        """
+        self.chunks = chunks or ["Here's what I found 👇\n", "- Best Matched Roles → ", "Data Scientist (82%)\n",
+                                 "You're doing great — let’s move one step at a time 🚀"]
+        self.chunk_delay = chunk_delay
+        self.first_chunk_delay = first_chunk_delay
+        self.fail_first = fail_first
+        self.fail_code = fail_code
+        self.calls = 0
+        self.last_request = None
+        self.active = 0
+        self.max_active = 0
+
+    @staticmethod
+    def _response(text):
+        content = glm.Content(parts=[glm.Part(text=text)], role="model")
+        return glm.GenerateContentResponse(candidates=[glm.Candidate(content=content, index=0)])
+
+    async def stream_generate_content(self, request, context):
+        self.calls += 1
+        self.last_request = request
+        if self.calls <= self.fail_first:
+            await context.abort(self.fail_code, "stub failure")
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            for i, text in enumerate(self.chunks):
+                await asyncio.sleep(self.first_chunk_delay if i == 0 else self.chunk_delay)
+                yield self._response(text)
+        finally:
+            self.active -= 1
+
+    async def generate_content(self, request, context):
+        chunks = [chunk async for chunk in self.stream_generate_content(request, context)]
+        return self._response("".join(chunk.candidates[0].content.parts[0].text for chunk in chunks))
+
+    def handler(self):
+        return grpc.method_handlers_generic_handler(SERVICE_NAME, {
+            "StreamGenerateContent": grpc.unary_stream_rpc_method_handler(
+                self.stream_generate_content,
+                request_deserializer=glm.GenerateContentRequest.deserialize,
+                response_serializer=glm.GenerateContentResponse.serialize
+            ),
+            "GenerateContent": grpc.unary_unary_rpc_method_handler(
+                self.generate_content,
+                request_deserializer=glm.GenerateContentRequest.deserialize,
+                response_serializer=glm.GenerateContentResponse.serialize
+            ),
+        })
+
+
+async def start_stub_server(service, host="127.0.0.1", port=0):
+    """Starts a plain-text gRPC server; returns (server, bound port)."""
+    server = grpc.aio.server()
+    server.add_generic_rpc_handlers((service.handler(),))
+    bound_port = server.add_insecure_port(f"{host}:{port}")
+    await server.start()
+    return server, bound_port
+
+
+if __name__ == "__main__":
+    # python stub_llm_server.py --port 50051, then run the API with GEMINI_API_ENDPOINT=localhost:50051
+    parser = argparse.ArgumentParser(description="Local stub of the Gemini streaming API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument("--first-chunk-delay", type=float, default=0.2)
+    parser.add_argument("--chunk-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    async def serve():
+        stub = StubGenerativeService(chunk_delay=args.chunk_delay, first_chunk_delay=args.first_chunk_delay)
+        server, port = await start_stub_server(stub, args.host, args.port)
+        print(f"Stub Gemini server listening on {args.host}:{port}")
+        await server.wait_for_termination()
+
+    asyncio.run(serve())
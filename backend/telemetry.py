@@ -0,0 +1,148 @@
+import atexit
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+
+import mlflow
+
+from metrics import MATCH_TELEMETRY_DROPPED, MATCH_TELEMETRY_FLUSHED, MATCH_TELEMETRY_QUEUED
+
+
+class MatchTelemetry:
+    def __init__(self, max_queue_size=10000, flush_interval=30.0, flush_batch_size=500,
+                 experiment_name="CareerMatch_JobMatcher"):
+        """
+        Background MLflow logging for match requests.
+        Events are queued by the request thread and written by a single worker
+        thread as one MLflow run per batch (every flush_interval seconds or
+        flush_batch_size events, whichever comes first).
+        The queue is bounded: when it is full new events are dropped and counted,
+        so a slow tracking store never blocks a request.
+        """
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.experiment_name = experiment_name
+
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.dropped_events = 0
+        self._dropped_lock = threading.Lock()
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        MATCH_TELEMETRY_QUEUED.set_function(self.queue.qsize)
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="match-telemetry", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def stop(self, timeout=10.0):
+        """Flushes whatever is queued and stops the worker thread."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+
+    def record(self, event):
+        """
+        Queues one match event (a JSON-serialisable dict). Never blocks.
+        Returns False if the event was dropped.
+        """
+        if self._thread is None:
+            self.start()
+
+        event.setdefault("timestamp", time.time())
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped_events += 1
+            MATCH_TELEMETRY_DROPPED.inc()
+            return False
+
+    def _run(self):
+        try:
+            mlflow.set_experiment(self.experiment_name)
+        except Exception as e:
+            print(f"MLflow Telemetry Error: {e}")
+
+        while not self._stop_event.is_set():
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+
+        # Final drain on shutdown
+        batch = self._drain()
+        if batch:
+            self._flush(batch)
+
+    def _collect_batch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.flush_batch_size and not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                # Short waits so stop() is noticed quickly
+                batch.append(self.queue.get(timeout=min(remaining, 0.5)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _flush(self, events):
+        """Logs one MLflow run summarising the events, with the raw events as a JSONL artifact."""
+        try:
+            top_scores = [e["top_match_score"] for e in events if e.get("top_match_score") is not None]
+            avg_scores = [e["avg_top_score"] for e in events if e.get("avg_top_score") is not None]
+
+            metrics = {
+                "event_count": len(events),
+                "dropped_events_total": self.dropped_events,
+                "avg_num_skills_provided": sum(e.get("num_skills_provided", 0) for e in events) / len(events),
+            }
+            if top_scores:
+                metrics["avg_top_match_score"] = sum(top_scores) / len(top_scores)
+                metrics["max_top_match_score"] = max(top_scores)
+            if avg_scores:
+                metrics["avg_topk_score"] = sum(avg_scores) / len(avg_scores)
+
+            # Unique directory per flush: no shared filename in the working directory
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                events_file = os.path.join(tmp_dir, "match_events.jsonl")
+                with open(events_file, "w") as f:
+                    for event in events:
+                        f.write(json.dumps(event, default=str) + "\n")
+
+                with mlflow.start_run(run_name="Match_Requests_Batch"):
+                    mlflow.log_params({
+                        "first_event_time": min(e["timestamp"] for e in events),
+                        "last_event_time": max(e["timestamp"] for e in events),
+                    })
+                    mlflow.log_metrics(metrics)
+                    mlflow.log_artifact(events_file)
+
+            MATCH_TELEMETRY_FLUSHED.inc(len(events))
+        except Exception as e:
+            print(f"MLflow Logging Error: {e}")
+
+
+# Shared by every JobMatcher in the process (one worker thread, one queue)
+match_telemetry = MatchTelemetry()
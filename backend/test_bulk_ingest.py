@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import zipfile
+
+import fitz  # PyMuPDF
+import pandas as pd
+
+import bulk_ingest
+from bulk_ingest import BulkIngestor
+from extractor import ResumeExtractor
+from matcher import JobMatcher
+
+RESUME_SKILLS = [["python", "sql"], ["java"], ["python", "machine learning"], ["excel"], ["sql"]]
+
+
+def _write_resumes(directory):
+    os.makedirs(directory)
+    for i, skills in enumerate(RESUME_SKILLS):
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Skills: " + ", ".join(skills))
+        doc.save(os.path.join(directory, f"resume_{i}.pdf"))
+        doc.close()
+
+
+def test_bulk_ingest_jsonl_and_resume():
+    matcher = JobMatcher()
+    ingestor = BulkIngestor(matcher, ResumeExtractor(known_skills=matcher.get_all_skills()), workers=2, batch_size=2)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        resumes = os.path.join(tmp_dir, "resumes")
+        _write_resumes(resumes)
+        output = os.path.join(tmp_dir, "results.jsonl")
+
+        stats = ingestor.run(resumes, output)
+        assert stats["processed"] == 5 and stats["skipped"] == 0
+        with open(output) as f:
+            rows = {row["file"]: row for row in map(json.loads, f)}
+        assert set(rows) == {f"resume_{i}.pdf" for i in range(5)}
+        for i, skills in enumerate(RESUME_SKILLS):
+            row = rows[f"resume_{i}.pdf"]
+            assert set(row["extracted_skills"]) == set(skills)
+            assert row["matches"] == matcher.match_jobs_batch([row["extracted_skills"]])[0]
+
+        # Rerun after a "crash" between writing the last batch and recording it:
+        # nothing is redone, and no row is written twice
+        with open(output + ".progress") as f:
+            done = f.read().splitlines()
+        with open(output + ".progress", "w") as f:
+            f.write("\n".join(done[:3]) + "\n")
+        stats = ingestor.run(resumes, output)
+        assert stats["processed"] == 0 and stats["skipped"] == 5
+
+        # A crash that lost the last two files (one row half written): only those are redone
+        with open(output) as f:
+            lines = f.read().splitlines()
+        with open(output, "w") as f:
+            f.write("\n".join(lines[:3]) + "\n" + lines[3][:20])
+        with open(output + ".progress", "w") as f:
+            f.write("\n".join(done[:3]) + "\n")
+        stats = ingestor.run(resumes, output)
+        assert stats["processed"] == 2 and stats["skipped"] == 3
+        with open(output) as f:
+            files = [json.loads(line)["file"] for line in f]
+        assert sorted(files) == sorted(rows)
+
+
+def test_bulk_ingest_zip_to_parquet():
+    matcher = JobMatcher()
+    ingestor = BulkIngestor(matcher, ResumeExtractor(known_skills=matcher.get_all_skills()), workers=1, batch_size=2)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        resumes = os.path.join(tmp_dir, "resumes")
+        _write_resumes(resumes)
+        archive = os.path.join(tmp_dir, "resumes.zip")
+        with zipfile.ZipFile(archive, "w") as z:
+            for name in sorted(os.listdir(resumes)):
+                z.write(os.path.join(resumes, name), f"batch/{name}")
+
+        output = os.path.join(tmp_dir, "results")
+        assert ingestor.run(archive, output, "parquet")["processed"] == 5
+        frame = pd.read_parquet(output)
+        assert len(os.listdir(output)) == 3  # batches of 2, 2, 1
+        assert sorted(frame["file"]) == [f"batch/resume_{i}.pdf" for i in range(5)]
+
+        # Parts written but never recorded (progress lost) are not parsed again
+        os.remove(output + ".progress")
+        assert ingestor.run(archive, output, "parquet")["skipped"] == 5
+        assert len(os.listdir(output)) == 3
+
+
+class CrashingSource:
+    # Kills the worker process that reads it, like a PDF that crashes PyMuPDF
+    def read(self):
+        os._exit(1)
+
+
+def test_worker_crash_fails_its_files_and_the_run_goes_on():
+    matcher = JobMatcher()
+    ingestor = BulkIngestor(matcher, ResumeExtractor(known_skills=matcher.get_all_skills()), workers=1, batch_size=2)
+    read_sources = bulk_ingest.iter_resume_sources
+
+    def sources_with_a_crash(input_path):
+        yield from read_sources(input_path)
+        yield "crash.pdf", CrashingSource
+        yield from ((f"after/{name}", load) for name, load in read_sources(input_path))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        resumes = os.path.join(tmp_dir, "resumes")
+        _write_resumes(resumes)
+        output = os.path.join(tmp_dir, "results.jsonl")
+
+        bulk_ingest.iter_resume_sources = sources_with_a_crash
+        try:
+            stats = ingestor.run(resumes, output)
+            assert stats["processed"] == 11 and stats["failed"] >= 1
+            with open(output) as f:
+                rows = {row["file"]: row for row in map(json.loads, f)}
+            failed = {name for name, row in rows.items() if row.get("error")}
+            assert "crash.pdf" in failed and stats["failed"] == len(failed)
+            assert all(rows[name]["error"].startswith("Parser process died") for name in failed)
+            # Only files queued behind it in the dead pool (at most 4 in flight) fail with it;
+            # the rest are parsed in a new pool
+            assert failed <= {"crash.pdf", "after/resume_0.pdf", "after/resume_1.pdf", "after/resume_2.pdf"}
+            for i, skills in enumerate(RESUME_SKILLS):
+                for name in (f"resume_{i}.pdf", f"after/resume_{i}.pdf"):
+                    assert name in failed or set(rows[name]["extracted_skills"]) == set(skills)
+
+            # The crash is recorded, so a rerun doesn't hit it again
+            assert ingestor.run(resumes, output)["skipped"] == 11
+        finally:
+            bulk_ingest.iter_resume_sources = read_sources
+
+
+if __name__ == "__main__":
+    test_bulk_ingest_jsonl_and_resume()
+    test_bulk_ingest_zip_to_parquet()
+    test_worker_crash_fails_its_files_and_the_run_goes_on()
+    print("Bulk ingest tests passed.")
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import time
+
+from cache import STALE_TEMP_SECONDS, DiskLRUCache
+
+
+def test_disk_cache_lru_eviction_by_size():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        entry = {"text": "x" * 90, "skills": ["python"]}
+        entry_size = len(json.dumps(entry))
+        cache = DiskLRUCache("test_disk", tmp_dir, max_bytes=3 * entry_size)
+
+        for key in ("a", "b", "c"):
+            cache.set(key, entry)
+        assert cache.get("a") == entry  # 'a' is now the most recently used
+        cache.set("d", entry)
+
+        assert cache.get("b") is None  # least recently used, evicted
+        assert all(cache.get(key) == entry for key in ("a", "c", "d"))
+        assert sorted(os.listdir(tmp_dir)) == ["a.json", "c.json", "d.json"]
+        assert cache.stats()["bytes"] == 3 * entry_size
+
+
+def test_disk_cache_survives_restart():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        DiskLRUCache("test_disk", tmp_dir).set("abc", {"skills": ["sql"]})
+        open(os.path.join(tmp_dir, "partial.tmp"), "w").close()
+        stale = time.time() - STALE_TEMP_SECONDS - 60
+        os.utime(os.path.join(tmp_dir, "partial.tmp"), (stale, stale))
+        # Another worker's write in progress
+        open(os.path.join(tmp_dir, "writing.tmp"), "w").close()
+
+        reopened = DiskLRUCache("test_disk", tmp_dir)
+        assert reopened.get("abc") == {"skills": ["sql"]}
+        assert len(reopened) == 1
+        assert "partial.tmp" not in os.listdir(tmp_dir)
+        assert "writing.tmp" in os.listdir(tmp_dir)
+
+
+def test_failed_write_leaves_no_temp_file():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = DiskLRUCache("test_disk", tmp_dir)
+        # The entry's path is a directory: the rename fails
+        os.mkdir(os.path.join(tmp_dir, "abc.json"))
+        try:
+            cache.set("abc", {"skills": ["sql"]})
+        except OSError:
+            pass
+        else:
+            raise AssertionError("expected OSError")
+        assert os.listdir(tmp_dir) == ["abc.json"]
+        assert len(cache) == 0
+
+
+if __name__ == "__main__":
+    test_disk_cache_lru_eviction_by_size()
+    test_disk_cache_survives_restart()
+    test_failed_write_leaves_no_temp_file()
+    print("Cache tests passed.")
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+
+from chatbot import CareerChatbot
+from intents import IntentRouter
+from matcher import JobMatcher
+from stub_llm_server import StubGenerativeService, start_stub_server
+
+
+async def _with_stub(test, **stub_options):
+    stub = StubGenerativeService(**stub_options)
+    server, port = await start_stub_server(stub)
+    try:
+        return await test(stub, f"127.0.0.1:{port}")
+    finally:
+        await server.stop(None)
+
+
+def test_streams_chunks_from_stub_server():
+    async def test(stub, endpoint):
+        bot = CareerChatbot(api_endpoint=endpoint)
+        chunks = [chunk async for chunk in bot.stream_response("Which roles fit python and sql?")]
+        assert chunks == stub.chunks
+        assert await bot.get_response_async("And data roles?") == "".join(stub.chunks)
+        assert stub.calls == 2
+
+    asyncio.run(_with_stub(test, first_chunk_delay=0.01, chunk_delay=0.01))
+
+
+def test_blocking_path_uses_the_same_endpoint():
+    async def test(stub, endpoint):
+        bot = CareerChatbot(api_endpoint=endpoint)
+        # /chat answers through the sync client, off the loop serving the stub
+        answer = await asyncio.to_thread(bot.get_response, "Which roles fit python and sql?")
+        assert answer == "".join(stub.chunks)
+        assert stub.calls == 1
+        assert "Which roles fit python and sql?" in stub.last_request.contents[0].parts[0].text
+
+    asyncio.run(_with_stub(test, first_chunk_delay=0.01, chunk_delay=0.0))
+
+
+def test_caps_concurrent_upstream_calls():
+    async def test(stub, endpoint):
+        bot = CareerChatbot(api_endpoint=endpoint, max_concurrency=2)
+        responses = await asyncio.gather(*[bot.get_response_async(f"question {i}") for i in range(6)])
+        assert all(response == "".join(stub.chunks) for response in responses)
+        assert stub.calls == 6
+        assert stub.max_active == 2
+
+    asyncio.run(_with_stub(test, first_chunk_delay=0.05, chunk_delay=0.0))
+
+
+def test_local_intents_skip_the_model():
+    async def test(stub, endpoint):
+        bot = CareerChatbot(api_endpoint=endpoint)
+        assert (await bot.get_response_async("Where should I start?")).startswith("Tell me your top 3 skills")
+        assert stub.calls == 0
+
+    asyncio.run(_with_stub(test))
+
+
+def test_identical_questions_are_served_from_cache():
+    async def test(stub, endpoint):
+        bot = CareerChatbot(api_endpoint=endpoint)
+        first = await bot.get_response_async("How do I prepare for interviews?", {"skills": ["python"]})
+        # Case and punctuation don't matter; a different context does
+        again = await bot.get_response_async("how do i prepare for interviews", {"skills": ["python"]})
+        assert first == again == "".join(stub.chunks)
+        assert stub.calls == 1
+        await bot.get_response_async("How do I prepare for interviews?", {"skills": ["java"]})
+        assert stub.calls == 2
+        assert bot.stats()["response_cache"]["hits"] == 1
+
+    asyncio.run(_with_stub(test, first_chunk_delay=0.01, chunk_delay=0.0))
+
+
+def test_dataset_intents_answer_without_the_model():
+    matcher = JobMatcher()
+    role = matcher.df['job_role'].iloc[0]
+    required = [skill for skill, _ in matcher.role_skills(role)]
+
+    async def test(stub, endpoint):
+        bot = CareerChatbot(api_endpoint=endpoint, matcher_provider=lambda: matcher)
+        answer = await bot.get_response_async(f"What skills do I need for {role}?", {"skills": required[:1]})
+        assert f"Key Skills for {role}" in answer
+        assert f"You Already Have → {required[0]}" in answer
+
+        answer = await bot.get_response_async("Which roles fit python and sql?")
+        top = matcher.match_jobs(["python", "sql"], k=3)[0]
+        assert f"{top['job_role']} ({top['match_score']}%)" in answer
+        assert stub.calls == 0
+
+    asyncio.run(_with_stub(test))
+
+
+def test_intents_run_off_the_event_loop():
+    threads = []
+
+    def record_thread(message, context, matcher):
+        threads.append(threading.current_thread())
+        return "local answer"
+
+    async def test():
+        bot = CareerChatbot(intent_router=IntentRouter([("record", record_thread)]))
+        assert await bot.get_response_async("anything") == "local answer"
+        assert threads and threads[0] is not threading.current_thread()
+
+    asyncio.run(test())
+
+
+if __name__ == "__main__":
+    test_streams_chunks_from_stub_server()
+    test_blocking_path_uses_the_same_endpoint()
+    test_caps_concurrent_upstream_calls()
+    test_local_intents_skip_the_model()
+    test_identical_questions_are_served_from_cache()
+    test_dataset_intents_answer_without_the_model()
+    test_intents_run_off_the_event_loop()
+    print("Chatbot tests passed.")
@@ -0,0 +1,101 @@
+import random
+import time
+
+from cohort import analyze_cohort
+from matcher import JobMatcher
+
+
+def _required(matcher, role, min_share):
+    skills = matcher.role_profile(role)["skills"]
+    return {s["skill"] for i, s in enumerate(skills) if i == 0 or s["share"] >= min_share}
+
+
+def _cohort(matcher, n, seed=7):
+    rng = random.Random(seed)
+    vocab = list(matcher.skill_vocab)
+    return [rng.sample(vocab, rng.randint(0, min(8, len(vocab)))) + ["Basket Weaving"] * (i % 3 == 0) for i in range(n)]
+
+
+def test_matches_a_per_candidate_count():
+    matcher = JobMatcher()
+    cohort = _cohort(matcher, 200)
+    roles = [p["role"] for p in matcher.role_profiles.values()]
+
+    result = analyze_cohort(matcher, cohort, min_share=0.3, top_n=1000, per_candidate=True)
+    assert result["candidates"] == 200 and result["roles"] == len(roles)
+    assert result["unknown_skills"] == 67  # "Basket Weaving" every third candidate
+
+    totals = {}
+    for role_result in result["role_gaps"]:
+        required = _required(matcher, role_result["role"], 0.3)
+        missing = {}
+        coverages = []
+        for skills in cohort:
+            have = {s.lower() for s in skills}
+            coverages.append(len(required & have) / len(required))
+            for skill in required - have:
+                missing[skill] = missing.get(skill, 0) + 1
+                totals[skill] = totals.get(skill, 0) + 1
+        assert role_result["required_skills"] == len(required)
+        assert role_result["avg_coverage"] == round(sum(coverages) / len(cohort), 4)
+        assert role_result["fully_qualified"] == sum(c == 1 for c in coverages)
+        assert {m["skill"]: m["candidates_missing"] for m in role_result["top_missing"]} == missing
+
+    cohort_missing = result["cohort_top_missing"]
+    assert {m["skill"]: m["candidates_missing"] for m in cohort_missing} == totals
+    counts = [m["candidates_missing"] for m in cohort_missing]
+    assert counts == sorted(counts, reverse=True)
+
+    # Best role: the highest coverage of any role
+    for skills, entry in zip(cohort, result["per_candidate"]):
+        have = {s.lower() for s in skills}
+        best = max(len(_required(matcher, r, 0.3) & have) / len(_required(matcher, r, 0.3)) for r in roles)
+        assert entry["coverage"] == round(best, 4)
+
+
+def test_targets_assess_each_candidate_against_its_own_role():
+    matcher = JobMatcher()
+    roles = [p["role"] for p in matcher.role_profiles.values()][:3]
+    cohort = _cohort(matcher, 60, seed=3)
+    targets = [roles[i % 3].upper() for i in range(60)]
+
+    result = analyze_cohort(matcher, cohort, targets=targets, top_n=1000)
+    assert [r["role"] for r in result["role_gaps"]] == roles
+    for role_result in result["role_gaps"]:
+        assert role_result["candidates"] == 20
+        required = _required(matcher, role_result["role"], 0.5)
+        missing = {}
+        for skills, target in zip(cohort, targets):
+            if target.lower() == role_result["role"].lower():
+                for skill in required - {s.lower() for s in skills}:
+                    missing[skill] = missing.get(skill, 0) + 1
+        assert {m["skill"]: m["candidates_missing"] for m in role_result["top_missing"]} == missing
+
+
+def test_unknown_roles_are_rejected():
+    matcher = JobMatcher()
+    for kwargs in ({"roles": ["Astronaut"]}, {"targets": ["Astronaut"]}, {"targets": []}):
+        try:
+            analyze_cohort(matcher, [["python"]], **kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {kwargs}")
+
+
+def test_large_cohort_is_fast():
+    matcher = JobMatcher()
+    cohort = _cohort(matcher, 5000, seed=11)
+    start = time.perf_counter()
+    result = analyze_cohort(matcher, cohort, per_candidate=True)
+    elapsed = time.perf_counter() - start
+    print(f"5000 candidates x {result['roles']} roles: {elapsed * 1000:.0f} ms")
+    assert len(result["per_candidate"]) == 5000
+    assert elapsed < 5
+
+
+if __name__ == "__main__":
+    test_matches_a_per_candidate_count()
+    test_targets_assess_each_candidate_against_its_own_role()
+    test_unknown_roles_are_rejected()
+    test_large_cohort_is_fast()
+    print("All cohort tests passed!")
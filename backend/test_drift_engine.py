@@ -0,0 +1,92 @@
+import numpy as np
+from scipy import sparse
+from scipy.stats import ks_2samp
+
+from drift import DriftMonitor
+
+
+def _dense(data):
+    return data.toarray() if sparse.issparse(data) else data
+
+
+def _assert_matches_scipy(reference, new_data):
+    monitor = DriftMonitor(reference, correction="none")
+    statistics = monitor.ks_statistics(new_data)
+    p_values = monitor.ks_p_values(statistics, new_data.shape[0])
+
+    ref, new = _dense(reference), _dense(new_data)
+    for j in range(ref.shape[1]):
+        expected = ks_2samp(ref[:, j], new[:, j])
+        assert abs(statistics[j] - expected.statistic) < 1e-12
+        assert abs(p_values[j] - expected.pvalue) < 1e-9
+
+
+def test_vectorized_ks_matches_scipy_on_sparse_data():
+    rng = np.random.default_rng(7)
+    for seed in range(10):
+        reference = sparse.random(40, 25, density=rng.uniform(0.05, 0.9), random_state=seed, format="csr")
+        new_data = sparse.random(12, 25, density=rng.uniform(0.05, 0.9), random_state=seed + 50, format="csr")
+        # Rounded values so that ties between and within samples occur
+        reference.data = np.round(reference.data, 1)
+        new_data.data = np.round(new_data.data, 1)
+        _assert_matches_scipy(reference, new_data)
+
+
+def test_vectorized_ks_matches_scipy_on_dense_data():
+    rng = np.random.default_rng(3)
+    _assert_matches_scipy(rng.normal(0, 1, (60, 6)).round(1), rng.normal(0.5, 1, (20, 6)).round(1))
+
+
+def test_corrections():
+    rng = np.random.default_rng(1)
+    reference = rng.normal(0, 1, (200, 50))
+    shifted = rng.normal(0, 1, (100, 50))
+    shifted[:, :3] += 2  # three features really drift
+
+    for correction in ("none", "bonferroni", "fdr"):
+        report = DriftMonitor(reference, correction=correction).check_drift(shifted)
+        assert report["is_drift"]
+        assert report["drifted_feature_count"] >= 3
+        print(f"{correction}: {report['drifted_feature_count']} drifted features")
+
+
+def test_reference_memory_scales_with_nonzeros():
+    reference = sparse.random(20000, 5000, density=0.001, random_state=0, format="csr")
+    reference.data[:10] = 0  # explicit zeros count as zeros
+    monitor = DriftMonitor(reference)
+
+    assert monitor.reference.values.size == reference.count_nonzero()
+    assert monitor.reference.zero_counts.sum() == 20000 * 5000 - reference.count_nonzero()
+    # No row indices kept: values + indptr + zero counts only, far below the dense size
+    assert monitor.reference.nbytes < 8 * reference.count_nonzero() + 8 * 2 * 5001
+    assert monitor.reference.nbytes < 20000 * 5000 * 8 / 100
+
+
+def test_streaming_windows():
+    rng = np.random.default_rng(5)
+    reference = sparse.random(300, 20, density=0.2, random_state=1, format="csr")
+    monitor = DriftMonitor(reference, window_size=100, min_window_size=100)
+
+    closed = [monitor.observe(rng.random((1, 20)) * (rng.random((1, 20)) < 0.2)) for _ in range(250)]
+    assert closed.count(True) == 2  # after rows 100 and 200
+    assert monitor.wait_for_evaluation()
+    assert len(monitor._window) == 100  # bounded by window_size
+
+    status = monitor.window_status()
+    assert status["windows_evaluated"] >= 1
+    assert status["latest_report"]["window_samples"] == 100
+
+    # The evaluated window is the last 100 observed rows
+    window = monitor._window_matrix()
+    expected = monitor.check_drift(window)
+    assert window.shape == (100, 20)
+    assert expected["drifted_feature_count"] == monitor.check_drift(window.toarray())["drifted_feature_count"]
+
+
+if __name__ == "__main__":
+    test_vectorized_ks_matches_scipy_on_sparse_data()
+    test_vectorized_ks_matches_scipy_on_dense_data()
+    test_corrections()
+    test_reference_memory_scales_with_nonzeros()
+    test_streaming_windows()
+    print("Drift engine tests passed.")
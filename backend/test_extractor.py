@@ -0,0 +1,96 @@
+import io
+import random
+import re
+
+import fitz  # PyMuPDF
+
+from extractor import ResumeExtractor
+
+
+def _regex_skills(skills, text):
+    # The old per-skill loop: one \b...\b search per skill
+    text_lower = text.lower()
+    return {s for s in skills if re.search(r'\b' + re.escape(s) + r'\b', text_lower)}
+
+
+def test_symbols_and_multi_word_skills():
+    extractor = ResumeExtractor(known_skills={"C++", "Node.js", "C", "Java", "Machine Learning", ".NET", "R"})
+    text = "Skills: C++, Node.js and machine learning. Built .NET services; my score was high. Javascript too."
+    skills = extractor.extract_skills_from_text(text)
+
+    assert set(skills) == {"c++", "c", "node.js", "machine learning", ".net"}
+    assert skills.index("c++") < skills.index("node.js")  # order of first occurrence
+    assert "java" not in skills and "r" not in skills  # no 'java' in 'javascript', no 'r' in 'score'
+
+
+def test_matches_regex_on_word_skills():
+    rng = random.Random(0)
+    vocab = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(60)}
+    vocab |= {"a b", "ab c", "b_c"}
+    extractor = ResumeExtractor(known_skills=vocab)
+
+    for _ in range(2000):
+        text = "".join(rng.choice("abc +.#_-\n") for _ in range(rng.randint(0, 40)))
+        assert set(extractor.extract_skills_from_text(text)) == _regex_skills(vocab, text), text
+
+
+def test_empty_vocabulary():
+    assert ResumeExtractor().extract_skills_from_text("python sql") == []
+    assert ResumeExtractor(known_skills={""}).extract_skills_from_text("python sql") == []
+
+
+def test_parses_pdf_from_memory():
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Python and SQL")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+
+    extractor = ResumeExtractor(known_skills={"python", "sql"})
+    for source in (pdf_bytes, io.BytesIO(pdf_bytes)):
+        assert set(extractor.parse_resume(source)["skills"]) == {"python", "sql"}
+
+
+def test_page_and_char_caps():
+    doc = fitz.open()
+    for i in range(5):
+        doc.new_page().insert_text((72, 72), f"page {i} skill{i}")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    skills = {f"skill{i}" for i in range(5)}
+
+    full = ResumeExtractor(known_skills=skills, max_pages=None, max_chars=None).parse_resume(pdf_bytes)
+    assert full["skills"] == [f"skill{i}" for i in range(5)]
+
+    by_pages = ResumeExtractor(known_skills=skills, max_pages=2).parse_resume(pdf_bytes)
+    assert by_pages["skills"] == ["skill0", "skill1"]
+
+    page_length = len(ResumeExtractor(max_pages=1).extract_text_from_pdf(pdf_bytes))
+    by_chars = ResumeExtractor(known_skills=skills, max_chars=page_length + 9)
+    assert len(by_chars.extract_text_from_pdf(pdf_bytes)) == page_length + 9
+    assert by_chars.parse_resume(pdf_bytes)["skills"] == ["skill0"]  # 'skill1' is cut off
+
+
+def test_chunked_scan_matches_single_pass():
+    rng = random.Random(1)
+    vocab = {"".join(rng.choice("abc+.") for _ in range(rng.randint(1, 5))) for _ in range(80)}
+    automaton = ResumeExtractor(known_skills=vocab).skill_automaton
+
+    for _ in range(2000):
+        text = "".join(rng.choice("abc +._") for _ in range(rng.randint(0, 50)))
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 6)))) + [len(text)]
+        scanner = automaton.scanner()
+        previous = 0
+        for cut in cuts:
+            scanner.feed(text[previous:cut])
+            previous = cut
+        assert scanner.finish() == automaton.find_all(text), (text, cuts)
+
+
+if __name__ == "__main__":
+    test_symbols_and_multi_word_skills()
+    test_matches_regex_on_word_skills()
+    test_empty_vocabulary()
+    test_parses_pdf_from_memory()
+    test_page_and_char_caps()
+    test_chunked_scan_matches_single_pass()
+    print("Extractor tests passed.")
@@ -0,0 +1,96 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from forecast import SkillDemandStore, forecast_skills, holt_forecast
+
+
+def _postings(day, skills_per_posting):
+    return pd.DataFrame({"required_skills": skills_per_posting, "posted_at": day})
+
+
+def test_ingest_updates_only_the_days_it_touches():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SkillDemandStore(tmp)
+        assert store.ingest(_postings("2024-05-01", ["Python, SQL", "python, Python", "SQL"])) == {"2024-05-01": 3}
+        first_day = os.path.join(tmp, "day=2024-05-01.parquet")
+        written_at = os.stat(first_day).st_mtime_ns
+
+        # No posted_at column: stamped with the given date
+        store.ingest(pd.DataFrame({"required_skills": ["Go, SQL"]}), date="2024-05-03")
+        assert os.stat(first_day).st_mtime_ns == written_at
+
+        skills, periods, counts = store.matrix("D")
+        assert skills == ["go", "python", "sql"]
+        assert periods == ["2024-05-01", "2024-05-02", "2024-05-03"]
+        # A skill listed twice in one posting counts once; the empty day is zero
+        assert counts.tolist() == [[0, 0, 1], [2, 0, 0], [2, 0, 1]]
+
+        # Another process (a fresh store on the same directory) sees the same counters
+        store.ingest(_postings("2024-05-01", ["go"]))
+        assert SkillDemandStore(tmp).matrix("D")[2].tolist() == [[1, 0, 1], [2, 0, 0], [2, 0, 1]]
+
+
+def test_holt_fits_every_series_in_one_pass():
+    t = np.arange(20, dtype=float)
+    series = np.stack([5 + 2 * t, np.full(20, 7.0), 30 - 2 * t, np.zeros(20)])
+    forecast, level, trend, rmse = holt_forecast(series, horizon=3)
+
+    assert np.allclose(forecast[0], [45, 47, 49])  # linear trend continued
+    assert np.allclose(forecast[1], 7)             # flat stays flat
+    assert np.allclose(forecast[2], 0)             # decline clipped at zero (would be -12...)
+    assert np.allclose(forecast[3], 0)
+    assert np.allclose(rmse[:2], 0)
+    # Same answer as fitting each series alone
+    for i in range(len(series)):
+        assert np.allclose(holt_forecast(series[i:i + 1], horizon=3)[0], forecast[i])
+
+
+def test_forecast_ranks_weekly_demand():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SkillDemandStore(tmp)
+        for week in range(8):
+            day = (pd.Timestamp("2024-01-01") + pd.Timedelta(weeks=week)).strftime("%Y-%m-%d")
+            store.ingest(_postings(day, ["rust"] * (week + 1) + ["cobol"] * (8 - week) + ["sql"] * 5))
+
+        result = forecast_skills(store, horizon=2, period="W", top=2)
+        assert result["history_periods"][0] == "2024-01-01" and len(result["history_periods"]) == 8
+        assert result["forecast_periods"] == ["2024-02-26", "2024-03-04"]
+        assert [s["skill"] for s in result["skills"]] == ["rust", "sql"]
+        assert result["skills"][0]["growth"] > 0
+
+        rising = forecast_skills(store, horizon=2, period="W", sort="growth")
+        assert [s["skill"] for s in rising["skills"]] == ["rust", "sql", "cobol"]
+        only = forecast_skills(store, horizon=2, skills=["COBOL"])
+        assert [s["skill"] for s in only["skills"]] == ["cobol"] and only["skills"][0]["trend"] < 0
+
+
+def test_running_period_is_left_out_of_the_fit():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SkillDemandStore(tmp)
+        # 10 postings a day from Monday 2024-03-04 through Wednesday 2024-04-03
+        for day in pd.date_range("2024-03-04", "2024-04-03"):
+            store.ingest(_postings(day.strftime("%Y-%m-%d"), ["python"] * 10))
+
+        # Thursday cutoff: the week of 2024-04-01 only has 3 of its 7 days
+        result = forecast_skills(store, horizon=2, period="W", as_of="2024-04-04")
+        assert result["history_periods"] == ["2024-03-04", "2024-03-11", "2024-03-18", "2024-03-25"]
+        assert result["partial_period"] == "2024-04-01"
+        assert result["forecast_periods"] == ["2024-04-01", "2024-04-08"]
+        python = result["skills"][0]
+        assert python["history"] == [70, 70, 70, 70]
+        assert np.allclose(python["forecast"], 70) and python["trend"] == 0
+
+        # Once the week is over it is history like any other
+        done = forecast_skills(store, horizon=2, period="W", as_of="2024-04-08")
+        assert done["partial_period"] is None and done["history_periods"][-1] == "2024-04-01"
+
+
+if __name__ == "__main__":
+    test_ingest_updates_only_the_days_it_touches()
+    test_holt_fits_every_series_in_one_pass()
+    test_forecast_ranks_weekly_demand()
+    test_running_period_is_left_out_of_the_fit()
+    print("Forecast tests passed.")
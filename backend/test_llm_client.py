@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import grpc
+
+from chatbot import CareerChatbot
+from llm_client import CircuitBreaker, LLMClient, RateLimited, TokenBucket
+from stub_llm_server import StubGenerativeService, start_stub_server
+
+
+async def _with_stub(test, **stub_options):
+    stub = StubGenerativeService(first_chunk_delay=0.01, chunk_delay=0.0, **stub_options)
+    server, port = await start_stub_server(stub)
+    try:
+        return await test(stub, f"127.0.0.1:{port}")
+    finally:
+        await server.stop(None)
+
+
+def _bot(endpoint, **llm_options):
+    bot = CareerChatbot(api_endpoint=endpoint)
+    options = {"backoff_base": 0.01, "backoff_max": 0.05}
+    options.update(llm_options)
+    bot.llm = LLMClient(bot._stream_model, bot._call_model, **options)
+    return bot
+
+
+def test_token_bucket_spaces_out_requests():
+    bucket = TokenBucket(rate=10.0, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert 0.09 < bucket.reserve() <= 0.1
+    # Waiting past max_wait is refused without taking a token
+    try:
+        bucket.reserve(max_wait=0.1)
+        assert False, "expected RateLimited"
+    except RateLimited:
+        pass
+    assert 0.15 < bucket.reserve() <= 0.2
+
+
+def test_breaker_opens_and_probes_after_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_rate_limited_probe_does_not_wedge_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    calls = []
+    # One token, refilled every 10 minutes: the half-open probe finds the bucket empty
+    client = LLMClient(None, lambda prompt: calls.append(prompt) or "ok", requests_per_minute=0.1, burst=1,
+                       max_rate_wait=0.0, breaker=breaker)
+    client.bucket.tokens = 0.0
+    breaker.record_failure()
+    time.sleep(0.06)
+    try:
+        client.generate("hello")
+        raise AssertionError("expected RateLimited")
+    except RateLimited:
+        pass
+    assert breaker.state == "half_open" and not calls
+    # The unused probe was released: the next call probes at once
+    client.bucket.tokens = 1.0
+    assert client.generate("hello") == "ok" and breaker.state == "closed"
+
+    async def streamed():
+        async def stream_call(prompt):
+            yield "ok"
+        client.stream_call = stream_call
+        breaker.record_failure()
+        await asyncio.sleep(0.06)
+        client.bucket.tokens = 0.0
+        try:
+            async for _ in client.stream("hi"):
+                pass
+            raise AssertionError("expected RateLimited")
+        except RateLimited:
+            pass
+        assert breaker.state == "half_open"
+        client.bucket.tokens = 1.0
+        assert [chunk async for chunk in client.stream("hi")] == ["ok"] and breaker.state == "closed"
+
+    asyncio.run(streamed())
+
+
+def test_silent_probe_expires():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()
+    # The probe never reported back (e.g. its caller was cancelled)
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_transient_errors_are_retried():
+    async def test(stub, endpoint):
+        bot = _bot(endpoint, max_retries=3)
+        assert await bot.get_response_async("How do I negotiate salary?") == "".join(stub.chunks)
+        assert stub.calls == 3
+        assert bot.llm.breaker.state == "closed"
+
+    asyncio.run(_with_stub(test, fail_first=2))
+
+
+def test_bad_requests_are_not_retried():
+    async def test(stub, endpoint):
+        bot = _bot(endpoint, max_retries=3)
+        assert (await bot.get_response_async("How do I negotiate salary?")).startswith("❌ **AI Error**")
+        assert stub.calls == 1
+
+    asyncio.run(_with_stub(test, fail_first=1, fail_code=grpc.StatusCode.INVALID_ARGUMENT))
+
+
+def test_open_breaker_falls_back_to_local_answers():
+    async def test(stub, endpoint):
+        bot = _bot(endpoint, max_retries=1, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+        assert (await bot.get_response_async("How do I negotiate salary?")).startswith("❌ **AI Error**")
+        assert stub.calls == 2 and bot.llm.breaker.state == "open"
+
+        # Fails fast without calling the API
+        answer = await bot.get_response_async("Any tips for interviews?", {"skills": ["python"]})
+        assert answer.startswith("⚠️ The AI mentor is busy")
+        assert stub.calls == 2
+
+    asyncio.run(_with_stub(test, fail_first=100))
+
+
+def test_identical_prompts_share_one_call():
+    async def test(stub, endpoint):
+        bot = _bot(endpoint)
+        answers = await asyncio.gather(*[bot.get_response_async("How do I switch careers?") for _ in range(5)])
+        assert answers == ["".join(stub.chunks)] * 5
+        assert stub.calls == 1
+
+    asyncio.run(_with_stub(test))
+
+
+if __name__ == "__main__":
+    test_token_bucket_spaces_out_requests()
+    test_breaker_opens_and_probes_after_reset_timeout()
+    test_rate_limited_probe_does_not_wedge_the_breaker()
+    test_silent_probe_expires()
+    test_transient_errors_are_retried()
+    test_bad_requests_are_not_retried()
+    test_open_breaker_falls_back_to_local_answers()
+    test_identical_prompts_share_one_call()
+    print("LLM client tests passed.")
@@ -0,0 +1,133 @@
+import tempfile
+
+import numpy as np
+import matcher as matcher_module
+from matcher import JobMatcher, top_k_indices
+
+
+def test_top_k_indices_keeps_dataset_order_on_ties():
+    scores = np.array([10.0, 50.0, 50.0, 0.0, 50.0, 20.0])
+
+    assert top_k_indices(scores, 2).tolist() == [1, 2]
+    assert top_k_indices(scores, 4).tolist() == [1, 2, 4, 5]
+    # Same order as a stable sort over every job
+    full_sort = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+    assert top_k_indices(scores, 10).tolist() == full_sort
+    assert top_k_indices(scores, 0).tolist() == []
+
+
+def test_match_jobs_top_k():
+    matcher = JobMatcher()
+    skills = ["python", "sql", "machine learning"]
+
+    matches = matcher.match_jobs(skills, k=3)
+    assert len(matches) == 3
+    scores = [m['match_score'] for m in matches]
+    assert scores == sorted(scores, reverse=True)
+
+    # Default stays at the top 5, and larger k extends the same ranking
+    assert len(matcher.match_jobs(skills)) == 5
+    assert [m['job_role'] for m in matcher.match_jobs(skills, k=10)][:3] == [m['job_role'] for m in matches]
+    print(f"Top match: {matches[0]['job_role']} ({matches[0]['match_score']}%)")
+
+
+def test_skill_index_matches_required_skills():
+    matcher = JobMatcher()
+    python_id = matcher.skill_ids["python"]
+
+    # Every job listed under 'python' in the inverted index really requires it
+    jobs = matcher.candidate_jobs({python_id})
+    expected = [i for i, s in enumerate(matcher.df['required_skills']) if "python" in [x.strip() for x in s.split(',')]]
+    assert jobs.tolist() == expected
+
+    matches = matcher.match_jobs(["Python", "nosuchskill"], k=20, require_skill_overlap=True)
+    assert len(matches) == len(expected)
+    for m in matches:
+        assert m['matched_skills'] == ["python"]
+        assert set(m['missing_skills']) == set(m['required_skills']) - {"python"}
+
+
+def test_match_jobs_batch_matches_single_requests():
+    matcher = JobMatcher()
+    skills_batch = [["python", "sql"], ["java", "spring boot"], [], ["nosuchskill"], ["react", "css", "html"]]
+
+    batch = matcher.match_jobs_batch(skills_batch, k=5, chunk_size=2)
+    assert len(batch) == len(skills_batch)
+    for skills, matches in zip(skills_batch, batch):
+        assert matches == matcher.match_jobs(skills, k=5)
+
+    # Skill-overlap filtering: same answers in batch, and the same ranking as scoring every job
+    batch = matcher.match_jobs_batch(skills_batch, k=5, chunk_size=2, require_skill_overlap=True)
+    for skills, matches in zip(skills_batch, batch):
+        assert matches == matcher.match_jobs(skills, k=5, require_skill_overlap=True)
+        overlapping = [m for m in matcher.match_jobs(skills, k=len(matcher.df)) if m['matched_skills']]
+        assert matches == overlapping[:5]
+
+    # Default chunks hold at most MATCH_BATCH_CHUNK_CELLS similarities, whatever the catalog size
+    cells = matcher_module.MATCH_BATCH_CHUNK_CELLS
+    try:
+        matcher_module.MATCH_BATCH_CHUNK_CELLS = 2 * len(matcher.df)
+        chunk_sizes = []
+        vectorize = matcher.vectorize_skills
+        matcher.vectorize_skills = lambda chunk: chunk_sizes.append(len(chunk)) or vectorize(chunk)
+        assert matcher.match_jobs_batch(skills_batch, k=5) == [matcher.match_jobs(s, k=5) for s in skills_batch]
+        assert chunk_sizes == [2, 2, 1]
+    finally:
+        matcher_module.MATCH_BATCH_CHUNK_CELLS = cells
+
+
+def test_match_cache_keyed_on_normalized_skills():
+    matcher = JobMatcher()
+
+    first = matcher.match_jobs(["Python", "SQL", "excel"])
+    hits = matcher.match_cache.hits
+    again = matcher.match_jobs([" excel", "sql", "python", "Python"])
+    assert again == first
+    assert matcher.match_cache.hits == hits + 1
+
+    # k is part of the key
+    assert len(matcher.match_jobs(["python", "sql", "excel"], k=2)) == 2
+    assert matcher.match_cache.hits == hits + 1
+
+    # Changing a returned result doesn't change what the next hit returns
+    expected = [dict(m, missing_skills=list(m['missing_skills'])) for m in first]
+    for result in (first, again):
+        result[0]['match_score'] = -1
+        result[0]['missing_skills'].append("tampered")
+        result.pop()
+    assert matcher.match_jobs(["python", "sql", "excel"]) == expected
+
+
+def test_explain_match_agrees_with_match_jobs():
+    matcher = JobMatcher()
+    skills = ["Python", " sql", "python", "SQL ", "excel"]
+    top = matcher.match_jobs(skills, k=1)[0]
+
+    explained = matcher.explain_match(skills, top['job_role'])
+    assert explained == matcher.explain_match(["excel", "python", "sql"], top['job_role'])
+    # Contributions add up to the cosine similarity match_jobs scored
+    total = sum(item['value'] for item in explained['explanation'])
+    assert abs(total * 100 - top['match_score']) < 0.1
+
+
+def test_artifacts_roundtrip():
+    with tempfile.TemporaryDirectory() as artifact_dir:
+        fitted = JobMatcher(artifact_dir=artifact_dir)
+        loaded = JobMatcher(artifact_dir=artifact_dir)
+
+        # Second instance memory-maps the saved arrays instead of refitting
+        assert isinstance(loaded.job_skill_ids, np.memmap)
+        skills = ["python", "sql", "docker"]
+        assert loaded.match_jobs(skills, k=10) == fitted.match_jobs(skills, k=10)
+        assert loaded.get_all_skills() == fitted.get_all_skills()
+
+
+if __name__ == "__main__":
+    test_top_k_indices_keeps_dataset_order_on_ties()
+    test_match_jobs_top_k()
+    test_skill_index_matches_required_skills()
+    test_match_jobs_batch_matches_single_requests()
+    test_match_cache_keyed_on_normalized_skills()
+    test_explain_match_agrees_with_match_jobs()
+    test_artifacts_roundtrip()
+    print("Match engine tests passed.")
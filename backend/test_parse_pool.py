@@ -0,0 +1,152 @@
+import asyncio
+import os
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+from extractor import ResumeExtractor
+from parse_pool import ParsePoolFull, ParseTimeout, ResumeParsePool
+
+
+def _write_pdf(path, text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_parses_in_worker_process():
+    extractor = ResumeExtractor(known_skills={"python", "sql", "c++", "java"})
+    pool = ResumeParsePool(max_workers=1, max_queue=4, timeout=60)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "resume.pdf")
+        _write_pdf(pdf_path, "Experienced in Python, SQL and C++.")
+
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+
+        async def parse_twice():
+            # From a path (spilled upload) and from memory
+            return await asyncio.gather(pool.parse(pdf_path, extractor), pool.parse(pdf_bytes, extractor))
+
+        try:
+            results = asyncio.run(parse_twice())
+        finally:
+            pool.shutdown()
+
+    for result in results:
+        assert set(result["skills"]) == {"python", "sql", "c++"}
+        assert result["text"].startswith("Experienced in Python")
+
+
+def test_rejects_when_queue_is_full():
+    extractor = ResumeExtractor(known_skills={"python"})
+    pool = ResumeParsePool(max_workers=1, max_queue=0, timeout=60)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "resume.pdf")
+        _write_pdf(pdf_path, "python")
+
+        async def parse_two_at_once():
+            return await asyncio.gather(
+                pool.parse(pdf_path, extractor), pool.parse(pdf_path, extractor), return_exceptions=True
+            )
+
+        try:
+            results = asyncio.run(parse_two_at_once())
+        finally:
+            pool.shutdown()
+
+    assert results[0]["skills"] == ["python"]
+    assert isinstance(results[1], ParsePoolFull)
+
+
+class HangingSource:
+    # Binary file object whose read() never returns in time, like a PDF that hangs PyMuPDF
+    def read(self):
+        time.sleep(600)
+        return b""
+
+
+class SlowSource:
+    # PDF bytes read slowly; each read leaves a mark so the test knows the job is running
+    def __init__(self, path, marker, delay):
+        self.path, self.marker, self.delay = path, marker, delay
+
+    def read(self):
+        with open(self.marker, "a") as f:
+            f.write("x")
+        time.sleep(self.delay)
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+def test_hung_job_does_not_hold_the_pool():
+    extractor = ResumeExtractor(known_skills={"python"})
+    pool = ResumeParsePool(max_workers=1, max_queue=0, timeout=2)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "resume.pdf")
+        _write_pdf(pdf_path, "python")
+
+        async def hang_then_parse():
+            try:
+                await pool.parse(HangingSource(), extractor)
+                raise AssertionError("expected ParseTimeout")
+            except ParseTimeout:
+                pass
+            # The only slot and the only worker were taken by the hung job
+            return await pool.parse(pdf_path, extractor)
+
+        try:
+            result = asyncio.run(hang_then_parse())
+        finally:
+            pool.shutdown()
+
+    assert result["skills"] == ["python"]
+    assert pool._in_flight == 0
+
+
+def test_job_retried_after_recycle_keeps_its_slot():
+    extractor = ResumeExtractor(known_skills={"python"})
+    pool = ResumeParsePool(max_workers=1, max_queue=0, timeout=60)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = os.path.join(tmp_dir, "resume.pdf")
+        marker = os.path.join(tmp_dir, "reads")
+        _write_pdf(pdf_path, "python")
+
+        def reads():
+            return len(open(marker).read()) if os.path.exists(marker) else 0
+
+        async def kill_pool_mid_job():
+            job = asyncio.ensure_future(pool.parse(SlowSource(pdf_path, marker, 2), extractor))
+            while reads() < 1:
+                await asyncio.sleep(0.05)
+            # As if another request's job hung in the same pool
+            pool._recycle_executor(pool._executor)
+            while reads() < 2:
+                assert not job.done()
+                await asyncio.sleep(0.05)
+            # The retry runs in the job's original slot, so the queue bound still holds
+            assert pool._in_flight == 1
+            try:
+                await pool.parse(pdf_path, extractor)
+                raise AssertionError("expected ParsePoolFull")
+            except ParsePoolFull:
+                pass
+            return await job
+
+        try:
+            result = asyncio.run(kill_pool_mid_job())
+        finally:
+            pool.shutdown()
+
+    assert result["skills"] == ["python"]
+    assert pool._in_flight == 0
+
+
+if __name__ == "__main__":
+    test_parses_in_worker_process()
+    test_rejects_when_queue_is_full()
+    test_hung_job_does_not_hold_the_pool()
+    test_job_retried_after_recycle_keeps_its_slot()
+    print("Parse pool tests passed.")
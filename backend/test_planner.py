@@ -0,0 +1,121 @@
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from matcher import JobMatcher
+from planner import _BYTE_POPCOUNT, plan_learning_path, popcount, skill_bitsets, unpack_bits
+from report_generator import generate_company_report
+
+
+def test_bitsets_hold_each_jobs_skill_set():
+    matcher = JobMatcher()
+    words = skill_bitsets(matcher.job_skill_ids, matcher.job_skill_indptr, len(matcher.skill_vocab))
+    bits = unpack_bits(words, len(matcher.skill_vocab))
+    for idx in range(len(matcher.df)):
+        assert set(np.flatnonzero(bits[idx]).tolist()) == set(matcher.job_skills(idx).tolist())
+    counts = popcount(words)
+    assert counts.tolist() == bits.sum(axis=1).tolist()
+    # Lookup-table popcount (numpy < 2) agrees
+    assert _BYTE_POPCOUNT[words.view(np.uint8)].sum(axis=1).tolist() == counts.tolist()
+
+    # Only the requested rows, in the requested order
+    rows = [7, 0, 7, 3]
+    picked = skill_bitsets(matcher.job_skill_ids, matcher.job_skill_indptr, len(matcher.skill_vocab), rows)
+    assert (picked == words[rows]).all()
+
+
+def _reference_plan(matcher, skills, k, max_steps, target):
+    # Same greedy on Python sets
+    indices, _ = matcher.top_jobs(skills, k)
+    have = matcher.encode_skills(skills)
+    jobs = [set(matcher.job_skills(i).tolist()) for i in indices]
+    postings = np.diff(matcher.skill_job_indptr)
+    demand = postings / postings.max()
+    plan = []
+    for _ in range(max_steps):
+        active = [job for job in jobs if len(job & have) / len(job) < target - 1e-9]
+        gains = {}
+        for job in active:
+            for skill in job - have:
+                gains[skill] = gains.get(skill, 0) + 1 / len(job)
+        if not gains:
+            break
+        best = max(sorted(gains), key=lambda s: gains[s] * (1 + demand[s]))
+        plan.append(matcher.skill_vocab[best])
+        have = have | {best}
+    return plan
+
+
+def test_greedy_matches_a_set_based_reference():
+    matcher = JobMatcher()
+    rng = random.Random(5)
+    for _ in range(20):
+        skills = rng.sample(matcher.skill_vocab, rng.randint(0, 4))
+        for target in (1.0, 0.6):
+            plan = plan_learning_path(matcher, skills, k=5, max_steps=8, target_coverage=target)
+            assert [step["skill"] for step in plan["steps"]] == _reference_plan(matcher, skills, 5, 8, target)
+
+
+def test_plan_reaches_target_and_reports_coverage():
+    matcher = JobMatcher()
+    plan = plan_learning_path(matcher, ["Python", "sql", "basket weaving"], k=3, max_steps=50)
+    assert plan["unknown_skills"] == ["basket weaving"]
+    assert all(job["projected_coverage"] == 1.0 and not job["missing_after"] for job in plan["jobs"])
+    learned = {step["skill"] for step in plan["steps"]}
+    for job in plan["jobs"]:
+        assert job["coverage"] <= job["projected_coverage"]
+    coverages = [step["avg_coverage"] for step in plan["steps"]]
+    assert coverages == sorted(coverages) and coverages[-1] == plan["projected_avg_coverage"] == 1.0
+    assert not learned & {"python", "sql"}
+
+    # A lower target needs no more steps
+    partial = plan_learning_path(matcher, ["python", "sql"], k=3, max_steps=50, target_coverage=0.5)
+    assert len(partial["steps"]) <= len(plan["steps"])
+    assert all(job["projected_coverage"] >= 0.5 for job in partial["jobs"])
+
+
+def test_report_action_plan_uses_the_plan():
+    matcher = JobMatcher()
+    skills = ["python", "sql"]
+    plan = plan_learning_path(matcher, skills, k=3, max_steps=3)
+    report = generate_company_report(skills, matcher.match_jobs(skills, k=3), role_profiles=matcher.role_profiles, plan=plan)
+    first = plan["steps"][0]["skill"]
+    assert f"Learn next, in this order: **{first}**" in report
+
+
+def test_plan_is_interactive_on_a_large_catalog():
+    rng = np.random.default_rng(0)
+    skills = np.array([f"skill{i:04d}" for i in range(2000)])
+    rows = 100_000
+    sizes = rng.integers(3, 12, size=rows)
+    picks = skills[rng.integers(0, len(skills), size=(rows, 12))]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dataset.csv")
+        pd.DataFrame({
+            "job_role": [f"role {i % 500}" for i in range(rows)],
+            "required_skills": [", ".join(row[:n]) for row, n in zip(picks, sizes)],
+            "company": "Acme", "avg_salary": 100000, "min_experience": "0-2 Years", "domain": "IT",
+        }).to_csv(path, index=False)
+        matcher = JobMatcher(dataset_path=path)
+
+    user = ["skill0001", "skill0002", "skill0003", "skill0004"]
+    plan_learning_path(matcher, user, k=20)
+    start = time.perf_counter()
+    plan = plan_learning_path(matcher, user, k=20)
+    elapsed = time.perf_counter() - start
+    print(f"Plan over {rows} jobs: {elapsed * 1000:.1f} ms, {len(plan['steps'])} steps")
+    assert len(plan["steps"]) == 10
+    assert elapsed < 0.25  # ~10-30 ms here; slack for slow CI machines
+
+
+if __name__ == "__main__":
+    test_bitsets_hold_each_jobs_skill_set()
+    test_greedy_matches_a_set_based_reference()
+    test_plan_reaches_target_and_reports_coverage()
+    test_report_action_plan_uses_the_plan()
+    test_plan_is_interactive_on_a_large_catalog()
+    print("All planner tests passed!")
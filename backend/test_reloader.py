@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import time
+
+from matcher import JobMatcher
+from reloader import ModelBundle, ModelRegistry
+
+BUNDLED_DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataset.csv")
+
+
+def _build(dataset_path, version):
+    # The matcher is all these tests need from a bundle
+    return ModelBundle(JobMatcher(dataset_path), None, None, version, time.time())
+
+
+def _write_catalog(path, rows):
+    with open(BUNDLED_DATASET, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines[:rows + 1]) + "\n")
+
+
+def test_reload_swaps_only_after_a_successful_build():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset = os.path.join(tmp_dir, "dataset.csv")
+        _write_catalog(dataset, 5)
+        building = threading.Event()
+        release = threading.Event()
+
+        def slow_build(dataset_path, version):
+            if version > 1:
+                building.set()
+                release.wait(10)
+            return _build(dataset_path, version)
+
+        models = ModelRegistry(slow_build, dataset)
+        snapshot = models.current
+        assert len(snapshot.matcher.df) == 5
+
+        _write_catalog(dataset, 10)
+        assert models.reload()
+        assert building.wait(10)
+        # Mid-rebuild: requests still get the old bundle, and a second reload is refused
+        assert models.current is snapshot
+        assert not models.reload()
+        release.set()
+        models._reload_thread.join(10)
+
+        assert models.current.version == 2 and len(models.current.matcher.df) == 10
+        assert models.last_reload["status"] == "success"
+        # A request that read the old snapshot keeps using it unchanged
+        assert snapshot.version == 1 and len(snapshot.matcher.df) == 5
+
+
+def test_empty_or_failed_catalog_keeps_the_old_bundle():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset = os.path.join(tmp_dir, "dataset.csv")
+        _write_catalog(dataset, 5)
+        models = ModelRegistry(_build, dataset)
+        snapshot = models.current
+
+        # Header only: JobMatcher loads an empty catalog
+        _write_catalog(dataset, 0)
+        models.reload(wait=True)
+        assert models.current is snapshot
+        assert models.last_reload["status"] == "error" and "empty" in models.last_reload["error"]
+
+        def failing_build(dataset_path, version):
+            raise RuntimeError("broken CSV")
+
+        models.build_fn = failing_build
+        models.reload(wait=True)
+        assert models.current is snapshot
+        assert models.last_reload["status"] == "error" and models.last_reload["error"] == "broken CSV"
+        assert models.last_reload["version"] == 1
+        assert len(models.current.matcher.match_jobs(["python"])) > 0
+
+
+def test_watcher_waits_for_the_file_to_settle():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset = os.path.join(tmp_dir, "dataset.csv")
+        _write_catalog(dataset, 5)
+        models = ModelRegistry(_build, dataset)
+        builds = []
+        models.build_fn = lambda path, version: builds.append(version) or _build(path, version)
+
+        models.start_watching(interval=0.05)
+        try:
+            # Still being written: the file changes between every two polls
+            writing_until = time.monotonic() + 0.5
+            while time.monotonic() < writing_until:
+                _write_catalog(dataset, 6)  # new mtime every write
+                time.sleep(0.01)
+            assert not builds
+            _write_catalog(dataset, 15)
+            # Unchanged for two polls: one reload
+            deadline = time.monotonic() + 10
+            while models.current.version == 1 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert builds == [2] and len(models.current.matcher.df) == 15
+            time.sleep(0.3)
+            assert builds == [2]
+        finally:
+            models.stop_watching()
+
+
+if __name__ == "__main__":
+    test_reload_swaps_only_after_a_successful_build()
+    test_empty_or_failed_catalog_keeps_the_old_bundle()
+    test_watcher_waits_for_the_file_to_settle()
+    print("Reloader tests passed.")
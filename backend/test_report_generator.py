@@ -0,0 +1,34 @@
+import pandas as pd
+
+from report_generator import generate_company_report
+from role_profiles import build_role_profiles
+
+POSTINGS = pd.DataFrame({
+    "job_role": ["Data Analyst", "Data Analyst", "data analyst", "Data Analyst", "Data Scientist", "Data Analyst"],
+    "company": ["Zeta", "Acme", "Acme", "Beta", "Acme", None],
+    "avg_salary": [50000, 60000, 70000, 80000, 95000, 40000],
+    "min_experience": ["0-2 Years", "0-2 Years", "2-5 Years", "0-2 Years", "2-5 Years", None],
+})
+
+MATCHES = [{"job_role": "Data Analyst", "match_score": 80.0, "missing_skills": ["tableau", "excel"]}]
+
+
+def test_report_ranks_dataset_companies_first():
+    report = generate_company_report(["python", "sql"], MATCHES, role_profiles=build_role_profiles(POSTINGS))
+    lines = report.splitlines()
+    start = lines.index("   Recommended Companies:") + 1
+    companies = [line.strip("- ").split(" (")[0] for line in lines[start:start + 5]]
+
+    # Dataset companies by frequency, then the knowledge base's in curated order
+    assert companies == ["Acme", "Beta", "Zeta", "Infosys", "Deloitte"]
+    assert "   - Acme (2 openings, avg salary 65,000)" in lines
+    assert "   - Beta (1 opening, avg salary 80,000)" in lines
+    assert "   Salary Range: 40,000 - 80,000 (median 60,000, 5 postings)" in lines
+    assert "   Typical Experience: 0-2 Years" in lines
+    # Same output every time, and from the raw DataFrame
+    assert report == generate_company_report(["python", "sql"], MATCHES, POSTINGS)
+
+
+if __name__ == "__main__":
+    test_report_ranks_dataset_companies_first()
+    print("Report generator tests passed.")
@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from intents import IntentRouter
+from matcher import JobMatcher
+from test_report_generator import POSTINGS
+from role_profiles import build_role_profiles
+
+
+def test_profile_aggregates():
+    profiles = build_role_profiles(POSTINGS)
+    analyst = profiles["data analyst"]
+
+    assert analyst["role"] == "Data Analyst" and analyst["postings"] == 5
+    salary = analyst["salary"]
+    assert (salary["min"], salary["median"], salary["max"], salary["mean"]) == (40000, 60000, 80000, 60000)
+    assert salary["p25"] == 50000 and salary["p75"] == 70000
+    assert analyst["experience"] == [
+        {"band": "0-2 Years", "postings": 3, "share": 0.6}, {"band": "2-5 Years", "postings": 1, "share": 0.2}
+    ]
+    # Most postings first, then best paid, then by name
+    assert [(c["company"], c["postings"], c["avg_salary"]) for c in analyst["companies"]] == [
+        ("Acme", 2, 65000), ("Beta", 1, 80000), ("Zeta", 1, 50000)
+    ]
+    assert [c["company"] for c in profiles["data scientist"]["companies"]] == ["Acme"]
+    json.dumps(profiles)  # stored with the artifacts
+
+
+def test_skill_frequencies_match_a_row_by_row_count():
+    matcher = JobMatcher()
+    for key, rows in matcher.role_rows.items():
+        counts = {}
+        for idx in rows:
+            for skill_id in dict.fromkeys(matcher.job_skills(idx).tolist()):
+                counts[skill_id] = counts.get(skill_id, 0) + 1
+        expected = [(matcher.skill_vocab[s], round(c / len(rows), 4)) for s, c in sorted(counts.items(), key=lambda i: -i[1])]
+        assert matcher.role_skills(key.upper()) == expected
+
+    salaries = pd.to_numeric(matcher.df['avg_salary'], errors='coerce')
+    for key, profile in matcher.role_profiles.items():
+        role_salaries = salaries[matcher.df['job_role'].str.lower().str.strip() == key]
+        assert np.isclose(profile["salary"]["median"], role_salaries.median())
+
+
+def test_role_questions_are_answered_from_profiles():
+    matcher = JobMatcher()
+    profile = next(iter(matcher.role_profiles.values()))
+    routed = IntentRouter().route(f"What is the salary of a {profile['role']}?", None, matcher)
+    assert routed[0] == "role_facts"
+    assert f"median {profile['salary']['median']:,.0f}" in routed[1]
+
+    routed = IntentRouter().route(f"Which companies are hiring for {profile['role']}?", None, matcher)
+    assert profile["companies"][0]["company"] in routed[1]
+
+
+if __name__ == "__main__":
+    test_profile_aggregates()
+    test_skill_frequencies_match_a_row_by_row_count()
+    test_role_questions_are_answered_from_profiles()
+    print("Role profile tests passed.")
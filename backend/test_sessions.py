@@ -0,0 +1,83 @@
+import asyncio
+
+from chatbot import CareerChatbot
+from sessions import SessionStore, estimate_tokens
+from stub_llm_server import StubGenerativeService, start_stub_server
+
+UPLOAD_MATCHES = [
+    {"job_role": "Data Scientist", "match_score": 82.5, "matched_skills": ["python"],
+     "missing_skills": ["pytorch", "tensorflow", "statistics", "spark", "airflow", "docker"], "company": "Acme"},
+    {"job_role": "Data Analyst", "match_score": 70.1, "matched_skills": ["sql"], "missing_skills": ["tableau"]},
+    {"job_role": "ML Engineer", "match_score": 65.0, "matched_skills": [], "missing_skills": []},
+    {"job_role": "Backend Developer", "match_score": 40.0, "matched_skills": [], "missing_skills": ["go"]},
+]
+
+
+def test_prompt_context_stays_within_budget():
+    store = SessionStore(context_tokens=400)
+    session = store.set_profile(None, ["python", "sql"], UPLOAD_MATCHES)
+
+    sizes = []
+    for turn in range(200):
+        store.append(session, "user", f"Question {turn}: how do I get better at {'statistics ' * (turn % 7)}?")
+        store.append(session, "assistant", "Here’s what I found 👇 " + "practice daily. " * 20)
+        sizes.append(estimate_tokens(store.render_context(session)))
+
+    assert max(sizes) <= 400
+    rendered = store.render_context(session)
+    # Latest exchange verbatim, older questions only as summary lines, oldest dropped
+    assert "Question 199" in rendered and "Question 195" in rendered
+    assert "=== EARLIER QUESTIONS ===" in rendered
+    assert "Question 0:" not in rendered
+
+
+def test_profile_replaces_raw_upload_context():
+    store = SessionStore()
+    upload_result = {"extracted_skills": ["python", "sql"], "matches": UPLOAD_MATCHES,
+                     "resume_text_preview": "John Doe " * 200, "location": "Pune"}
+    rendered = store.render_context(None, upload_result)
+
+    assert "Skills: python, sql" in rendered
+    assert "Match: Data Scientist (82.5%), missing: pytorch, tensorflow, statistics, spark, airflow" in rendered
+    assert "Backend Developer" not in rendered  # top 3 matches only
+    assert "John Doe" not in rendered and "Acme" not in rendered
+    assert "location: Pune" in rendered
+
+
+def test_least_recently_used_sessions_are_evicted():
+    store = SessionStore(max_sessions=2)
+    first = store.get("first")
+    second = store.get("second")
+    assert store.get("first") is first
+    store.get("third")
+    assert store.stats()["sessions"] == 2
+    assert store.get("first") is first
+    assert store.get("second") is not second  # evicted, starts over
+
+
+def test_chat_remembers_the_conversation():
+    async def test():
+        stub = StubGenerativeService(first_chunk_delay=0.0, chunk_delay=0.0)
+        server, port = await start_stub_server(stub)
+        try:
+            bot = CareerChatbot(api_endpoint=f"127.0.0.1:{port}")
+            session = bot.sessions.set_profile("abc", ["python"], UPLOAD_MATCHES[:1])
+            await bot.get_response_async("I live in Pune and like startups.", session=session)
+            await bot.get_response_async("Which city did I mention?", session=session)
+
+            prompt = stub.last_request.contents[0].parts[0].text
+            assert "Match: Data Scientist (82.5%)" in prompt
+            assert "user: I live in Pune and like startups." in prompt
+            assert len(session.turns) == 4
+        finally:
+            await server.stop(None)
+
+    asyncio.run(test())
+
+
+if __name__ == "__main__":
+    test_prompt_context_stays_within_budget()
+    test_profile_replaces_raw_upload_context()
+    test_least_recently_used_sessions_are_evicted()
+    test_chat_remembers_the_conversation()
+    print("Session tests passed.")
@@ -9,6 +9,7 @@ const ChatInterface = ({ context }) => {
     ]);
     const [input, setInput] = useState('');
     const [loading, setLoading] = useState(false);
+    const [sessionId, setSessionId] = useState(null);
     const messagesEndRef = useRef(null);
 
     const scrollToBottom = () => {
@@ -32,9 +33,11 @@ const ChatInterface = ({ context }) => {
             const apiUrl = (import.meta.env.VITE_API_URL || 'http://localhost:8006').replace(/\/$/, '');
             const response = await axios.post(`${apiUrl}/chat`, {
                 message: userMsg,
-                context: context // Send Dashboard data as context
+                context: context, // Send Dashboard data as context
+                session_id: sessionId || context?.session_id // Server keeps the conversation history
             });
 
+            setSessionId(response.data.session_id);
             setMessages(prev => [...prev, { role: 'ai', text: response.data.response }]);
         } catch (err) {
             setMessages(prev => [...prev, { role: 'ai', text: "Sorry, I'm having trouble connecting to the server." }]);